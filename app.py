@@ -1,13 +1,28 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
 import hashlib
+import hmac
 import time
 import io
+import cProfile
+import marshal
+import pstats
+import os
+import re
 import base64
+import json
+import sys
 import uuid
+import threading
+import functools
+from contextlib import contextmanager
 import pytz
+from collections import defaultdict, deque, OrderedDict
 from datetime import datetime, timedelta
 from concurrent.futures import ThreadPoolExecutor
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+from pandas.io.parsers import TextParser
 from streamlit_option_menu import option_menu
 from streamlit_gsheets import GSheetsConnection
 from streamlit_cookies_manager import CookieManager
@@ -50,6 +65,58 @@ SHEET_NAMES = {
 DEPARTMENTS = ["전체", "본점", "작업장"]
 POST_STATUS = ["접수", "진행중", "완료", "보류"]
 
+# 부서 파티션: 아래 시트는 부서별 워크시트에 나눠 저장 ("시트@부서" 키). 전체 = 공용 파티션(기존 워크시트)
+# 하위 시트(댓글/확인/완료 기록)는 부모 행과 같은 파티션
+SHARED_DEPT = "전체"
+PARTITIONED_KEYS = ["posts", "comments", "inform_notes", "inform_logs", "routine_def", "routine_log"]
+PARTITION_PARENT = {"comments": ("posts", "post_id"), "inform_logs": ("inform_notes", "note_id"),
+                    "routine_log": ("routine_def", "task_id")}
+
+def part_key(key: str, dept: str) -> str:
+    return f"{key}@{dept}"
+
+def base_key(key: str) -> str:
+    return key.split("@", 1)[0]
+
+def key_dept(key: str) -> Optional[str]:
+    return key.split("@", 1)[1] if "@" in key else None
+
+for _k in PARTITIONED_KEYS:
+    for _d in DEPARTMENTS:
+        SHEET_NAMES[part_key(_k, _d)] = SHEET_NAMES[_k] if _d == SHARED_DEPT else f"{SHEET_NAMES[_k]}_{_d}"
+
+# 멀티 매장(테넌트): 매장 id -> 스프레드시트. 워크시트 구성(SHEET_NAMES)은 매장 공통
+# secrets.toml [tenants.<id>] spreadsheet = "...", name = "..." (또는 JOGAKDAL_TENANTS JSON)
+# 설정이 없으면 기본 연결의 스프레드시트 하나 = "default"
+def load_tenants() -> Dict[str, dict]:
+    tenants = {}
+    try:
+        tenants = {str(k): dict(v) for k, v in st.secrets.get("tenants", {}).items()}
+    except Exception:
+        pass
+    if not tenants and os.environ.get("JOGAKDAL_TENANTS"):
+        tenants = json.loads(os.environ["JOGAKDAL_TENANTS"])
+    return tenants or {"default": {"spreadsheet": None, "name": ""}}
+
+TENANTS = load_tenants()
+DEFAULT_TENANT = os.environ.get("JOGAKDAL_TENANT") if os.environ.get("JOGAKDAL_TENANT") in TENANTS else next(iter(TENANTS))
+
+# 컬럼 프로젝션 (DataManager.load(columns=...)) - 화면별로 실제 쓰는 컬럼만 읽기
+ROUTINE_LOG_HOME_COLUMNS = ["task_id", "done_date"]
+ROUTINE_LOG_STATS_COLUMNS = ["task_id", "done_date", "worker"]
+INFORM_NOTE_SUMMARY_COLUMNS = ["id", "target_date", "priority"]
+INFORM_LOG_CHECK_COLUMNS = ["note_id", "username"]
+SESSION_AUTH_COLUMNS = ["token", "username", "expires_at", "revoked"]
+POST_OWNER_COLUMNS = ["id", "author"]
+
+# 표준 타임스탬프: append-like 시트의 모든 행에 KST "YYYY-MM-DD HH:MM:SS" (문자열 정렬 = 시간순)
+TS_COLUMN = "ts"
+TS_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# append-like 시트 = 행 버전 로그: 수정은 같은 row_uuid의 새 버전 행, 삭제는 이 컬럼이 "True"인 tombstone 행.
+# 읽을 때 row_uuid별 마지막 행이 이김 (DataManager._last_write_wins), 정리(compaction) 때 접어서 없앰
+TOMBSTONE_COLUMN = "deleted"
+
 # ============================================================
 # [1. 데이터 클래스 및 상태 관리]
 # ============================================================
@@ -64,6 +131,37 @@ class SaveResult:
     success: bool
     error_msg: str = ""
 
+@dataclass
+class CompactionReport:
+    key: str
+    rows_before: int = 0
+    rows_after: int = 0
+    bytes_before: int = 0
+    bytes_after: int = 0
+    deduped: int = 0
+    tombstones: int = 0
+    removed: int = 0
+    archived: int = 0
+    archive_target: str = ""
+    error_msg: str = ""
+
+@dataclass
+class Mutation:
+    """
+    DataManager.apply_batch 단위 변경
+    - append: row (id_column 지정 시 id 자동 발급)
+    - update: match_column 값이 match_value(스칼라 또는 목록)인 행에 updates 적용
+    - delete: match_column 값이 match_value(스칼라 또는 목록)인 행 삭제
+    append-like 시트의 update/delete는 새 버전/tombstone 행 추가로 기록
+    """
+    key: str
+    op: str
+    row: Optional[dict] = None
+    match_column: str = ""
+    match_value: Any = None
+    updates: Optional[dict] = None
+    id_column: Optional[str] = None
+
 class AppState:
     @staticmethod
     def init():
@@ -78,6 +176,7 @@ class AppState:
             "last_error": None,
             "data_cache": {},
             "cache_time": {},
+            "cache_meta": {},
             "dashboard_view": None,
             "inform_date": get_now().date(),
             "show_search": False,
@@ -216,7 +315,154 @@ try:
 except:
     cookies = None
 
-conn = st.connection("gsheets", type=GSheetsConnection)
+# 자동 로그인은 서명된 쿠키 하나 (이전 방식 auto_login/session_token/uid/upw 는 읽기만, 다음 저장 때 정리)
+AUTH_COOKIE = "jogakdal_auth"
+LEGACY_AUTH_COOKIES = ["auto_login", "session_token", "uid", "upw"]
+
+def load_cookie_secret() -> bytes:
+    """쿠키 서명 키: JOGAKDAL_COOKIE_SECRET > secrets.cookie_secret > 시트 연결 secrets에서 유도"""
+    secret = os.environ.get("JOGAKDAL_COOKIE_SECRET", "")
+    if not secret:
+        try:
+            secret = str(st.secrets.get("cookie_secret", "")) or json.dumps(
+                st.secrets.get("connections", {}), sort_keys=True, default=str)
+        except Exception:
+            secret = ""
+    return hashlib.sha256(f"jogakdal-cookie:{secret}".encode()).digest()
+
+COOKIE_SECRET = load_cookie_secret()
+
+# 인증된 클라이언트는 프로세스에 하나 (매장별 스프레드시트는 아래 SheetConnection이 지정)
+if os.environ.get("JOGAKDAL_FAKE_SHEETS"):
+    # 오프라인 벤치마크/부하 테스트: 로컬 대역 연결 (fake_gsheets.py)
+    from fake_gsheets import FakeGSheetsConnection
+    conn = st.connection("gsheets_fake", type=FakeGSheetsConnection, data_dir=os.environ["JOGAKDAL_FAKE_SHEETS"])
+else:
+    conn = st.connection("gsheets", type=GSheetsConnection)
+
+_tenant_local = threading.local()
+
+def current_tenant() -> str:
+    """이 실행의 매장: 스레드 지정(use_tenant) > 세션 > 기본 매장"""
+    tenant = getattr(_tenant_local, "tenant", None)
+    # 세션 없는 스레드는 세션 상태를 건드리지 않음 (bare 실행은 공용 mock 세션)
+    if tenant is None and (get_script_run_ctx(suppress_warning=True) is not None or not st.runtime.exists()):
+        tenant = st.session_state.get("tenant")
+    return tenant if tenant in TENANTS else DEFAULT_TENANT
+
+@contextmanager
+def use_tenant(tenant: str):
+    """세션 없는 작업 스레드(스냅샷 대조/기록 등)를 특정 매장으로 묶기"""
+    prev = getattr(_tenant_local, "tenant", None)
+    _tenant_local.tenant = tenant
+    try:
+        yield
+    finally:
+        _tenant_local.tenant = prev
+
+def tenant_path(path: str, tenant: Optional[str] = None) -> str:
+    """매장별 로컬 경로 (기본 매장은 기존 경로 그대로, 빈 경로 = 사용 안 함)"""
+    tenant = tenant or current_tenant()
+    if not path or tenant == DEFAULT_TENANT:
+        return path
+    root, ext = os.path.splitext(path)
+    return f"{root}.{tenant}{ext}" if ext else os.path.join(path, tenant)
+
+def per_tenant(factory):
+    """
+    cache_resource 팩토리(첫 인자 tenant)를 현재 매장으로 호출 -> 매장마다 별도 프로세스 싱글턴.
+    get_x() 호출부는 그대로, get_x.clear()도 유지
+    """
+    @functools.wraps(factory)
+    def wrapper(*args, **kwargs):
+        return factory(current_tenant(), *args, **kwargs)
+    wrapper.clear = factory.clear
+    return wrapper
+
+class SheetConnection:
+    """
+    스프레드시트 하나에 대한 연결 (get_sheet_connection 풀에서 프로세스 공용으로 재사용).
+    읽기/쓰기는 공용 클라이언트에 spreadsheet만 지정, values API 핸들은 처음 쓸 때 한 번 열어 보관
+    """
+
+    def __init__(self, spreadsheet: Optional[str]):
+        self.spreadsheet = spreadsheet
+        self._lock = threading.Lock()
+        self._handle = None
+
+    def _target(self) -> dict:
+        return {"spreadsheet": self.spreadsheet} if self.spreadsheet else {}
+
+    def read(self, worksheet: str) -> pd.DataFrame:
+        with get_quota().slot("read"):
+            return conn.read(worksheet=worksheet, ttl=0, **self._target())
+
+    def update(self, worksheet: str, data: pd.DataFrame):
+        with get_quota().slot("write"):
+            return conn.update(worksheet=worksheet, data=data, **self._target())
+
+    def create(self, worksheet: str, data: pd.DataFrame):
+        with get_quota().slot("write"):
+            return conn.create(worksheet=worksheet, data=data, **self._target())
+
+    def handle(self):
+        """
+        범위 읽기(values API)용 스프레드시트 핸들 - 서비스계정/로컬 대역 연결만 지원.
+        공개 URL 방식 등 미지원 연결이면 None (-> 전체 읽기로 동작). 연결 실패는 보관하지 않고 예외 전파.
+        """
+        opener = getattr(getattr(conn, "client", None), "_open_spreadsheet", None)
+        if opener is None:
+            return None
+        with self._lock:
+            if self._handle is None:
+                with get_quota().slot("read"):
+                    self._handle = opener(**self._target())
+            return self._handle
+
+@st.cache_resource
+def get_sheet_connection(spreadsheet: Optional[str]) -> SheetConnection:
+    return SheetConnection(spreadsheet)
+
+def tenant_conn(tenant: Optional[str] = None) -> SheetConnection:
+    """매장의 스프레드시트 연결 (같은 스프레드시트면 매장이 달라도 같은 연결)"""
+    return get_sheet_connection(TENANTS[tenant or current_tenant()].get("spreadsheet"))
+
+def get_spreadsheet():
+    return tenant_conn().handle()
+
+def col_letter(n: int) -> str:
+    """1 -> A, 27 -> AA"""
+    s = ""
+    while n > 0:
+        n, r = divmod(n - 1, 26)
+        s = chr(65 + r) + s
+    return s
+
+def a1_range(key: str, rng: str = "") -> str:
+    """rng 생략 = 워크시트 전체"""
+    name = SHEET_NAMES[key].replace("'", "''")
+    return f"'{name}'!{rng}" if rng else f"'{name}'"
+
+def to_cell(v) -> Any:
+    """DataFrame 값 -> values API 셀 (NaN은 빈 칸, numpy 스칼라는 파이썬 값)"""
+    if v is None or (isinstance(v, float) and v != v) or v is pd.NA or v is pd.NaT:
+        return ""
+    if hasattr(v, "item"):
+        v = v.item()
+    if isinstance(v, float) and v.is_integer():
+        return int(v)
+    return v if isinstance(v, (int, float, str)) else str(v)
+
+def values_to_df(columns: List[str], rows: List[list]) -> pd.DataFrame:
+    """
+    values API 문자열 격자 -> DataFrame (gspread_dataframe과 같은 TextParser 타입 추론).
+    빈 행도 한 행으로 유지 (범위 읽기는 행 위치가 시트 행 번호 - 드문드문 채워진 컬럼만 읽어도 어긋나지 않도록)
+    """
+    if not rows:
+        return pd.DataFrame(columns=columns)
+    width = len(columns)
+    padded = [r if len(r) == width else list(r[:width]) + [""] * (width - len(r)) for r in rows]
+    return TextParser(padded, names=columns, header=None, skip_blank_lines=False).read()
 
 def safe_get_cookie(key):
     if cookies is None:
@@ -226,23 +472,905 @@ def safe_get_cookie(key):
     except:
         return None
 
-def safe_set_cookie(key, val):
+def safe_set_cookies(values: Dict[str, str]):
+    """여러 쿠키를 저장 한 번(컴포넌트 왕복 1회)으로"""
     if cookies is None:
         return
     try:
-        cookies[key] = val
+        for key, val in values.items():
+            cookies[key] = val
         cookies.save()
     except:
         pass
 
+def sign_cookie(payload: dict) -> str:
+    body = base64.urlsafe_b64encode(json.dumps(payload, separators=(",", ":")).encode()).decode()
+    return f"{body}.{hmac.new(COOKIE_SECRET, body.encode(), hashlib.sha256).hexdigest()}"
+
+def verify_cookie(value) -> Optional[dict]:
+    """서명이 맞으면 payload, 아니면 None"""
+    body, _, sig = str(value or "").rpartition(".")
+    if not body or not hmac.compare_digest(sig, hmac.new(COOKIE_SECRET, body.encode(), hashlib.sha256).hexdigest()):
+        return None
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(body.encode()))
+    except Exception:
+        return None
+    return payload if isinstance(payload, dict) else None
+
+# ============================================================
+# [4-1. 계측 - 시트 I/O / 캐시 / 페이지 렌더 시간]
+# ============================================================
+METRICS_FILE = os.environ.get("JOGAKDAL_METRICS_FILE", "metrics/jogakdal.prom")
+
+def _percentile(sorted_vals: List[float], q: float) -> float:
+    if not sorted_vals:
+        return 0.0
+    idx = int(round(q / 100 * (len(sorted_vals) - 1)))
+    return sorted_vals[min(len(sorted_vals) - 1, max(0, idx))]
+
+def estimate_df_bytes(df: Optional[pd.DataFrame]) -> int:
+    """payload 크기 추정 (대형 시트에서도 가볍게: 최대 200행 샘플 기준)"""
+    if df is None or df.empty:
+        return 0
+    n = len(df)
+    sample = df if n <= 200 else df.iloc[:: max(1, n // 200)]
+    per_row = sample.memory_usage(index=False, deep=True).sum() / max(1, len(sample))
+    return int(per_row * n)
+
+def estimate_values_bytes(grids: List[List[list]]) -> int:
+    """values API 응답 크기 추정 (격자별 최대 200행 샘플)"""
+    total = 0
+    for g in grids:
+        n = len(g)
+        sample = g if n <= 200 else g[:: max(1, n // 200)]
+        total += int(sum(len(str(c)) for r in sample for c in r) / max(1, len(sample)) * n)
+    return total
+
+class MetricsRegistry:
+    """
+    프로세스 전역 지표 저장소 (모든 세션 공유)
+    - observe: 지연시간(ms) 표본 -> 최근 WINDOW개로 rolling p50/p95/p99
+    - incr: 누적 카운터 (calls/rows/bytes/retries/failures/hit/miss ...)
+    """
+    WINDOW = 500
+    FLUSH_INTERVAL = 15
+
+    def __init__(self, tenant: str = DEFAULT_TENANT):
+        self.tenant = tenant
+        self.path = tenant_path(METRICS_FILE, tenant)
+        self._lock = threading.Lock()
+        self._samples: Dict[Tuple[str, str], deque] = {}
+        self._counters: Dict[Tuple[str, str], Dict[str, float]] = defaultdict(lambda: defaultdict(float))
+        self._last_flush = 0.0
+        self.started_at = time.time()
+
+    def observe(self, group: str, name: str, ms: float):
+        with self._lock:
+            series = self._samples.get((group, name))
+            if series is None:
+                series = self._samples[(group, name)] = deque(maxlen=self.WINDOW)
+            series.append(ms)
+            self._counters[(group, name)]["count"] += 1
+
+    def incr(self, group: str, name: str, field: str, amount: float = 1):
+        with self._lock:
+            self._counters[(group, name)][field] += amount
+
+    # ---------- 기록 헬퍼 ----------
+    def record_io(self, op: str, key: str, seconds: float, rows: int = 0, nbytes: int = 0, ok: bool = True):
+        self.observe(op, key, seconds * 1000)
+        if ok:
+            self.incr(op, key, "rows", rows)
+            self.incr(op, key, "bytes", nbytes)
+        else:
+            self.incr(op, key, "failures")
+
+    def record_cache(self, key: str, hit: bool):
+        self.incr("cache", key, "hit" if hit else "miss")
+
+    # ---------- 조회 ----------
+    def table(self, group: str) -> pd.DataFrame:
+        with self._lock:
+            names = sorted({n for (g, n) in self._counters if g == group})
+            rows = []
+            for n in names:
+                row = {"name": n}
+                row.update(self._counters[(group, n)])
+                series = self._samples.get((group, n))
+                if series:
+                    s = sorted(series)
+                    row.update({"p50_ms": _percentile(s, 50), "p95_ms": _percentile(s, 95), "p99_ms": _percentile(s, 99)})
+                rows.append(row)
+        df = pd.DataFrame(rows).fillna(0)
+        if group == "cache" and not df.empty:
+            for c in ["hit", "miss"]:
+                if c not in df.columns:
+                    df[c] = 0
+            df["hit_ratio"] = (df["hit"] / (df["hit"] + df["miss"]).clip(lower=1)).round(3)
+        return df
+
+    def groups(self) -> List[str]:
+        with self._lock:
+            return sorted({g for (g, _) in self._counters})
+
+    def to_prometheus(self) -> str:
+        t = f'tenant="{self.tenant}"'
+        lines = [f"jogakdal_uptime_seconds{{{t}}} {time.time() - self.started_at:.0f}"]
+        with self._lock:
+            items = [(g, n, dict(c)) for (g, n), c in self._counters.items()]
+            samples = {k: sorted(v) for k, v in self._samples.items()}
+        for g, n, fields in sorted(items):
+            label = n.replace("\\", "\\\\").replace('"', '\\"')
+            for f, v in sorted(fields.items()):
+                lines.append(f'jogakdal_{g}_{f}_total{{{t},name="{label}"}} {v:g}')
+            s = samples.get((g, n))
+            if s:
+                for q in (50, 95, 99):
+                    lines.append(f'jogakdal_{g}_latency_ms{{{t},name="{label}",quantile="0.{q}"}} {_percentile(s, q):.1f}')
+        return "\n".join(lines) + "\n"
+
+    def maybe_flush(self, path: Optional[str] = None, force: bool = False):
+        """스크레이프용 텍스트 파일(Prometheus textfile 형식) 주기적 기록 (매장별 파일)"""
+        path = self.path if path is None else path
+        now = time.time()
+        if not path or (not force and now - self._last_flush < self.FLUSH_INTERVAL):
+            return
+        self._last_flush = now
+        try:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            tmp = f"{path}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                f.write(self.to_prometheus())
+            os.replace(tmp, path)
+        except Exception:
+            pass
+
+@per_tenant
+@st.cache_resource
+def get_metrics(tenant: str) -> MetricsRegistry:
+    return MetricsRegistry(tenant)
+
+def timed_page(name: str):
+    """페이지 함수 wall time 기록 (st.rerun 예외로 빠져나가도 기록)"""
+    def deco(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            t0 = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                get_metrics().observe("page", name, (time.perf_counter() - t0) * 1000)
+        return wrapper
+    return deco
+
+def is_fragment_rerun() -> bool:
+    ctx = get_script_run_ctx()
+    return bool(ctx is not None and ctx.fragment_ids_this_run)
+
+def timed_fragment(name: str):
+    """fragment 단독 rerun 시간만 기록 (전체 실행 중 호출은 page/app 쪽 시간에 포함)"""
+    def deco(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not is_fragment_rerun():
+                return fn(*args, **kwargs)
+            t0 = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                get_metrics().observe("fragment", name, (time.perf_counter() - t0) * 1000)
+        return wrapper
+    return deco
+
+def rerun_fragment():
+    """fragment rerun 중이면 그 fragment만 다시 그림, 전체 실행 중이면(예: AppTest) 앱 전체 rerun"""
+    if is_fragment_rerun():
+        st.rerun(scope="fragment")
+    st.rerun()
+
+# ---------- 온디맨드 프로파일러 (Master 전용: ?profile=N 또는 관리 > 프로파일) ----------
+PROFILE_KEEP = 10
+PROFILE_MAX_RUNS = 20
+# 파일 경로 -> 분류 (위에서부터 먼저 맞는 것). 병렬 로드 대기(스레드 풀)는 시트 I/O로 침
+PROFILE_CATEGORIES = [
+    ("시트 I/O", ["streamlit_gsheets", "gspread", "fake_gsheets", "/google/auth", "/google/oauth2", "googleapiclient",
+                 "httplib2", "requests", "urllib3", "http/", "ssl.py", "socket.py", "concurrent/futures", "threading.py"]),
+    ("pandas", ["/pandas/", "/numpy/"]),
+    ("위젯 렌더", ["/streamlit", "/pyarrow/", "/altair/", "/google/protobuf/"]),
+]
+
+@dataclass
+class RerunProfile:
+    ts: str
+    user: str
+    total_ms: float
+    breakdown: Dict[str, float]
+    top: str
+    stats: bytes
+
+@per_tenant
+@st.cache_resource
+def get_profiles(tenant: str) -> deque:
+    """최근 프로파일 (프로세스 공용, 매장별)"""
+    return deque(maxlen=PROFILE_KEEP)
+
+def _profile_category(filename: str) -> str:
+    if filename == __file__ or filename.endswith("app.py"):
+        return "앱 코드"
+    path = filename.replace("\\", "/")
+    for cat, patterns in PROFILE_CATEGORIES:
+        if any(p in path for p in patterns):
+            return cat
+    return "기타"
+
+def profile_breakdown(stats: pstats.Stats) -> Dict[str, float]:
+    """
+    함수별 자체 시간(tottime)을 파일 기준으로 분류해 합산 (ms, 합 = 전체).
+    내장 함수(sleep/소켓/락 등)는 호출한 쪽 분류로
+    """
+    out = {cat: 0.0 for cat, _ in PROFILE_CATEGORIES}
+    out.update({"앱 코드": 0.0, "기타": 0.0})
+    for (filename, _, _), (_, _, tt, _, callers) in stats.stats.items():
+        if filename != "~":
+            out[_profile_category(filename)] += tt * 1000
+            continue
+        for (cfile, _, _), edge in callers.items():
+            out[_profile_category(cfile)] += edge[2] * 1000
+    return {k: round(v, 1) for k, v in out.items()}
+
+def profiled(fn):
+    """
+    세션에 예약된 횟수만큼 다음 rerun을 cProfile로 감싸 get_profiles()에 보관.
+    꺼져 있으면 세션 값 하나 확인하고 그대로 호출
+    """
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        if "profile" in st.query_params and st.session_state.get("role") == "Master":
+            try:
+                st.session_state["profile_runs"] = min(max(int(st.query_params["profile"]), 0), PROFILE_MAX_RUNS)
+            except ValueError:
+                pass
+            del st.query_params["profile"]
+        if not st.session_state.get("profile_runs"):
+            return fn(*args, **kwargs)
+
+        st.session_state["profile_runs"] -= 1
+        prof = cProfile.Profile()
+        t0 = time.perf_counter()
+        try:
+            prof.enable()
+        except ValueError:
+            # 다른 프로파일러가 이미 켜져 있음
+            return fn(*args, **kwargs)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            prof.disable()
+            total = (time.perf_counter() - t0) * 1000
+            stats = pstats.Stats(prof)
+            buf = io.StringIO()
+            pstats.Stats(prof, stream=buf).sort_stats("cumulative").print_stats(40)
+            get_profiles().append(RerunProfile(
+                ts=now_str(), user=st.session_state.get("username", ""), total_ms=round(total, 1),
+                breakdown=profile_breakdown(stats), top=buf.getvalue(), stats=marshal.dumps(stats.stats)))
+    return wrapper
+
+# ============================================================
+# [4-2. 시트 버전 카운터 - 세션 간 변경 알림]
+# ============================================================
+# 같은 서버 프로세스의 모든 세션이 공유. 쓰기 성공마다 증가 -> 각 세션은 rerun 때 비교해서 바뀐 시트만 무효화
+# (다른 프로세스/시트 직접 편집은 여기 잡히지 않으므로 CACHE_TTL / 🔄 로 보완)
+VERSION_POLL_SECONDS = int(os.environ.get("JOGAKDAL_VERSION_POLL_SECONDS", "20"))
+
+class SheetVersions:
+    """시트별 (쓰기 버전, 재작성 버전). 재작성 = 기존 행 수정/삭제 -> 증분 로드로는 반영 불가"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._versions: Dict[str, Tuple[int, int]] = {}
+
+    def get(self, key: str) -> Tuple[int, int]:
+        with self._lock:
+            return self._versions.get(key, (0, 0))
+
+    def bump(self, key: str, rewrite: bool = True) -> Tuple[int, int]:
+        with self._lock:
+            v, rv = self._versions.get(key, (0, 0))
+            self._versions[key] = (v + 1, rv + 1 if rewrite else rv)
+            return self._versions[key]
+
+    def snapshot(self) -> Dict[str, Tuple[int, int]]:
+        with self._lock:
+            return dict(self._versions)
+
+@per_tenant
+@st.cache_resource
+def get_sheet_versions(tenant: str) -> SheetVersions:
+    return SheetVersions()
+
+# ============================================================
+# [4-3. ID 발급기 - 시트별 고수위(high-water mark)]
+# ============================================================
+class IdAllocator:
+    """
+    프로세스 안에서는 lock으로 중복 없는 id 발급 (동시 append가 같은 max+1을 받던 문제).
+    고수위는 시트별 처음 발급 때 한 번만 전체 컬럼에서 구하고, 이후엔 최신 프레임의 끝부분만 확인해
+    다른 프로세스/시트 직접 입력으로 늘어난 id를 늦게(lazy) 반영
+    """
+    RECONCILE_TAIL = 50
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._hwm: Dict[str, int] = {}
+
+    @staticmethod
+    def _max_id(values: pd.Series) -> int:
+        v = pd.to_numeric(values, errors="coerce").max()
+        return 0 if pd.isna(v) else int(v)
+
+    def allocate(self, key: str, df: Optional[pd.DataFrame], id_column: str) -> int:
+        has_col = df is not None and not df.empty and id_column in df.columns
+        with self._lock:
+            hwm = self._hwm.get(key)
+            if hwm is None:
+                hwm = self._max_id(df[id_column]) if has_col else 0
+            elif has_col:
+                seen = self._max_id(df[id_column].iloc[-self.RECONCILE_TAIL:])
+                if seen > hwm:
+                    get_metrics().incr("ids", key, "reconciled")
+                    hwm = seen
+            hwm += 1
+            self._hwm[key] = hwm
+        get_metrics().incr("ids", key, "allocated")
+        return hwm
+
+    def high_water(self, key: str) -> Optional[int]:
+        with self._lock:
+            return self._hwm.get(key)
+
+@per_tenant
+@st.cache_resource
+def get_id_allocator(tenant: str) -> IdAllocator:
+    return IdAllocator()
+
+# ============================================================
+# [4-4. 시트별 쓰기 잠금 - 프로세스 내 읽고-수정-쓰기 직렬화]
+# ============================================================
+class SheetLockTimeout(Exception):
+    pass
+
+class SheetLocks:
+    """
+    시트별 RLock (append_row -> save 처럼 같은 스레드 재진입 허용).
+    대기 시간은 lock 그룹에 기록, 다른 세션이 잡고 있었으면 contended
+    """
+    TIMEOUT = 30
+
+    def __init__(self):
+        self._guard = threading.Lock()
+        self._locks: Dict[str, threading.RLock] = {}
+        self._local = threading.local()
+
+    def _lock(self, key: str) -> threading.RLock:
+        with self._guard:
+            if key not in self._locks:
+                self._locks[key] = threading.RLock()
+            return self._locks[key]
+
+    def _held(self) -> Dict[str, int]:
+        if not hasattr(self._local, "held"):
+            self._local.held = defaultdict(int)
+        return self._local.held
+
+    @contextmanager
+    def hold(self, key: str):
+        lock, held = self._lock(key), self._held()
+        if held[key]:
+            # 재진입: 이미 이 스레드가 보유 중
+            with lock:
+                held[key] += 1
+                try:
+                    yield
+                finally:
+                    held[key] -= 1
+            return
+
+        t0 = time.perf_counter()
+        if not lock.acquire(blocking=False):
+            get_metrics().incr("lock", key, "contended")
+            if not lock.acquire(timeout=self.TIMEOUT):
+                get_metrics().incr("lock", key, "timeouts")
+                raise SheetLockTimeout(key)
+        get_metrics().observe("lock", key, (time.perf_counter() - t0) * 1000)
+        held[key] += 1
+        try:
+            yield
+        finally:
+            held[key] -= 1
+            lock.release()
+
+@per_tenant
+@st.cache_resource
+def get_sheet_locks(tenant: str) -> SheetLocks:
+    return SheetLocks()
+
+def sheet_locked(fn):
+    """
+    DataManager 쓰기 메서드(첫 인자 key)를 시트 잠금 안에서 쓰기 우선순위로 실행.
+    잠금 획득 시점에 이 세션이 본 버전보다 시트가 앞서 있으면(다른 세션이 먼저 씀) conflicts로 기록
+    """
+    @functools.wraps(fn)
+    def wrapper(key: str, *args, **kwargs):
+        seen = st.session_state.get("cache_meta", {}).get(key, {}).get("version")
+        try:
+            with get_sheet_locks().hold(key), io_priority(IOPriority.WRITE):
+                if seen is not None and get_sheet_versions().get(key) != seen:
+                    get_metrics().incr("lock", key, "conflicts")
+                return fn(key, *args, **kwargs)
+        except SheetLockTimeout:
+            return SaveResult(success=False, error_msg="저장 대기 시간 초과")
+    return wrapper
+
+# ============================================================
+# [4-5. 로컬 스냅샷 - 재시작 후 웜 스타트]
+# ============================================================
+# 전체 시트 프레임을 Parquet으로 디스크에 보관. 재시작 직후 세션은 원격 읽기 대신 스냅샷을 바로 쓰고,
+# 백그라운드에서 원격 시트와 대조해 달라진 시트만 버전을 올림 -> 각 세션이 sync_versions로 다시 읽음
+SNAPSHOT_DIR = os.environ.get("JOGAKDAL_SNAPSHOT_DIR", "snapshots")  # 빈 값 = 사용 안 함
+SNAPSHOT_FLUSH_SECONDS = 30
+SNAPSHOT_RECONCILE_WAIT = 120  # 시작 시 대조가 쿼터를 기다리는 최대 시간(초)
+# 로그인 토큰/비밀번호 해시는 디스크에 남기지 않음 (인증은 항상 원격과 대조된 users로)
+SNAPSHOT_EXCLUDE = {"sessions", "users"}
+
+def frame_digest(df: Optional[pd.DataFrame]) -> str:
+    """행 순서까지 반영한 내용 지문 (dtype 차이는 문자열로 맞춰 비교)"""
+    if df is None:
+        return ""
+    h = hashlib.sha1("|".join(map(str, df.columns)).encode())
+    if len(df):
+        h.update(pd.util.hash_pandas_object(df.astype(str), index=False).values.tobytes())
+    return f"{len(df)}:{h.hexdigest()}"
+
+def _parquet_safe(df: pd.DataFrame) -> pd.DataFrame:
+    """Parquet은 열마다 한 타입 -> 숫자/문자가 섞인 object 열은 문자열로 (NaN 유지)"""
+    out = df.copy()
+    for c in out.columns:
+        s = out[c]
+        if s.dtype == object and s.map(type).nunique() > 1:
+            out[c] = s.where(s.isna(), s.astype(str))
+    out.columns = [str(c) for c in out.columns]
+    return out
+
+class SheetSnapshots:
+    """
+    시트별 (프레임, 메타). 메타: version(이 프레임이 반영한 시트 버전), confirmed_at(원격과 대조된 시각,
+    None = 디스크에서 읽고 아직 대조 전), digest(디스크 기록 시 지문)
+    """
+    MANIFEST = "manifest.json"
+
+    def __init__(self, directory: str, tenant: str = DEFAULT_TENANT):
+        self.dir = directory
+        self.tenant = tenant
+        self._lock = threading.Lock()
+        self._frames: Dict[str, pd.DataFrame] = {}
+        self._meta: Dict[str, dict] = {}
+        self._dirty: set = set()
+        self.reconciled = threading.Event()
+        if not directory:
+            self.reconciled.set()
+            return
+        with use_tenant(tenant):
+            self._load_disk()
+        threading.Thread(target=self._in_tenant(self._flush_loop), name=f"snapshot-flush-{tenant}", daemon=True).start()
+        threading.Thread(target=self._in_tenant(self._reconcile), name=f"snapshot-reconcile-{tenant}", daemon=True).start()
+
+    def _in_tenant(self, fn):
+        """작업 스레드의 시트 I/O/버전/잠금이 이 스냅샷의 매장을 가리키도록"""
+        def run(*args):
+            with use_tenant(self.tenant):
+                return fn(*args)
+        return run
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.dir, name)
+
+    def _read_manifest(self) -> Dict[str, dict]:
+        try:
+            with open(self._path(self.MANIFEST), encoding="utf-8") as f:
+                return json.load(f)
+        except Exception:
+            return {}
+
+    def _load_disk(self):
+        for key, info in self._read_manifest().items():
+            if key not in SHEET_NAMES:
+                continue
+            if base_key(key) in SNAPSHOT_EXCLUDE:
+                # 예전 버전이 남긴 파일 정리 (다음 flush 때 manifest에서도 빠짐)
+                try:
+                    os.remove(self._path(f"{key}.parquet"))
+                except OSError:
+                    pass
+                continue
+            t0 = time.perf_counter()
+            try:
+                df = pd.read_parquet(self._path(f"{key}.parquet"))
+            except Exception:
+                get_metrics().incr("snapshot", key, "errors")
+                continue
+            get_metrics().record_io("snapshot", key, time.perf_counter() - t0, rows=len(df), nbytes=estimate_df_bytes(df))
+            self._frames[key] = df
+            self._meta[key] = {"version": get_sheet_versions().get(key), "confirmed_at": None,
+                               "digest": info.get("digest")}
+
+    # ---------- 조회/갱신 ----------
+    def get(self, key: str) -> Optional[Tuple[pd.DataFrame, Tuple[int, int]]]:
+        """
+        세션 캐시가 빈 시트에 줄 프레임. 이 프로세스에서 그 뒤로 쓰기가 없었고(버전 일치),
+        대조 전(디스크 원본)이거나 원격과 대조한 지 CACHE_TTL 이내일 때만
+        """
+        with self._lock:
+            df, meta = self._frames.get(key), self._meta.get(key)
+        if df is None or meta["version"] != get_sheet_versions().get(key):
+            return None
+        confirmed = meta["confirmed_at"]
+        if confirmed is not None and time.monotonic() - confirmed > DataManager.CACHE_TTL:
+            return None
+        return df, meta["version"]
+
+    def confirmed(self, key: str, max_age: Optional[float] = None) -> Optional[pd.DataFrame]:
+        """
+        원격과 대조된(시작 시 대조/저장/전체 읽기) 프레임 - 그 뒤로 이 프로세스의 쓰기가 없을 때만.
+        max_age: 대조 후 허용 경과 초 (None = 이 프로세스에서 대조된 것이면 시각 무관)
+        """
+        with self._lock:
+            df, meta = self._frames.get(key), self._meta.get(key)
+        if df is None or meta["confirmed_at"] is None or meta["version"] != get_sheet_versions().get(key):
+            return None
+        if max_age is not None and time.monotonic() - meta["confirmed_at"] > max_age:
+            return None
+        return df
+
+    def put(self, key: str, df: pd.DataFrame, version: Tuple[int, int]):
+        """원격과 일치하는 전체 프레임 (전체/증분 읽기, 저장 직후). 더 오래된 버전이면 무시"""
+        if not self.dir or base_key(key) in SNAPSHOT_EXCLUDE:
+            return
+        with self._lock:
+            meta = self._meta.get(key)
+            if meta is not None and tuple(meta["version"]) > tuple(version):
+                return
+            self._frames[key] = df
+            self._meta[key] = {"version": version, "confirmed_at": time.monotonic(), "digest": None}
+            self._dirty.add(key)
+
+    # ---------- 디스크 기록 (주기적, 바뀐 시트만) ----------
+    def _flush_loop(self):
+        while True:
+            time.sleep(SNAPSHOT_FLUSH_SECONDS)
+            self.flush()
+
+    def flush(self):
+        with self._lock:
+            keys, self._dirty = self._dirty, set()
+            frames = {k: self._frames[k] for k in keys}
+        if not frames:
+            return
+        os.makedirs(self.dir, exist_ok=True)
+        manifest = {k: v for k, v in self._read_manifest().items() if base_key(k) not in SNAPSHOT_EXCLUDE}
+        for key, df in frames.items():
+            t0 = time.perf_counter()
+            path = self._path(f"{key}.parquet")
+            try:
+                _parquet_safe(df).to_parquet(path + ".tmp", index=False, compression="zstd")
+                os.replace(path + ".tmp", path)
+            except Exception:
+                get_metrics().incr("snapshot", key, "errors")
+                continue
+            manifest[key] = {"rows": len(df), "digest": frame_digest(df), "saved_at": now_str()}
+            get_metrics().observe("snapshot_write", key, (time.perf_counter() - t0) * 1000)
+        tmp = self._path(self.MANIFEST + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=1)
+        os.replace(tmp, self._path(self.MANIFEST))
+
+    # ---------- 시작 시 원격 대조 ----------
+    def _reconcile_one(self, key: str):
+        try:
+            # 대조 중에는 이 시트 쓰기를 막아 "읽은 원격 = 현재 버전"을 보장.
+            # 낮은 우선순위 - 쿼터는 잠금 잡기 전에 기다려 받아 둠 (기다리는 동안 쓰기를 막지 않도록)
+            with io_priority(IOPriority.BACKGROUND, max_wait=SNAPSHOT_RECONCILE_WAIT), get_quota().prepaid("read"), \
+                    get_sheet_locks().hold(key):
+                remote = DataManager._normalize_df(key, DataManager._read_sheet(key))
+                with self._lock:
+                    snap, meta = self._frames[key], self._meta[key]
+                version = get_sheet_versions().get(key)
+                if meta["version"] != version:
+                    return  # 그 사이 이 프로세스에서 저장됨 -> put으로 이미 최신
+                digest = frame_digest(remote)
+                changed = digest != (meta.get("digest") or frame_digest(snap))
+                if changed:
+                    # 스냅샷 뒤에 행만 붙었으면 각 세션은 증분 로드로 충분
+                    n = len(snap)
+                    appended = len(remote) > n and frame_digest(remote.iloc[:n]) == frame_digest(snap)
+                    version = get_sheet_versions().bump(key, rewrite=not appended)
+                with self._lock:
+                    self._frames[key] = remote
+                    self._meta[key] = {"version": version, "confirmed_at": time.monotonic(), "digest": digest}
+                    if changed:
+                        self._dirty.add(key)
+            get_metrics().incr("snapshot", key, "stale" if changed else "fresh")
+        except Exception:
+            get_metrics().incr("snapshot", key, "errors")
+
+    def _reconcile(self):
+        t0 = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=4) as ex:
+            list(ex.map(self._in_tenant(self._reconcile_one), list(self._frames)))
+        get_metrics().observe("snapshot", "reconcile", (time.perf_counter() - t0) * 1000)
+        self.reconciled.set()
+
+@per_tenant
+@st.cache_resource
+def get_snapshots(tenant: str) -> SheetSnapshots:
+    return SheetSnapshots(tenant_path(SNAPSHOT_DIR, tenant), tenant)
+
+# ============================================================
+# [4-6. 부서 파티션 - 세션은 자기 부서 + 공용 파티션만]
+# ============================================================
+# 다른 부서 것도 메뉴로 여는 게시판 시트 (열었을 때만 그 부서 파티션을 읽음)
+BOARD_PARTITION_KEYS = {"posts", "comments"}
+
+def session_depts(key: Optional[str] = None) -> List[str]:
+    """
+    이 세션이 읽는 파티션 (공용 먼저). 전체 소속(본사)/비로그인(CLI)은 모든 부서.
+    게시판 시트는 이 세션에서 연 다른 부서 게시판 파티션도 포함
+    """
+    dept = st.session_state.get("department", SHARED_DEPT)
+    if dept not in DEPARTMENTS or dept == SHARED_DEPT:
+        return list(DEPARTMENTS)
+    depts = [SHARED_DEPT, dept]
+    if key in BOARD_PARTITION_KEYS:
+        depts += [d for d in st.session_state.get("opened_depts", []) if d not in depts]
+    return depts
+
+def open_board_dept(dept: str):
+    """다른 부서 게시판 메뉴를 열 때 호출: 그 부서 게시글/댓글 파티션을 이후 이 세션이 읽음 (그 전에는 로드 안 함)"""
+    if dept in DEPARTMENTS and dept not in session_depts("posts"):
+        st.session_state.setdefault("opened_depts", []).append(dept)
+
+def dept_choices() -> List[str]:
+    """새 인폼/업무의 부서 선택지 (내 부서 먼저). 다른 부서 파티션에는 쓰지 않음"""
+    dept = st.session_state.get("department", SHARED_DEPT)
+    return [dept, SHARED_DEPT] if dept in DEPARTMENTS and dept != SHARED_DEPT else list(DEPARTMENTS)
+
+def physical_keys(key: str, depts: Optional[List[str]] = None) -> List[str]:
+    """논리 시트 키 -> 실제 워크시트 키 목록 (파티션 없는 시트는 그대로)"""
+    if key not in PARTITIONED_KEYS:
+        return [key]
+    return [part_key(key, d) for d in (depts or session_depts(key))]
+
+def partition_routed(fn):
+    """
+    DataManager 쓰기 메서드(첫 인자 key)에 논리 시트 키가 오면 대상 행의 파티션 키로 바꿔 호출
+    (append_row: 새 행 기준 / update_row·delete_row: 일치하는 행이 있는 파티션)
+    """
+    @functools.wraps(fn)
+    def wrapper(key: str, *args, **kwargs):
+        if key in PARTITIONED_KEYS:
+            key = DataManager._route(fn.__name__, key, *args, **kwargs)
+        return fn(key, *args, **kwargs)
+    return wrapper
+
+# ============================================================
+# [4-7. 시트 카탈로그 - 헤더/없는 워크시트 힌트 (프로세스 공용)]
+# ============================================================
+class SheetCatalog:
+    """
+    - headers: 마지막으로 본 시트 헤더. 세션 첫 프로젝션 읽기가 헤더 확인 호출 없이 범위를 정하는 데 사용
+      (읽은 범위의 1행으로 다시 검증하므로 틀려도 전체 읽기로 복구)
+    - missing: 없는 부서 워크시트 (MISSING_TTL 동안 원격 확인 생략, 다른 프로세스가 만들 수 있으므로 만료)
+    """
+    MISSING_TTL = 600
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.headers: Dict[str, List[str]] = {}
+        self._missing: Dict[str, float] = {}
+
+    def set_header(self, key: str, header: List[str]):
+        with self._lock:
+            self.headers[key] = list(header)
+            self._missing.pop(key, None)
+
+    def mark_missing(self, key: str, missing: bool = True):
+        with self._lock:
+            if missing:
+                self._missing[key] = time.monotonic()
+            else:
+                self._missing.pop(key, None)
+
+    def is_missing(self, key: str) -> bool:
+        with self._lock:
+            at = self._missing.get(key)
+        return at is not None and time.monotonic() - at < self.MISSING_TTL
+
+@per_tenant
+@st.cache_resource
+def get_sheet_catalog(tenant: str) -> SheetCatalog:
+    return SheetCatalog()
+
+# ============================================================
+# [4-8. 시트 API 쿼터 - 토큰 버킷 + 우선순위 (프로세스 공용)]
+# ============================================================
+# 분당 요청 한도 (서비스 계정 하나 = 읽기/쓰기 각각). 0 = 제한 없음 (로컬 대역 연결 기본값)
+_QUOTA_DEFAULT = "0" if os.environ.get("JOGAKDAL_FAKE_SHEETS") else "60"
+SHEETS_QUOTA_PER_MIN = {"read": int(os.environ.get("JOGAKDAL_SHEETS_READ_PER_MIN", _QUOTA_DEFAULT)),
+                        "write": int(os.environ.get("JOGAKDAL_SHEETS_WRITE_PER_MIN", _QUOTA_DEFAULT))}
+
+class IOPriority:
+    WRITE = 0       # 사용자 저장 (잠금 안 최신본 다시 읽기 포함)
+    READ = 1        # 지금 화면에 필요한 읽기
+    BACKGROUND = 2  # 메뉴 프리패치, 스냅샷 대조 등
+    NAMES = ["write", "read", "background"]
+
+class QuotaDeferred(Exception):
+    """남은 쿼터가 이 우선순위 몫보다 적어 호출을 미룸 (원격 호출 없음)"""
+
+_io_local = threading.local()
+
+def current_io_priority() -> Tuple[Optional[int], Optional[float]]:
+    return getattr(_io_local, "priority", (None, None))
+
+@contextmanager
+def io_priority(priority: int, max_wait: Optional[float] = None):
+    """이 스레드의 시트 호출 우선순위 지정 (max_wait None = 우선순위 기본값). 바깥이 더 높으면 유지"""
+    prev = current_io_priority()
+    if prev[0] is not None and prev[0] < priority:
+        yield
+        return
+    _io_local.priority = (priority, max_wait)
+    try:
+        yield
+    finally:
+        _io_local.priority = prev
+
+def is_quota_error(e: Exception) -> bool:
+    """429 RESOURCE_EXHAUSTED (gspread APIError / 로컬 대역)"""
+    status = getattr(getattr(e, "response", None), "status_code", None)
+    return status == 429 or "429" in str(e) or "RESOURCE_EXHAUSTED" in str(e)
+
+class QuotaScheduler:
+    """
+    읽기/쓰기별 토큰 버킷 (분당 한도만큼 채워지고 초당 한도/60씩 충전).
+    - 우선순위마다 남겨 둘 몫(RESERVE, 버킷 비율): 낮은 우선순위는 예산이 줄면 먼저 밀림
+    - 대기 중인 더 높은 우선순위가 있으면 양보. MAX_WAIT 안에 못 받으면 QuotaDeferred (프리패치는 즉시)
+    - 429를 받으면 버킷을 비움 (다른 프로세스가 같은 쿼터를 쓰는 경우)
+    """
+    RESERVE = [0.0, 0.1, 0.4]
+    MAX_WAIT = [30.0, 10.0, 0.0]
+
+    def __init__(self, per_minute: Dict[str, int]):
+        self._cond = threading.Condition()
+        self.limits = {kind: n for kind, n in per_minute.items() if n > 0}
+        now = time.monotonic()
+        self._tokens = {kind: float(n) for kind, n in self.limits.items()}
+        self._stamp = {kind: now for kind in self.limits}
+        self._waiting = {kind: [0] * len(IOPriority.NAMES) for kind in self.limits}
+
+    def _refill(self, kind: str, now: float):
+        n = self.limits[kind]
+        self._tokens[kind] = min(n, self._tokens[kind] + (now - self._stamp[kind]) * n / 60)
+        self._stamp[kind] = now
+
+    def acquire(self, kind: str):
+        """토큰 1개 (우선순위는 io_priority, 없으면 쓰기/읽기 기본). 제한 없는 종류는 바로 통과"""
+        if kind not in self.limits:
+            return
+        if getattr(_io_local, "prepaid", None) == kind:
+            _io_local.prepaid = None
+            return
+        priority, max_wait = current_io_priority()
+        if priority is None:
+            priority = IOPriority.WRITE if kind == "write" else IOPriority.READ
+        max_wait = self.MAX_WAIT[priority] if max_wait is None else max_wait
+        floor = self.limits[kind] * self.RESERVE[priority]
+        name = f"{kind}/{IOPriority.NAMES[priority]}"
+        t0 = time.monotonic()
+        with self._cond:
+            waiting = self._waiting[kind]
+            waiting[priority] += 1
+            try:
+                while True:
+                    now = time.monotonic()
+                    self._refill(kind, now)
+                    ahead = any(waiting[:priority])
+                    if not ahead and self._tokens[kind] - 1 >= floor:
+                        self._tokens[kind] -= 1
+                        break
+                    left = t0 + max_wait - now
+                    if left <= 0:
+                        get_metrics().incr("quota", name, "deferred")
+                        raise QuotaDeferred(name)
+                    need = 0.05 if ahead else (floor + 1 - self._tokens[kind]) * 60 / self.limits[kind]
+                    self._cond.wait(min(left, max(need, 0.01)))
+            finally:
+                waiting[priority] -= 1
+                self._cond.notify_all()
+        get_metrics().incr("quota", name, "granted")
+        waited = time.monotonic() - t0
+        if waited > 0.001:
+            get_metrics().incr("quota", name, "waited")
+            get_metrics().observe("quota", name, waited * 1000)
+
+    def penalize(self, kind: str):
+        if kind not in self.limits:
+            return
+        with self._cond:
+            self._refill(kind, time.monotonic())
+            self._tokens[kind] = 0.0
+        get_metrics().incr("quota", kind, "throttled")
+
+    @contextmanager
+    def prepaid(self, kind: str):
+        """토큰을 미리 받아 두고 안의 첫 호출에 사용 (안 쓰고 나오면 반납)"""
+        self.acquire(kind)
+        _io_local.prepaid = kind
+        try:
+            yield
+        finally:
+            if getattr(_io_local, "prepaid", None) == kind:
+                _io_local.prepaid = None
+                if kind in self.limits:
+                    with self._cond:
+                        self._tokens[kind] = min(self.limits[kind], self._tokens[kind] + 1)
+                        self._cond.notify_all()
+
+    @contextmanager
+    def slot(self, kind: str):
+        """호출 하나를 감쌈: 토큰 받고 실행, 429면 버킷 비움"""
+        self.acquire(kind)
+        try:
+            yield
+        except Exception as e:
+            if is_quota_error(e):
+                self.penalize(kind)
+            raise
+
+    def status(self) -> pd.DataFrame:
+        """종류별 남은 토큰/대기 수 (관리 > 성능)"""
+        rows = []
+        with self._cond:
+            now = time.monotonic()
+            for kind, n in self.limits.items():
+                self._refill(kind, now)
+                row = {"종류": kind, "분당 한도": n, "남은 토큰": round(self._tokens[kind], 1)}
+                row.update({f"대기 {p}": w for p, w in zip(IOPriority.NAMES, self._waiting[kind])})
+                rows.append(row)
+        return pd.DataFrame(rows)
+
+@st.cache_resource
+def get_quota() -> QuotaScheduler:
+    return QuotaScheduler(SHEETS_QUOTA_PER_MIN)
+
 # ============================================================
 # [5. DataManager - 충돌 완화 + 캐시 + (홈/팝업) 최소 프리패치]
 # ============================================================
 class DataManager:
     CACHE_TTL = 600
+    # 셀 단위 차분 저장 상한: 바뀐 행이 이보다 많거나 이 비율을 넘으면 전체 저장
+    DIFF_MAX_ROWS = 500
+    DIFF_MAX_RATIO = 0.3
+    # append-like 증분 로드 안전장치: 이 주기마다 한 번은 전체 재동기화
+    FULL_RESYNC_INTERVAL = 1800
+
+    # append-like: 행 버전 로그 (수정/삭제도 행 추가, 저장은 최신본과 행 union으로 동시저장 덮어쓰기 완화)
+    APPEND_LIKE_KEYS = {k for base in ["posts", "comments", "routine_log", "inform_logs", "inform_notes"]
+                        for k in [base] + physical_keys(base, DEPARTMENTS)}
 
-    # append-like: row_uuid 기반 union merge 저장으로 동시저장 덮어쓰기 완화
-    APPEND_LIKE_KEYS = {"posts", "comments", "routine_log", "inform_logs", "inform_notes"}
+    # 컬럼 프로젝션 시 항상 함께 읽는 기준 컬럼 (행 수 판정 - 끝쪽 빈 셀이 생략돼도 행이 빠지지 않도록)
+    ANCHOR_COLUMNS = {"users": "username", "sessions": "token",
+                      **{k: "id" for k in physical_keys("routine_def", DEPARTMENTS)}, "routine_def": "id"}
 
     @staticmethod
     def _is_cache_valid(key: str) -> bool:
@@ -258,22 +1386,88 @@ class DataManager:
         return None
 
     @staticmethod
-    def _set_cache(key: str, df: pd.DataFrame):
-        if "data_cache" not in st.session_state:
-            st.session_state["data_cache"] = {}
-        if "cache_time" not in st.session_state:
-            st.session_state["cache_time"] = {}
-        st.session_state["data_cache"][key] = df.copy()
+    def _set_cache(key: str, df: pd.DataFrame, full: bool = True, cols: Optional[List[str]] = None,
+                   version: Optional[Tuple[int, int]] = None, confirmed: bool = True):
+        """
+        full=True: 시트 전체 행을 반영한 프레임 (전체 읽기/전체 저장/프로젝션 읽기 직후)
+        cols: 일부 컬럼만 담은 프레임이면 그 컬럼 목록 (None = 전체 컬럼, 헤더도 함께 갱신)
+        version: 이 프레임이 반영한 시트 버전 (읽기는 읽기 시작 시점 버전, None = 현재 버전)
+        confirmed: 원격과 일치하는 프레임 -> 전체 컬럼이면 로컬 스냅샷도 갱신 (False = 스냅샷에서 온 프레임)
+        cache_meta에는 시트 행 수와 마지막 행 row_uuid(고수위)를 남겨 증분 로드에 사용
+        """
+        for k in ["data_cache", "cache_time", "cache_meta"]:
+            if k not in st.session_state:
+                st.session_state[k] = {}
+        df = df.copy()
+        df.index = pd.RangeIndex(len(df))
+        st.session_state["data_cache"][key] = df
         st.session_state["cache_time"][key] = get_now()
+        meta = st.session_state["cache_meta"].setdefault(key, {})
+        meta["rows"] = len(df)
+        meta["tail_uuid"] = str(df["row_uuid"].iloc[-1]) if ("row_uuid" in df.columns and len(df)) else None
+        meta["cols"] = list(cols) if cols is not None else None
+        meta["version"] = version if version is not None else get_sheet_versions().get(key)
+        meta["confirmed"] = confirmed
+        if cols is None:
+            meta["header"] = list(df.columns)
+            if len(df.columns):
+                get_sheet_catalog().set_header(key, meta["header"])
+            if confirmed:
+                get_snapshots().put(key, df, meta["version"])
+        if full:
+            meta["full_at"] = get_now()
 
     @staticmethod
     def clear_cache(key: str = None):
         if key:
-            st.session_state.get("data_cache", {}).pop(key, None)
-            st.session_state.get("cache_time", {}).pop(key, None)
+            for k in physical_keys(key, DEPARTMENTS):
+                st.session_state.get("data_cache", {}).pop(k, None)
+                st.session_state.get("cache_time", {}).pop(k, None)
+                st.session_state.get("cache_meta", {}).pop(k, None)
+                st.session_state.get("_resolved", {}).pop(k, None)
+            st.session_state.get("_partition_frames", {}).pop(key, None)
         else:
             st.session_state["data_cache"] = {}
             st.session_state["cache_time"] = {}
+            st.session_state["cache_meta"] = {}
+            st.session_state["_partition_frames"] = {}
+            st.session_state["_resolved"] = {}
+
+    @staticmethod
+    def mark_stale(keys: Optional[List[str]] = None, rewritten: bool = False):
+        """
+        캐시 프레임은 남기고 TTL만 만료 -> 다음 load에서 원격 확인 (append-like는 증분 로드).
+        rewritten=True면 기존 행이 바뀐 것이므로 증분 대신 전체 재읽기
+        """
+        cache_time = st.session_state.get("cache_time", {})
+        metas = st.session_state.get("cache_meta", {})
+        for key in list(cache_time) if keys is None else [p for k in keys for p in physical_keys(k, DEPARTMENTS)]:
+            cache_time.pop(key, None)
+            if rewritten:
+                metas.get(key, {}).pop("full_at", None)
+
+    @staticmethod
+    def sync_versions() -> List[str]:
+        """
+        rerun마다 호출: 이 세션이 캐시한 시트 중 다른 세션이 쓴 시트만 골라 stale 처리.
+        반환: 바뀐 시트 키 목록
+        """
+        current = get_sheet_versions().snapshot()
+        changed = []
+        for key, meta in st.session_state.get("cache_meta", {}).items():
+            if key not in st.session_state.get("data_cache", {}):
+                continue
+            seen = meta.get("version") or (0, 0)
+            now_v = current.get(key, (0, 0))
+            if now_v == seen:
+                continue
+            DataManager.mark_stale([key], rewritten=now_v[1] != seen[1])
+            # 같은 변경으로 반복 무효화하지 않도록 (다음 load가 버전을 다시 기록). 프레임은 더 이상 원격과 같지 않음
+            meta["version"] = now_v
+            meta["confirmed"] = False
+            get_metrics().incr("cache", key, "invalidated")
+            changed.append(key)
+        return changed
 
     @staticmethod
     def _normalize_df(key: str, df: pd.DataFrame) -> pd.DataFrame:
@@ -285,38 +1479,611 @@ class DataManager:
             raise ValueError("users 헤더 오류(username 없음)")
         return df
 
+    # ---------- 시트 I/O (모든 conn 호출은 여기를 거쳐 계측) ----------
+    @staticmethod
+    def _read_sheet(key: str, worksheet: Optional[str] = None) -> pd.DataFrame:
+        """worksheet: SHEET_NAMES에 없는 워크시트(보관 시트 등)의 실제 이름 - key는 계측용"""
+        t0 = time.perf_counter()
+        try:
+            df = tenant_conn().read(worksheet or SHEET_NAMES[key])
+        except Exception:
+            get_metrics().record_io("read", key, time.perf_counter() - t0, ok=False)
+            raise
+        get_metrics().record_io("read", key, time.perf_counter() - t0,
+                                rows=0 if df is None else len(df), nbytes=estimate_df_bytes(df))
+        return df
+
+    @staticmethod
+    def _write_sheet(key: str, df: pd.DataFrame, worksheet: Optional[str] = None):
+        """worksheet: _read_sheet와 같음 (이름을 직접 받은 쓰기는 워크시트 생성을 호출측이 맡음)"""
+        t0 = time.perf_counter()
+        try:
+            tenant_conn().update(worksheet or SHEET_NAMES[key], df)
+        except Exception as e:
+            if isinstance(e, QuotaDeferred) or worksheet or key_dept(key) in (None, SHARED_DEPT) \
+                    or DataManager._sheet_exists(key):
+                get_metrics().record_io("update", key, time.perf_counter() - t0, ok=False)
+                raise
+            # 부서 워크시트 첫 쓰기 -> 생성
+            tenant_conn().create(SHEET_NAMES[key], df)
+            get_sheet_catalog().mark_missing(key, False)
+        get_metrics().record_io("update", key, time.perf_counter() - t0, rows=len(df), nbytes=estimate_df_bytes(df))
+
+    @staticmethod
+    def _write_values(key: str, data: List[Tuple[str, List[list]]]):
+        """values API 다중 범위 쓰기 (values_batch_update 1회). 미지원 연결이면 NotImplementedError"""
+        ss = get_spreadsheet()
+        if ss is None or not hasattr(ss, "values_batch_update"):
+            raise NotImplementedError("range write")
+        body = {
+            "valueInputOption": "USER_ENTERED",
+            "data": [{"range": a1_range(key, rng), "values": values} for rng, values in data],
+        }
+        t0 = time.perf_counter()
+        try:
+            with get_quota().slot("write"):
+                ss.values_batch_update(body)
+        except Exception:
+            get_metrics().record_io("update", key, time.perf_counter() - t0, ok=False)
+            raise
+        get_metrics().record_io("update", key, time.perf_counter() - t0, rows=sum(len(v) for _, v in data),
+                                nbytes=estimate_values_bytes([v for _, v in data]))
+
+    @staticmethod
+    def _read_values(key: str, ranges: List[str]) -> List[List[list]]:
+        """
+        values API 범위 읽기 (범위별 문자열 격자). 범위가 여러 개면 values_batch_get 1회 호출.
+        미지원 연결이면 NotImplementedError
+        """
+        ss = get_spreadsheet()
+        if ss is None:
+            raise NotImplementedError("range read")
+        t0 = time.perf_counter()
+        try:
+            with get_quota().slot("read"):
+                if len(ranges) == 1:
+                    grids = [ss.values_get(a1_range(key, ranges[0])).get("values", [])]
+                else:
+                    resp = ss.values_batch_get([a1_range(key, r) for r in ranges])
+                    grids = [vr.get("values", []) for vr in resp.get("valueRanges", [])]
+        except Exception:
+            get_metrics().record_io("read", key, time.perf_counter() - t0, ok=False)
+            raise
+        get_metrics().record_io("read", key, time.perf_counter() - t0, rows=max((len(g) for g in grids), default=0),
+                                nbytes=estimate_values_bytes(grids))
+        return grids
+
+    @staticmethod
+    def _read_values_multi(requests: List[Tuple[str, str]]) -> List[List[list]]:
+        """여러 시트의 범위를 values_batch_get 1회로 ((key, 범위) 목록, 범위 "" = 시트 전체)"""
+        ss = get_spreadsheet()
+        if ss is None or not hasattr(ss, "values_batch_get"):
+            raise NotImplementedError("batch read")
+        t0 = time.perf_counter()
+        try:
+            with get_quota().slot("read"):
+                resp = ss.values_batch_get([a1_range(k, rng) for k, rng in requests])
+            grids = [vr.get("values", []) for vr in resp.get("valueRanges", [])]
+            if len(grids) != len(requests):
+                raise ValueError("batch 응답 범위 수 불일치")
+        except Exception:
+            get_metrics().record_io("read", "(batch)", time.perf_counter() - t0, ok=False)
+            raise
+        get_metrics().record_io("read", "(batch)", time.perf_counter() - t0,
+                                rows=sum(len(g) for g in grids), nbytes=estimate_values_bytes(grids))
+        for k in dict.fromkeys(k for k, _ in requests):
+            get_metrics().incr("read", k, "batched")
+        return grids
+
+    @staticmethod
+    def _read_range(key: str, rng: str) -> List[list]:
+        return DataManager._read_values(key, [rng])[0]
+
+    @staticmethod
+    def _sheet_header(key: str) -> List[str]:
+        """헤더(1행) - 세션 캐시에 보관, 없으면 1행만 범위 읽기"""
+        meta = st.session_state.setdefault("cache_meta", {}).setdefault(key, {})
+        if meta.get("header") is None:
+            rows = DataManager._read_range(key, "1:1")
+            meta["header"] = [str(c).strip() for c in rows[0]] if rows else []
+            get_sheet_catalog().set_header(key, meta["header"])
+        return meta["header"]
+
+    @staticmethod
+    def _projection(key: str, columns: List[str]) -> List[str]:
+        """요청 컬럼 + 기준 컬럼(append-like는 row_uuid) - 순서 유지, 중복 제거"""
+        anchor = "row_uuid" if key in DataManager.APPEND_LIKE_KEYS else DataManager.ANCHOR_COLUMNS.get(key)
+        return list(dict.fromkeys(list(columns) + ([anchor] if anchor else [])))
+
+    @staticmethod
+    def _covers(key: str, want: Optional[List[str]]) -> bool:
+        """캐시 프레임이 want 컬럼을 모두 담고 있는지 (want None = 전체 컬럼 필요)"""
+        held = st.session_state.get("cache_meta", {}).get(key, {}).get("cols")
+        if held is None:
+            return True
+        return want is not None and set(want) <= set(held)
+
+    @staticmethod
+    def _load_projected(key: str, columns: List[str]) -> pd.DataFrame:
+        """
+        필요한 컬럼만 범위 읽기 (연속 컬럼끼리 묶어 A1 범위로, 한 번의 batch 호출).
+        각 범위 1행(헤더)을 캐시 헤더와 대조해 컬럼 위치가 바뀌었으면 헤더를 버리고 예외 (-> 전체 읽기)
+        """
+        header = DataManager._sheet_header(key)
+        groups, ranges = DataManager._projected_ranges(key, header, columns)
+        return DataManager._projected_frame(key, header, groups, DataManager._read_values(key, ranges))
+
+    @staticmethod
+    def _projected_ranges(key: str, header: List[str], columns: List[str]) -> Tuple[List[List[int]], List[str]]:
+        """요청 컬럼 위치를 연속 구간으로 묶은 A1 범위 (1행 헤더 포함)"""
+        pos = {}
+        for i, c in enumerate(header):
+            pos.setdefault(c, i)
+        if key in DataManager.APPEND_LIKE_KEYS:
+            # 로그 시트는 tombstone 컬럼도 함께 (있을 때만) -> 읽는 쪽에서 삭제 행을 거름
+            columns = list(columns) + [TOMBSTONE_COLUMN]
+        idx = sorted({pos[c] for c in columns if c in pos})
+        if not idx:
+            raise KeyError(f"{key}: 요청 컬럼 없음")
+
+        groups: List[List[int]] = []
+        for i in idx:
+            if groups and i == groups[-1][-1] + 1:
+                groups[-1].append(i)
+            else:
+                groups.append([i])
+        return groups, [f"{col_letter(g[0] + 1)}1:{col_letter(g[-1] + 1)}" for g in groups]
+
+    @staticmethod
+    def _projected_frame(key: str, header: List[str], groups: List[List[int]], grids: List[List[list]]) -> pd.DataFrame:
+        for g, grid in zip(groups, grids):
+            got = [str(c).strip() for c in (grid[0] if grid else [])]
+            if got + [""] * (len(g) - len(got)) != [header[i] for i in g]:
+                st.session_state.get("cache_meta", {}).get(key, {}).pop("header", None)
+                raise ValueError(f"{key}: 헤더 변경 감지")
+
+        # 범위별로 파싱 후 옆으로 붙임 (끝쪽 빈 행이 생략된 범위는 NaN으로 채워 행 수를 맞춤)
+        n = max(len(grid) for grid in grids) - 1
+        parts = [values_to_df([header[i] for i in g], grid[1:]).reindex(pd.RangeIndex(max(n, 0)))
+                 for g, grid in zip(groups, grids)]
+        get_metrics().incr("read", key, "projected")
+        df = parts[0] if len(parts) == 1 else pd.concat(parts, axis=1)
+        df.columns = df.columns.str.strip()
+        return df
+
+    @staticmethod
+    def _load_delta(key: str) -> Optional[pd.DataFrame]:
+        """
+        append-like 시트 증분 로드: 마지막으로 본 행 이후(tail)만 범위 읽기 후 캐시 프레임에 병합.
+        - 첫 행은 캐시의 마지막 행을 다시 읽어 row_uuid(고수위)로 검증 -> 재작성/삭제로 어긋나면 None
+        - 헤더(1행)도 같은 호출로 읽어 캐시 헤더와 비교 -> 다른 쓰기가 컬럼을 늘렸으면(deleted/ts 등) None
+        - 전체 재동기화 주기가 지났거나 범위 읽기 미지원이면 None (-> 호출측이 전체 로드)
+        """
+        base = st.session_state.get("data_cache", {}).get(key)
+        meta = st.session_state.get("cache_meta", {}).get(key, {})
+        n = meta.get("rows")
+        if base is None or base.empty or n != len(base) or not meta.get("tail_uuid"):
+            return None
+        full_at = meta.get("full_at")
+        if full_at is None or (get_now() - full_at).total_seconds() > DataManager.FULL_RESYNC_INTERVAL:
+            return None
+
+        # 일부 컬럼만 캐시된 경우에도 tail은 행 전체를 읽고 보유 컬럼만 남김
+        cols = meta.get("header") or list(base.columns)
+        known = get_sheet_catalog().headers.get(key)
+        if known is not None and known != cols:
+            # 이 프로세스의 다른 세션이 넓힌 시트 -> 원격 확인 없이 전체 로드
+            get_metrics().incr("read", key, "delta_mismatch")
+            return None
+        try:
+            head, rows = DataManager._read_values(key, ["1:1", f"A{n + 1}:{col_letter(len(cols))}"])
+        except NotImplementedError:
+            return None
+        if [str(c).strip() for c in (head[0] if head else [])] != cols:
+            get_metrics().incr("read", key, "delta_mismatch")
+            return None
+        uuid_pos = cols.index("row_uuid")
+        first = rows[0] if rows else []
+        if len(first) <= uuid_pos or str(first[uuid_pos]).strip() != meta["tail_uuid"]:
+            get_metrics().incr("read", key, "delta_mismatch")
+            return None
+
+        get_metrics().incr("read", key, "delta")
+        new_rows = rows[1:]
+        if not new_rows:
+            return base
+        tail = values_to_df(cols, new_rows)
+        tail.columns = tail.columns.str.strip()
+        get_metrics().incr("read", key, "delta_rows", len(tail))
+        return pd.concat([base, tail[list(base.columns)]], ignore_index=True)
+
     @staticmethod
     def _sheet_exists(key: str) -> bool:
+        """쿼터로 미룬 확인은 QuotaDeferred 그대로 (없는 시트로 오인하지 않도록)"""
+        try:
+            # 헤더 1행만 확인 (범위 읽기 미지원 연결이면 전체 읽기)
+            DataManager._sheet_header(key)
+            return True
+        except (NotImplementedError, QuotaDeferred) as e:
+            if isinstance(e, QuotaDeferred):
+                raise
+        except Exception:
+            return False
         try:
-            _ = conn.read(worksheet=SHEET_NAMES[key], ttl=0)
+            _ = DataManager._read_sheet(key)
             return True
+        except QuotaDeferred:
+            raise
         except Exception:
             return False
 
     @staticmethod
-    def load(key: str, force_refresh: bool = False) -> LoadResult:
+    def load(key: str, force_refresh: bool = False, full: bool = False,
+             columns: Optional[List[str]] = None) -> LoadResult:
+        """
+        force_refresh: TTL 무시하고 원격 확인
+        full: append-like 시트도 증분(tail) 대신 전체 읽기 (읽고-수정-쓰기 경로용, columns 무시).
+              append-like 시트는 full이면 시트 행 그대로(버전/tombstone 포함), 아니면 row_uuid별 최신 상태
+        columns: 필요한 컬럼만 범위 읽기로 로드. 반환 프레임은 최소 이 컬럼들을 포함
+                 (이미 더 많은 컬럼이 캐시돼 있으면 그대로 반환, 부족하면 합집합으로 다시 읽어 확장)
+        """
+        if key in PARTITIONED_KEYS:
+            return DataManager._load_partitioned(key, force_refresh, full, columns)
+        res = DataManager._load_rows(key, force_refresh, full, columns)
+        if full or key not in DataManager.APPEND_LIKE_KEYS:
+            return res
+        return LoadResult(data=DataManager._resolved(key, res.data), success=res.success, error_msg=res.error_msg)
+
+    @staticmethod
+    def _resolved(key: str, rows: pd.DataFrame) -> pd.DataFrame:
+        """캐시 프레임(시트 행 그대로)의 최신 상태 뷰. 캐시 프레임이 그대로면 같은 객체 (프레임 동일성 기반 메모 유지)"""
+        memo = st.session_state.setdefault("_resolved", {})
+        hit = memo.get(key)
+        if hit is None or hit[0] is not rows:
+            hit = memo[key] = (rows, DataManager._last_write_wins(rows))
+        return hit[1]
+
+    @staticmethod
+    def _last_write_wins(df: pd.DataFrame) -> pd.DataFrame:
+        """
+        행 버전 로그 -> row_uuid별 최신 상태 (시트 아래쪽 행 = 나중 쓰기).
+        자리는 처음 나온 위치, 값은 마지막 버전. 마지막 버전이 tombstone이면 제외. 버전/삭제가 없으면 그대로
+        """
+        if df.empty or "row_uuid" not in df.columns:
+            return df
+        ids = df["row_uuid"].astype(str).str.strip()
+        blank = ids.isin(["", "nan", "None"])
+        if blank.any():
+            # row_uuid 없는 행은 각자 한 행
+            ids = ids.mask(blank, "#" + pd.Series(np.arange(len(df)), index=df.index).astype(str))
+        superseded = ids.duplicated(keep="last").to_numpy()
+        dead = (df[TOMBSTONE_COLUMN].astype(str).str.strip() == "True").to_numpy() \
+            if TOMBSTONE_COLUMN in df.columns else np.zeros(len(df), dtype=bool)
+        if not superseded.any() and not dead.any():
+            return df
+        first = pd.Series(np.arange(len(df))).groupby(ids.to_numpy(), sort=False).transform("min").to_numpy()
+        live = np.flatnonzero(~superseded & ~dead)
+        return df.iloc[live[np.argsort(first[live], kind="stable")]].reset_index(drop=True)
+
+    @staticmethod
+    def _version_rows(view: pd.DataFrame, mask: pd.Series, updates: Optional[dict]) -> pd.DataFrame:
+        """로그 시트 변경 = 대상 행(최신 상태)의 새 버전 행. updates None = 삭제(tombstone)"""
+        rows = view[mask].copy()
+        if updates is None:
+            rows[TOMBSTONE_COLUMN] = "True"
+        else:
+            for col, val in updates.items():
+                if col in rows.columns and rows[col].dtype != object:
+                    rows[col] = rows[col].astype(object)
+                rows[col] = val
+        return rows
+
+    @staticmethod
+    def _load_rows(key: str, force_refresh: bool, full: bool, columns: Optional[List[str]]) -> LoadResult:
+        """물리 시트 하나를 (캐시/스냅샷/증분/프로젝션/전체 읽기 순으로) 시트 행 그대로 로드"""
+        want = DataManager._projection(key, columns) if (columns and not full) else None
+        version = get_sheet_versions().get(key)
         if not force_refresh:
             cached = DataManager._get_from_cache(key)
-            if cached is not None:
+            hit = cached is not None and DataManager._covers(key, want)
+            get_metrics().record_cache(key, hit)
+            if hit:
                 return LoadResult(data=cached, success=True)
+            # 웜 스타트: 이 세션에 없는 시트는 로컬 스냅샷부터 (원격 대조는 백그라운드)
+            if key not in st.session_state.get("data_cache", {}):
+                snap = get_snapshots().get(key)
+                if snap is not None:
+                    DataManager._set_cache(key, snap[0], version=snap[1], confirmed=False)
+                    get_metrics().incr("cache", key, "snapshot")
+                    return LoadResult(data=st.session_state["data_cache"][key], success=True)
+
+        if not full and get_sheet_catalog().is_missing(key):
+            # 최근 없음을 확인한 부서 워크시트 (읽기 전용 경로만 - 쓰기는 full로 다시 확인)
+            return DataManager._cache_missing(key, version)
+
+        meta = st.session_state.get("cache_meta", {}).get(key, {})
+        if not full and key in DataManager.APPEND_LIKE_KEYS and DataManager._covers(key, want):
+            try:
+                df = DataManager._load_delta(key)
+                if df is not None:
+                    DataManager._set_cache(key, df, full=False, cols=meta.get("cols"), version=version)
+                    return LoadResult(data=st.session_state["data_cache"][key], success=True)
+            except QuotaDeferred:
+                return DataManager._load_fallback(key)
+            except Exception:
+                pass
 
-        for _ in range(3):
+        if want is not None:
+            held = meta.get("cols") if key in st.session_state.get("data_cache", {}) else None
+            cols = list(dict.fromkeys(want + (held or [])))
             try:
-                df = conn.read(worksheet=SHEET_NAMES[key], ttl=0)
+                df = DataManager._load_projected(key, cols)
+                DataManager._set_cache(key, df, cols=list(df.columns), version=version)
+                return LoadResult(data=st.session_state["data_cache"][key], success=True)
+            except QuotaDeferred:
+                return DataManager._load_fallback(key)
+            except Exception:
+                pass
+
+        for attempt in range(3):
+            if attempt:
+                get_metrics().incr("read", key, "retries")
+            try:
+                df = DataManager._read_sheet(key)
                 df = DataManager._normalize_df(key, df)
-                DataManager._set_cache(key, df)
+                DataManager._set_cache(key, df, version=version)
                 return LoadResult(data=df, success=True)
+            except QuotaDeferred:
+                break
             except Exception:
+                try:
+                    if key_dept(key) not in (None, SHARED_DEPT) and not DataManager._sheet_exists(key):
+                        # 아직 행이 없는 부서 워크시트 = 빈 파티션 (첫 쓰기 때 생성)
+                        get_sheet_catalog().mark_missing(key)
+                        return DataManager._cache_missing(key, version)
+                except QuotaDeferred:
+                    break
                 time.sleep(0.5)
                 continue
+        return DataManager._load_fallback(key)
 
+    @staticmethod
+    def _load_fallback(key: str) -> LoadResult:
+        """원격 읽기 실패/쿼터로 미룸 -> 세션 캐시가 있으면 그것, 없으면 빈 프레임"""
         cached = st.session_state.get("data_cache", {}).get(key)
         if cached is not None:
             return LoadResult(data=cached, success=False, error_msg="캐시 사용")
         return LoadResult(data=pd.DataFrame(), success=False, error_msg="로드 실패")
 
+    @staticmethod
+    def _diff_ranges(key: str, new: pd.DataFrame, append_only: bool = False) -> Optional[List[Tuple[str, List[list]]]]:
+        """
+        세션 캐시(방금 읽은 원격 상태)와 새 프레임의 셀 차이 -> values API 범위 목록.
+        None = 전체 저장이 필요 (기준 프레임 없음/스냅샷·일부 컬럼 캐시/다른 저장 이후, 컬럼 변경, 행 삭제, 큰 변경,
+        원격 격자가 기준과 어긋남)
+        append_only면 기존 행 비교 없이 뒤에 붙은 행만
+        """
+        base = st.session_state.get("data_cache", {}).get(key)
+        meta = st.session_state.get("cache_meta", {}).get(key, {})
+        if (base is None or base.empty or not meta.get("confirmed") or meta.get("cols") is not None
+                or key not in st.session_state.get("cache_time", {})
+                or meta.get("rows") != len(base) or meta.get("version") != get_sheet_versions().get(key)):
+            return None
+        header = list(base.columns)
+        if list(new.columns) != header or len(new) < len(base):
+            return None
+        n, width = len(base), len(header)
+
+        if append_only:
+            changed = np.zeros((n, width), dtype=bool)
+        else:
+            cur = new.iloc[:n]
+            changed = np.empty((n, width), dtype=bool)
+            for j, c in enumerate(header):
+                a, b = base[c].reset_index(drop=True), cur[c].reset_index(drop=True)
+                try:
+                    same = (a == b) | (a.isna() & b.isna())
+                    changed[:, j] = ~same.to_numpy(dtype=bool)
+                except Exception:
+                    changed[:, j] = True
+        rows = np.flatnonzero(changed.any(axis=1))
+        if len(rows) > max(DataManager.DIFF_MAX_ROWS, 1) or len(rows) > n * DataManager.DIFF_MAX_RATIO:
+            return None
+
+        # 행별 바뀐 컬럼 구간, 같은 구간의 연속 행은 한 범위로
+        data: List[Tuple[str, List[list]]] = []
+        block = None
+        for pos in rows:
+            cols = np.flatnonzero(changed[pos])
+            span = (int(cols[0]), int(cols[-1]))
+            if block and block[1] == pos - 1 and block[2] == span:
+                block[1] = pos
+            else:
+                block = [pos, pos, span]
+                data.append(block)
+        out = []
+        for r0, r1, (c0, c1) in data:
+            values = [[to_cell(v) for v in r] for r in new.iloc[r0:r1 + 1, c0:c1 + 1].itertuples(index=False, name=None)]
+            out.append((f"{col_letter(c0 + 1)}{r0 + 2}:{col_letter(c1 + 1)}{r1 + 2}", values))
+        if len(new) > n:
+            tail = [[to_cell(v) for v in r] for r in new.iloc[n:].itertuples(index=False, name=None)]
+            out.append((f"A{n + 2}:{col_letter(width)}{len(new) + 1}", tail))
+        if out and not DataManager._grid_ends_with(key, base):
+            get_metrics().incr("update", key, "diff_mismatch")
+            return None
+        return out
+
+    @staticmethod
+    def _grid_ends_with(key: str, base: pd.DataFrame) -> bool:
+        """
+        쓰기 직전 원격 확인: 시트 n+1행(기준 프레임 마지막 행) 이후가 그 행 하나뿐인지.
+        다른 프로세스/수기로 붙은 행이 있거나 중간 빈 행 때문에 행 위치가 밀렸으면 False (-> 전체 저장)
+        """
+        n, header = len(base), list(base.columns)
+        try:
+            rows = DataManager._read_range(key, f"A{n + 1}:{col_letter(len(header))}")
+        except NotImplementedError:
+            return False
+        while rows and not any(str(c).strip() for c in rows[-1]):
+            rows = rows[:-1]
+        if len(rows) != 1:
+            return False
+        got = [str(c).strip() for c in rows[0]] + [""] * (len(header) - len(rows[0]))
+        want = [str(to_cell(v)).strip() for v in base.iloc[-1]]
+        if "row_uuid" in header:
+            i = header.index("row_uuid")
+            return got[i] == want[i]
+        return got == want
+
+    @staticmethod
+    def _write_diff_or_full(key: str, df: pd.DataFrame, append_only: bool = False):
+        """바뀐 셀 범위만 쓰기 (values_batch_update 1회), 안 되면 전체 저장. 편집당 업로드 셀 수를 update 지표에 기록"""
+        full_cells = len(df) * len(df.columns)
+        ranges = DataManager._diff_ranges(key, df, append_only)
+        if ranges is not None:
+            cells = sum(len(r) for _, values in ranges for r in values)
+            try:
+                if ranges:
+                    DataManager._write_values(key, ranges)
+                metrics = get_metrics()
+                metrics.incr("update", key, "diff_writes")
+                metrics.incr("update", key, "cells", cells)
+                metrics.incr("update", key, "full_cells", full_cells)
+                return
+            except NotImplementedError:
+                pass
+        DataManager._write_sheet(key, df)
+        metrics = get_metrics()
+        metrics.incr("update", key, "full_writes")
+        metrics.incr("update", key, "cells", full_cells)
+        metrics.incr("update", key, "full_cells", full_cells)
+
+    @staticmethod
+    def _cache_missing(key: str, version: Optional[Tuple[int, int]]) -> LoadResult:
+        """없는 부서 워크시트 = 빈 파티션 (헤더는 모름)"""
+        DataManager._set_cache(key, pd.DataFrame(), version=version, confirmed=False)
+        st.session_state["cache_meta"][key].pop("header", None)
+        return LoadResult(data=st.session_state["data_cache"][key], success=True)
+
+    @staticmethod
+    def load_many(keys: List[str], columns: Optional[Dict[str, List[str]]] = None,
+                  force_refresh: bool = False) -> Dict[str, LoadResult]:
+        """
+        여러 시트를 values API batch 읽기 1회로 로드 (columns: 시트별 프로젝션, 파티션 시트는 세션 파티션별 범위).
+        - 캐시/스냅샷으로 되는 시트와 이미 캐시가 있는 시트(증분/컬럼 확장)는 기존 load 경로
+        - 처음 보는 시트의 프로젝션은 헤더 1행부터 batch로 (프로세스당 한 번, 이후 카탈로그)
+        - 응답을 모두 파싱한 뒤 캐시에 한꺼번에 넣음 -> 묶음의 시트들은 같은 시점의 원격 상태
+        - 범위 읽기 미지원/실패면 시트별 병렬 load
+        반환: 시트 키 -> LoadResult
+        """
+        columns = columns or {}
+        catalog = get_sheet_catalog()
+        cache = st.session_state.get("data_cache", {})
+        remote: Dict[str, Optional[List[str]]] = {}
+        local = []
+        for k in keys:
+            for p in physical_keys(k):
+                want = DataManager._projection(p, columns[k]) if columns.get(k) else None
+                fresh = DataManager._get_from_cache(p) is not None and DataManager._covers(p, want)
+                if p in cache or (not force_refresh and (fresh or get_snapshots().get(p) is not None)):
+                    local.append((p, columns.get(k)))
+                elif not force_refresh and catalog.is_missing(p):
+                    DataManager._cache_missing(p, get_sheet_versions().get(p))
+                else:
+                    remote[p] = want
+
+        retry = []
+        if remote:
+            try:
+                retry = DataManager._load_batch(remote)
+            except QuotaDeferred:
+                # 프리패치 몫 없음 -> 시트별 호출로 늘리지 않고 화면의 load(읽기 우선순위)로 미룸
+                return {k: DataManager._load_fallback(k) for k in keys}
+            except Exception:
+                retry = [(p, columns.get(base_key(p))) for p in remote]
+        DataManager._load_parallel(retry + local, force_refresh)
+        return {k: DataManager.load(k, columns=columns.get(k)) for k in keys}
+
+    @staticmethod
+    def _load_batch(remote: Dict[str, Optional[List[str]]]) -> List[Tuple[str, Optional[List[str]]]]:
+        """
+        load_many의 원격 부분. 예외 = batch 자체 실패 (호출측이 전부 개별 로드).
+        반환: 파싱에서 어긋나 개별 load로 다시 읽을 (시트, 컬럼) 목록
+        """
+        catalog = get_sheet_catalog()
+        meta = st.session_state.get("cache_meta", {})
+
+        def header_of(p):
+            return meta.get(p, {}).get("header") or catalog.headers.get(p)
+
+        unknown = [p for p, want in remote.items() if want is not None and not header_of(p)]
+        if unknown:
+            for p, grid in zip(unknown, DataManager._read_values_multi([(p, "1:1") for p in unknown])):
+                catalog.set_header(p, [str(c).strip() for c in grid[0]] if grid else [])
+
+        versions = {p: get_sheet_versions().get(p) for p in remote}
+        requests, plans = [], []
+        for p, want in remote.items():
+            header = header_of(p) if want is not None else None
+            if header:
+                groups, ranges = DataManager._projected_ranges(p, header, want)
+                plans.append((p, header, groups, len(requests), len(ranges)))
+                requests += [(p, r) for r in ranges]
+            else:
+                plans.append((p, None, None, len(requests), 1))
+                requests.append((p, ""))
+        grids = DataManager._read_values_multi(requests)
+
+        # 전부 파싱한 뒤 캐시 반영
+        parsed, retry = {}, []
+        for p, header, groups, start, n in plans:
+            part = grids[start:start + n]
+            try:
+                if groups is not None:
+                    df = DataManager._projected_frame(p, header, groups, part)
+                    parsed[p] = (df, list(df.columns))
+                else:
+                    grid = part[0]
+                    df = values_to_df([str(c).strip() for c in grid[0]], grid[1:]) if grid else pd.DataFrame()
+                    parsed[p] = (DataManager._normalize_df(p, df), None)
+            except Exception:
+                retry.append((p, remote[p]))
+        for p, (df, cols) in parsed.items():
+            DataManager._set_cache(p, df, cols=cols, version=versions[p])
+        return retry
+
+    @staticmethod
+    def _load_parallel(jobs: List[Tuple[str, Optional[List[str]]]], force_refresh: bool = False):
+        """
+        (시트, 컬럼) 목록을 시트별 load로 병렬 실행.
+        작업 스레드에도 현재 세션의 ScriptRunContext를 붙여야 결과가 이 세션 캐시에 들어감
+        """
+        if not jobs:
+            return
+        ctx = get_script_run_ctx()
+        priority = current_io_priority()
+
+        def load_one(job):
+            if ctx is not None:
+                add_script_run_ctx(threading.current_thread(), ctx)
+            try:
+                if priority[0] is None:
+                    DataManager.load(job[0], force_refresh=force_refresh, columns=job[1])
+                else:
+                    with io_priority(*priority):
+                        DataManager.load(job[0], force_refresh=force_refresh, columns=job[1])
+            except:
+                pass
+
+        with ThreadPoolExecutor() as ex:
+            list(ex.map(load_one, jobs))
+
     @staticmethod
     def _merge_append_like(latest: pd.DataFrame, mine: pd.DataFrame, unique_col: str = "row_uuid") -> pd.DataFrame:
+        """
+        로그 union: 최신본 행 순서 그대로 + 내 프레임에만 있는 행(새 행/버전/tombstone)을 뒤에.
+        보통 mine = 방금 읽은 최신본 + 추가 행 (앞부분 row_uuid가 같으면 mine 그대로), 아니면 셀 값으로 행 대조
+        """
         if latest is None or latest.empty:
             return mine.copy() if mine is not None else pd.DataFrame()
         if mine is None or mine.empty:
@@ -330,13 +2097,29 @@ class DataManager:
         if unique_col not in b.columns:
             b[unique_col] = [str(uuid.uuid4()) for _ in range(len(b))]
 
-        merged = pd.concat([a, b], ignore_index=True)
-        merged[unique_col] = merged[unique_col].astype(str)
-        merged = merged.drop_duplicates(subset=[unique_col], keep="last")
-        return merged
+        n = len(a)
+        if len(b) >= n and (b[unique_col].iloc[:n].astype(str).to_numpy() == a[unique_col].astype(str).to_numpy()).all():
+            return b
+
+        cols = list(dict.fromkeys(list(a.columns) + list(b.columns)))
+
+        def row_keys(df: pd.DataFrame) -> pd.Series:
+            cells = pd.DataFrame({c: df[c].map(to_cell).astype(str) if c in df.columns else "" for c in cols},
+                                 index=df.index)
+            return pd.util.hash_pandas_object(cells, index=False)
+
+        new = ~row_keys(b).isin(row_keys(a).to_numpy())
+        return pd.concat([a, b[new.to_numpy()]], ignore_index=True)
 
     @staticmethod
-    def save(key: str, df: pd.DataFrame, operation_desc: str = "") -> SaveResult:
+    @sheet_locked
+    def save(key: str, df: pd.DataFrame, operation_desc: str = "", append_only: bool = False,
+             merge: bool = True) -> SaveResult:
+        """
+        append_only: 기존 행은 그대로 두고 뒤에 행만 추가한 저장 (다른 세션은 증분 로드로 반영 가능)
+        merge: append-like 시트를 최신본과 행 union 후 저장 (_merge_append_like). 잠금 안에서 방금 읽은
+               프레임을 고친 경우(정리/이전 등 행 삭제 포함)는 False
+        """
         # users 대량삭제 보호(기존 유지)
         if key == "users":
             cached = st.session_state.get("data_cache", {}).get(key)
@@ -344,17 +2127,27 @@ class DataManager:
                 if len(df) < len(cached) * 0.5:
                     return SaveResult(success=False, error_msg="데이터 보호: 대량 삭제 감지됨")
 
-        for _ in range(3):
+        for attempt in range(3):
+            if attempt:
+                get_metrics().incr("update", key, "retries")
             try:
-                if key in DataManager.APPEND_LIKE_KEYS:
-                    latest = DataManager.load(key, force_refresh=True).data
+                if merge and key in DataManager.APPEND_LIKE_KEYS:
+                    latest = DataManager.load(key, force_refresh=True, full=True).data
                     df_to_save = DataManager._merge_append_like(latest, df, unique_col="row_uuid")
                 else:
                     df_to_save = df
 
-                conn.update(worksheet=SHEET_NAMES[key], data=df_to_save)
-                DataManager._set_cache(key, df_to_save)
+                # 컬럼이 바뀐 저장(첫 tombstone의 deleted 등)은 다른 세션이 증분이 아닌 전체 로드로 받도록
+                header = st.session_state.get("cache_meta", {}).get(key, {}).get("header") \
+                    or get_sheet_catalog().headers.get(key)
+                widened = header is not None and list(df_to_save.columns) != list(header)
+                DataManager._write_diff_or_full(key, df_to_save, append_only)
+                version = get_sheet_versions().bump(key, rewrite=not append_only or widened)
+                DataManager._set_cache(key, df_to_save, version=version)
                 return SaveResult(success=True)
+            except QuotaDeferred:
+                # 쓰기 몫도 MAX_WAIT 동안 못 받음 -> 재시도 대기열로
+                break
             except Exception:
                 time.sleep(0.5)
                 continue
@@ -367,12 +2160,15 @@ class DataManager:
         return SaveResult(success=False, error_msg="저장 실패")
 
     @staticmethod
+    @partition_routed
+    @sheet_locked
     def append_row(key: str, new_row: dict, id_column: str = "id", operation_desc: str = "") -> SaveResult:
         if key in DataManager.APPEND_LIKE_KEYS:
             new_row.setdefault("row_uuid", str(uuid.uuid4()))
+            new_row.setdefault(TS_COLUMN, now_str(TS_FORMAT))
 
         for _ in range(3):
-            result = DataManager.load(key, force_refresh=True)
+            result = DataManager.load(key, force_refresh=True, full=True)
             if not result.success and result.data.empty:
                 time.sleep(0.5)
                 continue
@@ -380,18 +2176,13 @@ class DataManager:
             current_df = result.data
 
             if id_column and id_column not in new_row:
-                if current_df.empty:
-                    new_row[id_column] = 1
-                else:
-                    try:
-                        max_id = pd.to_numeric(current_df[id_column], errors="coerce").fillna(0).max()
-                        new_row[id_column] = int(max_id) + 1
-                    except:
-                        new_row[id_column] = len(current_df) + 1
+                # 재시도 때도 같은 id 유지 (new_row에 기록)
+                new_row[id_column] = get_id_allocator().allocate(
+                    base_key(key), DataManager._id_seed(key, current_df, id_column), id_column)
 
             new_df = pd.DataFrame([new_row])
             updated_df = pd.concat([current_df, new_df], ignore_index=True) if not current_df.empty else new_df
-            save_result = DataManager.save(key, updated_df, operation_desc)
+            save_result = DataManager.save(key, updated_df, operation_desc, append_only=True)
             if save_result.success:
                 return save_result
             time.sleep(0.5)
@@ -399,25 +2190,34 @@ class DataManager:
         return SaveResult(success=False, error_msg="저장 실패")
 
     @staticmethod
+    @partition_routed
+    @sheet_locked
     def update_row(key: str, match_column: str, match_value: Any, updates: dict, operation_desc: str = "") -> SaveResult:
         for _ in range(3):
-            result = DataManager.load(key, force_refresh=True)
+            result = DataManager.load(key, force_refresh=True, full=True)
             if not result.success:
                 time.sleep(0.5)
                 continue
 
             current_df = result.data.copy()
-            if current_df.empty or match_column not in current_df.columns:
+            log = key in DataManager.APPEND_LIKE_KEYS
+            view = DataManager._last_write_wins(current_df) if log else current_df
+            if view.empty or match_column not in view.columns:
                 return SaveResult(success=False, error_msg="대상 없음")
 
-            mask = current_df[match_column].astype(str) == str(match_value)
+            mask = view[match_column].astype(str) == str(match_value)
             if not mask.any():
                 return SaveResult(success=False, error_msg="대상 없음")
 
-            for col, val in updates.items():
-                current_df.loc[mask, col] = val
-
-            save_result = DataManager.save(key, current_df, operation_desc)
+            if log:
+                # 제자리 수정 대신 새 버전 행 추가
+                rows = DataManager._version_rows(view, mask, updates)
+                save_result = DataManager.save(key, pd.concat([current_df, rows], ignore_index=True),
+                                               operation_desc, append_only=True)
+            else:
+                for col, val in updates.items():
+                    current_df.loc[mask, col] = val
+                save_result = DataManager.save(key, current_df, operation_desc)
             if save_result.success:
                 return save_result
             time.sleep(0.5)
@@ -425,25 +2225,136 @@ class DataManager:
         return SaveResult(success=False, error_msg="수정 실패")
 
     @staticmethod
+    @partition_routed
+    @sheet_locked
     def delete_row(key: str, match_column: str, match_value: Any, operation_desc: str = "") -> SaveResult:
         for _ in range(3):
-            result = DataManager.load(key, force_refresh=True)
+            result = DataManager.load(key, force_refresh=True, full=True)
             if not result.success:
                 time.sleep(0.5)
                 continue
 
             current_df = result.data.copy()
-            if current_df.empty or match_column not in current_df.columns:
+            log = key in DataManager.APPEND_LIKE_KEYS
+            view = DataManager._last_write_wins(current_df) if log else current_df
+            if view.empty or match_column not in view.columns:
                 return SaveResult(success=False, error_msg="삭제 실패(컬럼 없음)")
 
-            current_df = current_df[current_df[match_column].astype(str) != str(match_value)]
-            save_result = DataManager.save(key, current_df, operation_desc)
+            mask = view[match_column].astype(str) == str(match_value)
+            if log:
+                # 행을 빼고 다시 쓰면 union 저장에서 되살아남 -> tombstone 행 추가
+                if not mask.any():
+                    return SaveResult(success=True)
+                rows = DataManager._version_rows(view, mask, None)
+                save_result = DataManager.save(key, pd.concat([current_df, rows], ignore_index=True),
+                                               operation_desc, append_only=True)
+            else:
+                save_result = DataManager.save(key, current_df[~mask], operation_desc)
             if save_result.success:
                 return save_result
             time.sleep(0.5)
 
         return SaveResult(success=False, error_msg="삭제 실패")
 
+    @staticmethod
+    def apply_batch(mutations: List[Mutation], operation_desc: str = "") -> SaveResult:
+        """
+        여러 행/여러 시트 변경을 시트당 한 번의 읽고-수정-쓰기로 적용 (시트 순서 = 처음 등장 순서).
+        실패한 시트는 error_msg에 모아서 반환
+        """
+        by_key: Dict[str, List[Mutation]] = {}
+        for m in DataManager._route_mutations(mutations):
+            by_key.setdefault(m.key, []).append(m)
+        failed = []
+        for key, muts in by_key.items():
+            res = DataManager._apply_sheet_batch(key, muts, operation_desc)
+            if not res.success:
+                failed.append(f"{key}: {res.error_msg}")
+        return SaveResult(success=not failed, error_msg=", ".join(failed))
+
+    @staticmethod
+    @sheet_locked
+    def _apply_sheet_batch(key: str, muts: List[Mutation], operation_desc: str = "") -> SaveResult:
+        """
+        한 시트 분량 적용. 삭제/컬럼 변경이 없으면 바뀐 행 + 추가 행만 다중 범위 쓰기(values_batch_update),
+        그 외(또는 미지원 연결)는 전체 저장.
+        행 위치 = 방금 읽은 프레임의 순번 (시트 중간에 완전히 빈 행이 없다는 전제 - 앱이 항상 전체 프레임으로 저장)
+        """
+        result = DataManager.load(key, force_refresh=True, full=True)
+        if not result.success:
+            return SaveResult(success=False, error_msg="로드 실패")
+        base = result.data
+        df = base.copy()
+        changed = set()
+        deleted = False
+        n_appended = 0
+
+        for m in muts:
+            if m.op == "append":
+                row = dict(m.row or {})
+                if key in DataManager.APPEND_LIKE_KEYS:
+                    row.setdefault("row_uuid", str(uuid.uuid4()))
+                    row.setdefault(TS_COLUMN, now_str(TS_FORMAT))
+                if m.id_column and m.id_column not in row:
+                    row[m.id_column] = get_id_allocator().allocate(
+                        base_key(key), DataManager._id_seed(key, df, m.id_column), m.id_column)
+                label = len(base) + n_appended
+                df = pd.concat([df, pd.DataFrame([row], index=[label])]) if not df.empty else pd.DataFrame([row], index=[label])
+                n_appended += 1
+            elif m.op in ("update", "delete"):
+                if df.empty or m.match_column not in df.columns:
+                    return SaveResult(success=False, error_msg="대상 없음")
+                values = m.match_value if isinstance(m.match_value, (list, tuple, set)) else [m.match_value]
+                if key in DataManager.APPEND_LIKE_KEYS:
+                    # 로그 시트: 최신 상태에서 찾아 새 버전/tombstone 행으로 추가
+                    view = DataManager._last_write_wins(df)
+                    hit = view[m.match_column].astype(str).isin([str(v) for v in values])
+                    rows = DataManager._version_rows(view, hit, (m.updates or {}) if m.op == "update" else None)
+                    rows.index = pd.RangeIndex(len(base) + n_appended, len(base) + n_appended + len(rows))
+                    df = pd.concat([df, rows])
+                    n_appended += len(rows)
+                    continue
+                mask = df[m.match_column].astype(str).isin([str(v) for v in values])
+                if m.op == "update":
+                    for col, val in (m.updates or {}).items():
+                        if col in df.columns and df[col].dtype != object:
+                            df[col] = df[col].astype(object)
+                        df.loc[mask, col] = val
+                    changed |= set(df.index[mask])
+                else:
+                    df = df[~mask]
+                    deleted = deleted or bool(mask.any())
+            else:
+                raise ValueError(f"알 수 없는 op: {m.op}")
+
+        rewrite = deleted or bool(changed & set(range(len(base))))
+        out = df.reset_index(drop=True)
+        if deleted or list(df.columns) != list(base.columns) or base.empty:
+            return DataManager.save(key, out, operation_desc, append_only=not rewrite, merge=False)
+
+        header = list(base.columns)
+        last = col_letter(len(header))
+        data = []
+        for pos in sorted(p for p in changed if p < len(base)):
+            data.append((f"A{pos + 2}:{last}{pos + 2}", [[to_cell(v) for v in df.loc[pos, header]]]))
+        if n_appended:
+            tail = df.iloc[len(df) - n_appended:]
+            first = len(base) + 2
+            data.append((f"A{first}:{last}{first + n_appended - 1}",
+                         [[to_cell(v) for v in r] for r in tail[header].itertuples(index=False, name=None)]))
+        if not data:
+            return SaveResult(success=True)
+
+        try:
+            DataManager._write_values(key, data)
+        except Exception:
+            # 범위 쓰기 미지원/실패 -> 전체 저장(재시도/대기열 포함)으로
+            return DataManager.save(key, out, operation_desc, append_only=not rewrite, merge=False)
+        get_metrics().incr("update", key, "batched_ranges", len(data))
+        version = get_sheet_versions().bump(key, rewrite=rewrite)
+        DataManager._set_cache(key, out, version=version)
+        return SaveResult(success=True)
+
     @staticmethod
     def retry_pending_saves() -> Tuple[int, int]:
         pending = st.session_state.get("pending_saves", [])
@@ -461,28 +2372,113 @@ class DataManager:
         st.session_state["pending_saves"] = still_pending
         return (success_count, len(still_pending))
 
-    # ---------- 프리패치 ----------
+    # ---------- 부서 파티션 ----------
     @staticmethod
-    def prefetch(keys: List[str]):
-        """지정 시트만 병렬 로드"""
-        def load_one(k):
-            try:
-                DataManager.load(k)
-            except:
-                pass
+    def _load_partitioned(key: str, force_refresh: bool, full: bool, columns: Optional[List[str]]) -> LoadResult:
+        """
+        세션 파티션(공용 + 내 부서)을 각각 로드해 이어 붙인 논리 프레임.
+        파티션 프레임이 그대로면 같은 객체를 돌려줌 (프레임 동일성 기반 메모가 유지되도록)
+        """
+        results = [DataManager.load(p, force_refresh=force_refresh, full=full, columns=columns)
+                   for p in physical_keys(key)]
+        frames = [r.data for r in results]
+        memo = st.session_state.setdefault("_partition_frames", {})
+        hit = memo.get(key)
+        if hit is None or len(hit[0]) != len(frames) or any(a is not b for a, b in zip(hit[0], frames)):
+            parts = [f for f in frames if not f.empty]
+            df = parts[0] if len(parts) == 1 else (pd.concat(parts, ignore_index=True) if parts else pd.DataFrame())
+            hit = memo[key] = (frames, df)
+        failed = [r.error_msg for r in results if not r.success]
+        return LoadResult(data=hit[1], success=not failed, error_msg=", ".join(failed))
 
-        with ThreadPoolExecutor() as ex:
-            ex.map(load_one, keys)
+    @staticmethod
+    def _match_partitions(key: str, column: str, values: List[Any]) -> Dict[str, List[Any]]:
+        """논리 시트에서 column 값이 있는 파티션별로 값 나누기 (세션 파티션 캐시 기준, 없는 값은 빠짐)"""
+        found: Dict[str, List[Any]] = {}
+        remaining = {str(v): v for v in values}
+        for p in physical_keys(key):
+            df = DataManager.load(p).data
+            if not remaining or df.empty or column not in df.columns:
+                continue
+            hits = set(df[column].astype(str)) & set(remaining)
+            if hits:
+                found[p] = [remaining.pop(v) for v in list(remaining) if v in hits]
+        return found
+
+    @staticmethod
+    def row_partition(key: str, row: dict) -> str:
+        """새 행이 들어갈 부서: 게시글은 게시판, 인폼/업무는 department, 하위 시트는 부모 행의 파티션"""
+        if key == "posts":
+            dept = row.get("board_type")
+        elif key in PARTITION_PARENT:
+            parent, col = PARTITION_PARENT[key]
+            found = DataManager._match_partitions(parent, "id", [row.get(col)])
+            dept = key_dept(next(iter(found))) if found else SHARED_DEPT
+        else:
+            dept = row.get("department")
+        return dept if dept in DEPARTMENTS else SHARED_DEPT
+
+    @staticmethod
+    def _route(method: str, key: str, *args, **kwargs) -> str:
+        if method == "append_row":
+            row = args[0] if args else kwargs["new_row"]
+            return part_key(key, DataManager.row_partition(key, row))
+        column = args[0] if args else kwargs["match_column"]
+        value = args[1] if len(args) > 1 else kwargs["match_value"]
+        found = DataManager._match_partitions(key, column, [value])
+        # 어디에도 없으면 공용 파티션 (-> "대상 없음")
+        return next(iter(found)) if found else part_key(key, SHARED_DEPT)
+
+    @staticmethod
+    def _route_mutations(mutations: List[Mutation]) -> List[Mutation]:
+        """논리 시트 변경을 파티션별로 (update/delete의 값 목록은 값이 있는 파티션마다 나눔)"""
+        out = []
+        for m in mutations:
+            if m.key not in PARTITIONED_KEYS:
+                out.append(m)
+            elif m.op == "append":
+                out.append(Mutation(**{**m.__dict__, "key": part_key(m.key, DataManager.row_partition(m.key, m.row or {}))}))
+            else:
+                values = m.match_value if isinstance(m.match_value, (list, tuple, set)) else [m.match_value]
+                found = DataManager._match_partitions(m.key, m.match_column, list(values)) \
+                    or {part_key(m.key, SHARED_DEPT): list(values)}
+                out += [Mutation(**{**m.__dict__, "key": p, "match_value": vals}) for p, vals in found.items()]
+        return out
+
+    @staticmethod
+    def _id_seed(key: str, df: pd.DataFrame, id_column: str) -> pd.DataFrame:
+        """
+        id 발급 기준 프레임. 파티션 시트의 id는 논리 시트 전체에서 유일해야 하므로
+        이 프로세스의 첫 발급 때만 모든 부서 파티션의 id 컬럼을 읽어 고수위를 잡음
+        """
+        base = base_key(key)
+        if base == key or get_id_allocator().high_water(base) is not None:
+            return df
+        frames = [DataManager.load(p, columns=[id_column]).data for p in physical_keys(base, DEPARTMENTS) if p != key]
+        frames = [f[[id_column]] for f in frames + [df] if not f.empty and id_column in f.columns]
+        return pd.concat(frames, ignore_index=True) if frames else df
+
+    # ---------- 프리패치 ----------
+    @staticmethod
+    def prefetch(keys: List[str], columns: Optional[Dict[str, List[str]]] = None,
+                 priority: int = IOPriority.BACKGROUND):
+        """
+        지정 시트만 미리 로드 (load_many: batch 읽기 1회, 미지원 연결이면 병렬 개별 로드).
+        기본은 낮은 우선순위 - 쿼터가 모자라면 건너뛰고 화면의 load가 읽음
+        """
+        with io_priority(priority):
+            DataManager.load_many(keys, columns)
 
     @staticmethod
     def prefetch_home_popup():
-        """로그인 직후 홈/팝업에 필요한 최소 시트만 먼저 로드 (속도 핵심)"""
+        """로그인 직후 홈/팝업에 필요한 최소 시트만 먼저 로드 (속도 핵심, 원격 왕복 1회)"""
         keys = ["routine_def", "routine_log", "inform_notes", "inform_logs"]
         # 홈에서 댓글/멘션까지 로그인 직후 즉시 보여주고 싶으면 아래 두 줄 활성화
         # keys += ["posts", "comments"]
-        if DataManager._sheet_exists("sessions"):
-            keys.append("sessions")
-        DataManager.prefetch(keys)
+        # 홈/팝업은 routine_log/inform_logs의 일부 컬럼만 사용 (팝업이 인폼 본문을 쓰므로 inform_notes는 전체)
+        # 바로 홈 화면이 쓰므로 화면 읽기 우선순위
+        DataManager.prefetch(keys, columns={"routine_log": ROUTINE_LOG_HOME_COLUMNS,
+                                            "inform_logs": INFORM_LOG_CHECK_COLUMNS}, priority=IOPriority.READ)
 
     @staticmethod
     def prefetch_all_data():
@@ -492,6 +2488,276 @@ class DataManager:
             target_sheets.append("sessions")
         DataManager.prefetch(target_sheets)
 
+# ============================================================
+# [5-1. 보관/압축 (compaction) - 계속 늘어나는 시트 정리]
+# ============================================================
+class Compaction:
+    """
+    - row_uuid 버전 접기 (마지막 버전만 첫 위치에 남김, 마지막 버전이 tombstone이면 행 제거)
+    - sessions: 만료/폐기 토큰 삭제
+    - 보관 기간이 지난 행은 보관소(로컬 파일 또는 *_archive 워크시트)로 옮긴 뒤 원본에서 제거
+      routine_log: done_date / inform_logs: 해당 인폼의 target_date (confirmed_at에는 연도가 없음)
+      comments: 날짜에 연도가 없어 기간 대신 삭제된 글의 댓글(고아)만 보관
+    """
+    KEYS = ["posts", "inform_notes", "inform_logs", "sessions", "comments", "routine_log"]
+    RETENTION_DAYS = {"routine_log": 365, "inform_logs": 180}
+    ARCHIVE_MODE = os.environ.get("JOGAKDAL_ARCHIVE", "file")  # file | sheet
+    ARCHIVE_DIR = os.environ.get("JOGAKDAL_ARCHIVE_DIR", "archive")
+
+    @staticmethod
+    def _expired_sessions(df: pd.DataFrame) -> pd.Series:
+        revoked = df["revoked"].astype(str).str.strip().str.lower().isin(["true", "1", "yes", "y", "t"]) \
+            if "revoked" in df.columns else pd.Series(False, index=df.index)
+        if "expires_at" in df.columns:
+            exp = pd.to_datetime(df["expires_at"], format="%Y-%m-%d %H:%M:%S", errors="coerce")
+            expired = exp.isna() | (exp < pd.Timestamp(get_now().replace(tzinfo=None)))
+        else:
+            expired = pd.Series(False, index=df.index)
+        return revoked | expired
+
+    @staticmethod
+    def _stale_rows(key: str, df: pd.DataFrame, retention_days: Dict[str, int]) -> pd.Series:
+        """보관소로 옮길 행 마스크 (부서 파티션이면 부모도 같은 파티션에서 찾음)"""
+        none = pd.Series(False, index=df.index)
+        key, dept = base_key(key), key_dept(key)
+        parent = (lambda k: part_key(k, dept)) if dept else (lambda k: k)
+        cutoff = (get_now() - timedelta(days=retention_days.get(key, 0))).strftime("%Y-%m-%d")
+        if key == "routine_log" and key in retention_days and "done_date" in df.columns:
+            d = df["done_date"].astype(str)
+            return (d < cutoff) & (d.str.len() >= 10)
+        if key == "inform_logs" and key in retention_days and "note_id" in df.columns:
+            notes = DataManager.load(parent("inform_notes"), columns=["id", "target_date"]).data
+            if notes.empty or "id" not in notes.columns:
+                return none
+            target = df["note_id"].astype(str).map(dict(zip(notes["id"].astype(str), notes["target_date"].astype(str))))
+            return target.isna() | (target < cutoff)
+        if key == "comments" and "post_id" in df.columns:
+            posts = DataManager.load(parent("posts"), columns=["id"]).data
+            if posts.empty or "id" not in posts.columns:
+                return none
+            return ~df["post_id"].astype(str).isin(set(posts["id"].astype(str)))
+        return none
+
+    @staticmethod
+    def _archive(key: str, rows: pd.DataFrame) -> str:
+        if Compaction.ARCHIVE_MODE == "sheet":
+            # 보관 시트는 SHEET_NAMES에 등록하지 않음 (앱이 로드하는 시트 목록/스냅샷과 무관)
+            akey, name = f"{key}_archive", f"{SHEET_NAMES[key]}_archive"
+            try:
+                old = DataManager._read_sheet(akey, worksheet=name)
+            except Exception:
+                tenant_conn().create(name, rows)
+                return name
+            merged = pd.concat([old, rows], ignore_index=True) if old is not None and not old.empty else rows
+            DataManager._write_sheet(akey, merged, worksheet=name)
+            return name
+
+        archive_dir = tenant_path(Compaction.ARCHIVE_DIR)
+        os.makedirs(archive_dir, exist_ok=True)
+        path = os.path.join(archive_dir, f"{SHEET_NAMES[key]}.csv.gz")
+        # gzip 멤버를 이어 붙이는 append (read_csv로 한 번에 읽힘)
+        rows.to_csv(path, mode="a", header=not os.path.exists(path), index=False, compression="gzip")
+        return path
+
+    @staticmethod
+    @sheet_locked
+    def compact_sheet(key: str, dry_run: bool = False,
+                      retention_days: Optional[Dict[str, int]] = None) -> CompactionReport:
+        retention_days = Compaction.RETENTION_DAYS if retention_days is None else retention_days
+        rep = CompactionReport(key=key)
+        res = DataManager.load(key, force_refresh=True, full=True)
+        if not res.success:
+            rep.error_msg = res.error_msg or "로드 실패"
+            return rep
+        df = res.data
+        rep.rows_before, rep.bytes_before = len(df), estimate_df_bytes(df)
+
+        if "row_uuid" in df.columns and not df.empty:
+            u = df["row_uuid"]
+            dup = u.notna() & (u.astype(str).str.strip() != "") & u.astype(str).duplicated(keep="last")
+            folded = DataManager._last_write_wins(df)
+            rep.deduped = int(dup.sum())
+            rep.tombstones = len(df) - rep.deduped - len(folded)
+            df = folded
+
+        if key == "sessions" and not df.empty:
+            gone = Compaction._expired_sessions(df)
+            rep.removed = int(gone.sum())
+            df = df[~gone]
+
+        stale = Compaction._stale_rows(key, df, retention_days) if not df.empty else pd.Series(dtype=bool)
+        rep.archived = int(stale.sum())
+        rep.rows_after, rep.bytes_after = len(df) - rep.archived, estimate_df_bytes(df[~stale] if rep.archived else df)
+        if dry_run or rep.rows_after == rep.rows_before:
+            return rep
+
+        try:
+            if rep.archived:
+                rep.archive_target = Compaction._archive(key, df[stale])
+                df = df[~stale]
+        except Exception as e:
+            rep.error_msg = f"보관 실패: {e}"
+            return rep
+
+        saved = DataManager.save(key, df.reset_index(drop=True), "정리", merge=False)
+        if not saved.success:
+            rep.error_msg = saved.error_msg
+        return rep
+
+    @staticmethod
+    def run(keys: Optional[List[str]] = None, dry_run: bool = False,
+            retention_days: Optional[Dict[str, int]] = None) -> List[CompactionReport]:
+        reports = []
+        for key in [p for k in keys or Compaction.KEYS for p in physical_keys(k, DEPARTMENTS)]:
+            if (key == "sessions" or key_dept(key) not in (None, SHARED_DEPT)) and not DataManager._sheet_exists(key):
+                continue
+            reports.append(Compaction.compact_sheet(key, dry_run=dry_run, retention_days=retention_days))
+        return reports
+
+    @staticmethod
+    def report_df(reports: List[CompactionReport]) -> pd.DataFrame:
+        return pd.DataFrame([r.__dict__ for r in reports])
+
+def compact_cli(argv: List[str]) -> int:
+    """python app.py compact [--dry-run] [--sheets a,b] [--archive file|sheet] [--keep-days 시트=일수 ...]"""
+    import argparse
+    ap = argparse.ArgumentParser(prog="app.py compact", description="시트 정리(중복/만료 제거, 오래된 행 보관)")
+    ap.add_argument("--dry-run", action="store_true")
+    ap.add_argument("--sheets", default=",".join(Compaction.KEYS))
+    ap.add_argument("--archive", choices=["file", "sheet"], default=Compaction.ARCHIVE_MODE)
+    ap.add_argument("--keep-days", nargs="*", default=[], help="예: routine_log=365 inform_logs=180")
+    args = ap.parse_args(argv)
+
+    Compaction.ARCHIVE_MODE = args.archive
+    retention = dict(Compaction.RETENTION_DAYS)
+    for item in args.keep_days:
+        k, _, v = item.partition("=")
+        retention[k] = int(v)
+    AppState.init()
+    reports = Compaction.run([k.strip() for k in args.sheets.split(",") if k.strip()], args.dry_run, retention)
+    print(Compaction.report_df(reports).to_string(index=False))
+    return 1 if any(r.error_msg for r in reports) else 0
+
+# ============================================================
+# [5-2. ts 마이그레이션 - 기존 행에 표준 타임스탬프 채우기 (1회)]
+# ============================================================
+@sheet_locked
+def migrate_ts_sheet(key: str, dry_run: bool = False) -> dict:
+    """ts가 비어 있는 행만 기존 날짜 컬럼에서 유도해 채움 (행 순서는 그대로)"""
+    res = DataManager.load(key, force_refresh=True, full=True)
+    if not res.success:
+        return {"key": key, "rows": 0, "filled": 0, "error_msg": res.error_msg or "로드 실패"}
+    df = res.data.copy()
+    had = df[TS_COLUMN].astype(str).str.strip() if TS_COLUMN in df.columns else pd.Series("", index=df.index)
+    blank = had.isin(["", "nan", "None"])
+    filled = canonical_ts(key, df)
+    report = {"key": key, "rows": len(df), "filled": int((blank & (filled != "")).sum()), "error_msg": ""}
+    if dry_run or not report["filled"]:
+        return report
+    df[TS_COLUMN] = filled
+    saved = DataManager.save(key, df, "ts 마이그레이션", merge=False)
+    if not saved.success:
+        report["error_msg"] = saved.error_msg
+    return report
+
+def migrate_timestamps(keys: Optional[List[str]] = None, dry_run: bool = False) -> List[dict]:
+    keys = [p for k in keys or sorted(k for k in DataManager.APPEND_LIKE_KEYS if "@" not in k)
+            for p in physical_keys(k, DEPARTMENTS)]
+    return [migrate_ts_sheet(k, dry_run=dry_run) for k in keys
+            if key_dept(k) in (None, SHARED_DEPT) or DataManager._sheet_exists(k)]
+
+def migrate_ts_cli(argv: List[str]) -> int:
+    """python app.py migrate-ts [--dry-run] [--sheets a,b]"""
+    import argparse
+    ap = argparse.ArgumentParser(prog="app.py migrate-ts", description="기존 행에 표준 타임스탬프(ts) 채우기")
+    ap.add_argument("--dry-run", action="store_true")
+    ap.add_argument("--sheets", default=",".join(sorted(k for k in DataManager.APPEND_LIKE_KEYS if "@" not in k)))
+    args = ap.parse_args(argv)
+    AppState.init()
+    reports = migrate_timestamps([k.strip() for k in args.sheets.split(",") if k.strip()], args.dry_run)
+    print(pd.DataFrame(reports).to_string(index=False))
+    return 1 if any(r["error_msg"] for r in reports) else 0
+
+# ============================================================
+# [5-3. 부서 파티션 이전 - 공용 시트의 부서 행을 부서 워크시트로 (1회, 재실행 안전)]
+# ============================================================
+def row_depts(key: str, df: pd.DataFrame) -> pd.Series:
+    """행별 부서 (DataManager.row_partition과 같은 규칙, 부모는 모든 부서 파티션에서 찾음)"""
+    shared = pd.Series(SHARED_DEPT, index=df.index)
+    if key in PARTITION_PARENT:
+        parent, col = PARTITION_PARENT[key]
+        if col not in df.columns:
+            return shared
+        owner = {}
+        for p in physical_keys(parent, DEPARTMENTS):
+            ids = DataManager.load(p, columns=["id"]).data
+            if not ids.empty and "id" in ids.columns:
+                owner.update(dict.fromkeys(ids["id"].astype(str), key_dept(p)))
+        return df[col].astype(str).map(owner).fillna(SHARED_DEPT)
+    col = "board_type" if key == "posts" else "department"
+    if col not in df.columns:
+        return shared
+    d = df[col].astype(str).str.strip()
+    return d.where(d.isin(DEPARTMENTS), SHARED_DEPT)
+
+@sheet_locked
+def partition_sheet(key: str, dry_run: bool = False) -> dict:
+    """
+    key = 공용 파티션 키 ("posts@전체"). 부서 행을 부서 워크시트에 합친 뒤(row_uuid/id 중복 제외)
+    공용 시트에서 제거. 중간에 실패해도 다시 실행하면 이어서 정리됨
+    """
+    base = base_key(key)
+    report = {"key": base, "rows": 0, **{d: 0 for d in DEPARTMENTS if d != SHARED_DEPT}, "error_msg": ""}
+    res = DataManager.load(key, force_refresh=True, full=True)
+    if not res.success:
+        report["error_msg"] = res.error_msg or "로드 실패"
+        return report
+    df = res.data
+    report["rows"] = len(df)
+    if df.empty:
+        return report
+    depts = row_depts(base, df)
+    for d in DEPARTMENTS:
+        moved = df[depts == d]
+        if d == SHARED_DEPT or moved.empty:
+            continue
+        report[d] = len(moved)
+        if dry_run:
+            continue
+        target = part_key(base, d)
+        with get_sheet_locks().hold(target):
+            cur = DataManager.load(target, force_refresh=True, full=True).data
+            merged = pd.concat([cur, moved], ignore_index=True) if not cur.empty else moved.reset_index(drop=True)
+            unique = "row_uuid" if "row_uuid" in merged.columns else ("id" if "id" in merged.columns else None)
+            if unique:
+                merged = merged[~merged[unique].astype(str).duplicated(keep="first")]
+            saved = DataManager.save(target, merged.reset_index(drop=True), "부서 파티션 이전", merge=False)
+        if not saved.success:
+            report["error_msg"] = f"{d}: {saved.error_msg}"
+            return report
+    if dry_run or (depts == SHARED_DEPT).all():
+        return report
+    saved = DataManager.save(key, df[depts == SHARED_DEPT].reset_index(drop=True), "부서 파티션 이전", merge=False)
+    if not saved.success:
+        report["error_msg"] = saved.error_msg
+    return report
+
+def partition_all(dry_run: bool = False) -> List[dict]:
+    # 부모 시트 먼저 (하위 시트는 이전된 부모 위치를 보고 따라감)
+    order = ["posts", "comments", "inform_notes", "inform_logs", "routine_def", "routine_log"]
+    return [partition_sheet(part_key(k, SHARED_DEPT), dry_run=dry_run) for k in order]
+
+def partition_cli(argv: List[str]) -> int:
+    """python app.py partition [--dry-run]"""
+    import argparse
+    ap = argparse.ArgumentParser(prog="app.py partition", description="공용 시트의 부서 행을 부서 워크시트로 이전")
+    ap.add_argument("--dry-run", action="store_true")
+    args = ap.parse_args(argv)
+    AppState.init()
+    reports = partition_all(args.dry_run)
+    print(pd.DataFrame(reports).to_string(index=False))
+    return 1 if any(r["error_msg"] for r in reports) else 0
+
 # ============================================================
 # [6. 유틸리티 함수]
 # ============================================================
@@ -502,19 +2768,150 @@ def check_approved(val) -> bool:
     v = str(val).strip().lower()
     return v in ["true", "1", "1.0", "yes", "y", "t"]
 
+MENTION_RE = re.compile(r"@(\S+)")
+MENTION_HTML = r'<span style="color:#1565C0; font-weight:bold;">@\1</span>'
+
 def highlight_mentions(text: str) -> str:
-    import re
-    return re.sub(r"@(\S+)", r'<span style="color:#1565C0; font-weight:bold;">@\1</span>', str(text))
+    return MENTION_RE.sub(MENTION_HTML, str(text))
+
+def infer_year_ts(values: pd.Series, now: Optional[datetime] = None) -> pd.Series:
+    """
+    연도 없는 "MM-DD HH:MM" (append 순서) -> "YYYY-MM-DD HH:MM:00".
+    마지막 행을 올해(오늘 이후 날짜면 작년)로 두고, 앞 행으로 가며 월이 6 이상 거꾸로 뛸 때마다 한 해씩 뺌
+    """
+    now = now or get_now()
+    s = values.astype(str).str.strip()
+    ok = s.str.match(r"^\d{2}-\d{2} \d{2}:\d{2}$")
+    if not ok.any():
+        return pd.Series("", index=values.index)
+    month = pd.to_numeric(s.str[:2].where(ok), errors="coerce")
+    nxt = month.where(ok).bfill().shift(-1)
+    wrap = ((month - nxt) >= 6).astype(int)
+    years_back = wrap[::-1].cumsum()[::-1]
+    last = s[ok].iloc[-1]
+    base = now.year - (1 if last[:5] > now.strftime("%m-%d") else 0)
+    year = (base - years_back).astype(str)
+    return (year + "-" + s + ":00").where(ok, "")
+
+def canonical_ts(key: str, df: pd.DataFrame) -> pd.Series:
+    """행별 표준 ts. ts 컬럼이 비어 있는 행(마이그레이션 전)은 시트별 날짜 컬럼에서 유도, 못 하면 ''"""
+    ts = df[TS_COLUMN].astype(str).str.strip() if TS_COLUMN in df.columns else pd.Series("", index=df.index)
+    blank = ts.isin(["", "nan", "None"])
+    if not blank.any():
+        return ts
+    key = base_key(key)
+
+    def col(c):
+        return df[c].astype(str).str.strip() if c in df.columns else pd.Series("", index=df.index)
+
+    if key == "comments":
+        derived = infer_year_ts(col("date"))
+    elif key == "inform_logs":
+        derived = infer_year_ts(col("confirmed_at"))
+    elif key == "routine_log":
+        d, t = col("done_date").str[:10], col("created_at")
+        derived = (d + " " + t.where(t.str.match(r"^\d{2}:\d{2}$"), "00:00") + ":00").where(
+            d.str.match(r"^\d{4}-\d{2}-\d{2}$"), "")
+    elif key == "inform_notes":
+        c, d = col("created_at"), col("target_date").str[:10]
+        derived = (c.str[:16] + ":00").where(c.str.match(r"^\d{4}-\d{2}-\d{2} \d{2}:\d{2}"),
+                                             (d + " 00:00:00").where(d.str.match(r"^\d{4}-\d{2}-\d{2}$"), ""))
+    elif key == "posts":
+        # updated_at은 수정 때 바뀌므로 작성일(date)과 같은 날일 때만 작성 시각으로 사용
+        u, d = col("updated_at"), col("date").str[:10]
+        derived = (u.str[:16] + ":00").where(u.str.match(r"^\d{4}-\d{2}-\d{2} \d{2}:\d{2}") & (u.str[:10] == d),
+                                             (d + " 00:00:00").where(d.str.match(r"^\d{4}-\d{2}-\d{2}$"), ""))
+    else:
+        derived = pd.Series("", index=df.index)
+    return ts.where(~blank, derived)
+
+STATUS_BADGES = {
+    "완료": '<span class="badge badge-ok">완료</span>',
+    "진행중": '<span class="badge badge-wip">진행중</span>',
+    "보류": '<span class="badge badge-hold">보류</span>',
+    "접수": '<span class="badge badge-new">접수</span>',
+}
 
 def badge_for_status(status: str) -> str:
-    s = (status or "").strip()
-    if s == "완료":
-        return '<span class="badge badge-ok">완료</span>'
-    if s == "진행중":
-        return '<span class="badge badge-wip">진행중</span>'
-    if s == "보류":
-        return '<span class="badge badge-hold">보류</span>'
-    return '<span class="badge badge-new">접수</span>'
+    return STATUS_BADGES.get((status or "").strip(), STATUS_BADGES["접수"])
+
+# ============================================================
+# [6-1. 렌더 템플릿 + HTML 캐시]
+# ============================================================
+INFORM_CARD_HTML = """
+<div class="{cls}">
+    <div style="font-weight:bold; margin-bottom:5px;">{author} <span style="color:red">{badge}</span></div>
+    <div style="white-space:pre-wrap;">{content}</div>
+</div>
+"""
+POST_HEADER_HTML = "{badge} <b>{title}</b>{meta}"
+
+class RenderCache:
+    """
+    항목별 렌더 결과(HTML/텍스트) - 프로세스 공용이라 rerun/세션이 달라도 바뀌지 않은 항목은 재사용.
+    키 = (종류, row_uuid + 렌더에 쓰는 원본 값) - 같은 항목이라도 보이는 값이 바뀌면 새로 렌더.
+    MAX_ITEMS를 넘으면 오래 안 쓴 것부터 버림
+    """
+    MAX_ITEMS = 20000
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._items: "OrderedDict[tuple, Any]" = OrderedDict()
+
+    def get(self, kind: str, key: tuple, build):
+        k = (kind,) + key
+        with self._lock:
+            hit = self._items.get(k)
+            if hit is not None:
+                self._items.move_to_end(k)
+        if hit is not None:
+            get_metrics().incr("render", kind, "hits")
+            return hit
+        value = build()
+        with self._lock:
+            self._items[k] = value
+            while len(self._items) > self.MAX_ITEMS:
+                self._items.popitem(last=False)
+        get_metrics().incr("render", kind, "misses")
+        return value
+
+@per_tenant
+@st.cache_resource
+def get_render_cache(tenant: str) -> RenderCache:
+    return RenderCache()
+
+def render_inform_card(n: dict) -> str:
+    urgent = n.get("priority") == "긴급"
+    return get_render_cache().get(
+        "inform_card", (n.get("row_uuid"), n.get("author"), n.get("priority"), n.get("content")),
+        lambda: INFORM_CARD_HTML.format(
+            cls="inform-item inform-urgent" if urgent else "inform-item", author=n.get("author", ""),
+            badge="🚨 긴급" if urgent else "", content=highlight_mentions(n.get("content", ""))),
+    )
+
+def render_post_header(r: dict) -> Tuple[str, str]:
+    """게시글 (expander 제목, 상태 배지/제목/담당/마감 HTML). 키는 렌더에 쓰는 값 (updated_at은 분 단위라 쓰지 않음)"""
+    # NaN(빈 셀)은 빈 문자열로
+    title, author, status, ass, due = (str(to_cell(r.get(c, ""))).strip()
+                                       for c in ["title", "author", "status", "assignee", "due_date"])
+
+    def build():
+        meta = ([f"담당: {ass}"] if ass else []) + ([f"마감: {due}"] if due else [])
+        return (
+            f"{title} ({author})",
+            POST_HEADER_HTML.format(badge=badge_for_status(status or "접수"), title=title,
+                                    meta=(" | " + " / ".join(meta)) if meta else ""),
+        )
+
+    key = (str(r.get("row_uuid", "")).strip(), str(r.get("id", "")), title, author, status, ass, due)
+    return get_render_cache().get("post_header", key, build)
+
+def render_comments(pid: str, grp: pd.DataFrame) -> str:
+    """글 하나의 댓글 목록 -> caption 한 덩어리 (줄바꿈으로 이어 붙임)"""
+    cols = [grp[c] if c in grp.columns else pd.Series("", index=grp.index) for c in ["row_uuid", "author", "content"]]
+    rows = tuple(zip(*cols))
+    return get_render_cache().get(
+        "comments", (pid, rows), lambda: "  \n".join(f"{a}: {c}" for _, a, c in rows))
 
 # ============================================================
 # [7. 비즈니스 로직 - (팝업/홈) 최적화 버전]
@@ -524,7 +2921,7 @@ def get_pending_tasks_list() -> List[dict]:
     (속도 개선) 루프 기반 필터링 -> pandas 벡터화 + set membership
     """
     res_def = DataManager.load("routine_def")
-    res_log = DataManager.load("routine_log")
+    res_log = DataManager.load("routine_log", columns=ROUTINE_LOG_HOME_COLUMNS)
     if not res_def.success or res_def.data.empty:
         return []
 
@@ -562,53 +2959,45 @@ def get_pending_tasks_list() -> List[dict]:
     if due_defs.empty:
         return []
 
-    done_ids = set()
-    if not logs.empty and ("task_id" in logs.columns) and ("done_date" in logs.columns):
-        done_ids = set(
-            logs.loc[logs["done_date"].astype(str) == today_str, "task_id"].astype(str).tolist()
-        )
+    # 자정 워밍업 기준이 있으면 그 뒤 행만, 없으면 로그 전체에서 오늘 완료
+    done_ids = today_done_task_ids()
+    if done_ids is None:
+        done_ids = set()
+        if not logs.empty and ("task_id" in logs.columns) and ("done_date" in logs.columns):
+            done_ids = set(
+                logs.loc[logs["done_date"].astype(str) == today_str, "task_id"].astype(str).tolist()
+            )
 
     due_defs["id_str"] = due_defs["id"].astype(str)
     pending = due_defs[~due_defs["id_str"].isin(done_ids)]
     return pending.drop(columns=["start_date_dt", "id_str"], errors="ignore").to_dict("records")
 
-def get_unconfirmed_inform_list(username: str) -> List[dict]:
+def get_unconfirmed_inform_list(username: str, note_columns: Optional[List[str]] = None) -> List[dict]:
     """
     (속도 개선) 오늘 인폼 + 내 확인 로그만 set으로 빠르게 계산
+    note_columns: 건수/긴급 여부만 필요하면 인폼 컬럼 일부만 로드 (본문 제외)
     """
-    res_n = DataManager.load("inform_notes")
-    res_l = DataManager.load("inform_logs")
+    res_n = DataManager.load("inform_notes", columns=note_columns)
+    res_l = DataManager.load("inform_logs", columns=INFORM_LOG_CHECK_COLUMNS)
 
     if not res_n.success or res_n.data.empty:
         return []
 
-    notes = res_n.data.copy()
-    if "target_date" not in notes.columns or "id" not in notes.columns:
+    if "target_date" not in res_n.data.columns or "id" not in res_n.data.columns:
         return []
 
-    today_str = get_today_str()
-    today_notes = notes[notes["target_date"].astype(str) == today_str].copy()
+    today_notes = get_inform_index(res_n.data).day(get_today_str())
     if today_notes.empty:
         return []
 
-    logs = res_l.data.copy() if res_l.success and not res_l.data.empty else pd.DataFrame()
-    if logs.empty or "note_id" not in logs.columns or "username" not in logs.columns:
-        return today_notes.to_dict("records")
-
-    note_ids = today_notes["id"].astype(str)
-    my_checked = set(
-        logs.loc[
-            (logs["username"].astype(str) == str(username)) &
-            (logs["note_id"].astype(str).isin(note_ids)),
-            "note_id"
-        ].astype(str).tolist()
-    )
-
-    unconfirmed = today_notes[~today_notes["id"].astype(str).isin(my_checked)]
+    conf = today_confirmers(set(today_notes["id"].astype(str)))
+    if conf is None:
+        conf = get_inform_confirmations(res_l.data if res_l.success else pd.DataFrame())
+    unconfirmed = today_notes[[str(username) not in conf.get(str(nid), ()) for nid in today_notes["id"]]]
     return unconfirmed.to_dict("records")
 
 def get_new_comments_count(username: str) -> int:
-    res_posts = DataManager.load("posts")
+    res_posts = DataManager.load("posts", columns=POST_OWNER_COLUMNS)
     res_comments = DataManager.load("comments")
     if not res_posts.success or not res_comments.success:
         return 0
@@ -616,14 +3005,8 @@ def get_new_comments_count(username: str) -> int:
     if posts.empty or comments.empty or "author" not in posts.columns:
         return 0
     my_posts = posts[posts["author"] == username]["id"].astype(str).tolist()
-    today_mmdd = get_now().strftime("%m-%d")
-    if "date" not in comments.columns:
-        return 0
-    new_comments = comments[
-        (comments["post_id"].astype(str).isin(my_posts)) &
-        (comments["date"].astype(str).str.contains(today_mmdd, na=False)) &
-        (comments["author"] != username)
-    ]
+    today = get_time_index("comments", comments).since(f"{get_today_str()} 00:00:00")
+    new_comments = today[(today["post_id"].astype(str).isin(my_posts)) & (today["author"] != username)]
     return len(new_comments)
 
 def get_mentions_for_user(username: str) -> List[dict]:
@@ -653,6 +3036,513 @@ def search_content(query: str) -> Dict[str, List[dict]]:
                 results["posts"].append(dict(row))
     return results
 
+# ============================================================
+# [7-1. 업무 통계 - routine_log 일별 롤업]
+# ============================================================
+class RoutineRollup:
+    """
+    routine_log 일별 집계 (프로세스 공용)
+    - by_task: (done_date, task_id) 완료 건수 / by_worker: (done_date, worker) 완료 건수
+    - 새로 붙은 행만 groupby 해서 더함. 시트가 재작성된 경우(삭제/정리)에만 전체 재집계
+    - 크기는 (일수 x 업무 수)로 묶이므로 통계 화면 비용이 로그 누적량과 무관
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.by_task = pd.DataFrame(columns=["done_date", "task_id", "n"])
+        self.by_worker = pd.DataFrame(columns=["done_date", "worker", "n"])
+        self.rows = 0
+        self.tail_uuid: Optional[str] = None
+        self.version: Optional[Tuple[int, int]] = None
+
+    @staticmethod
+    def _agg(logs: pd.DataFrame, col: str) -> pd.DataFrame:
+        if logs.empty or col not in logs.columns or "done_date" not in logs.columns:
+            return pd.DataFrame(columns=["done_date", col, "n"])
+        keys = [logs["done_date"].astype(str).str[:10].rename("done_date"), logs[col].astype(str).rename(col)]
+        return logs.groupby(keys, sort=False).size().rename("n").reset_index()
+
+    @staticmethod
+    def _add(base: pd.DataFrame, inc: pd.DataFrame, col: str) -> pd.DataFrame:
+        if inc.empty:
+            return base
+        if base.empty:
+            return inc
+        return pd.concat([base, inc], ignore_index=True).groupby(["done_date", col], sort=False, as_index=False)["n"].sum()
+
+    def update(self, logs: pd.DataFrame, version: Optional[Tuple[int, int]]):
+        """세션이 읽은 routine_log 프레임(version = 그 프레임의 시트 버전)을 반영"""
+        version = tuple(version or (0, 0))
+        with self._lock:
+            if self.version is not None and version < self.version:
+                return  # 이미 더 최신 프레임을 반영함
+            n = len(logs)
+            uuids = logs["row_uuid"] if "row_uuid" in logs.columns else None
+            uuid_at = (lambda i: str(uuids.iloc[i])) if uuids is not None else (lambda i: None)
+            if self.version is not None and version[1] == self.version[1]:
+                if n == self.rows and (not n or uuid_at(-1) == self.tail_uuid):
+                    self.version = version
+                    return
+                appended = (uuids is not None and self.rows <= n
+                            and (self.rows == 0 or uuid_at(self.rows - 1) == self.tail_uuid))
+            else:
+                appended = False
+
+            new = logs.iloc[self.rows:] if appended else logs
+            bt, bw = self._agg(new, "task_id"), self._agg(new, "worker")
+            if appended:
+                self.by_task, self.by_worker = self._add(self.by_task, bt, "task_id"), self._add(self.by_worker, bw, "worker")
+            else:
+                self.by_task, self.by_worker = bt, bw
+            get_metrics().incr("rollup", "routine_log", "incremental" if appended else "rebuilds")
+            get_metrics().incr("rollup", "routine_log", "rows", len(new))
+            self.rows = n
+            self.tail_uuid = uuid_at(-1) if n else None
+            self.version = version
+
+    @staticmethod
+    def merged(parts: List["RoutineRollup"]) -> "RoutineRollup":
+        """파티션별 롤업 합치기 (세션이 읽는 부서 조합용, 읽기 전용)"""
+        if len(parts) == 1:
+            return parts[0]
+        out = RoutineRollup()
+        for r in parts:
+            out.by_task = out._add(out.by_task, r.by_task, "task_id")
+            out.by_worker = out._add(out.by_worker, r.by_worker, "worker")
+            out.rows += r.rows
+        return out
+
+@per_tenant
+@st.cache_resource
+def get_routine_rollup(tenant: str, key: str = "routine_log") -> RoutineRollup:
+    """파티션(워크시트)별 롤업 - 부서가 다른 세션이 번갈아 와도 재집계 없음"""
+    return RoutineRollup()
+
+def load_routine_rollup(columns: Optional[List[str]] = ROUTINE_LOG_STATS_COLUMNS) -> Tuple[RoutineRollup, pd.DataFrame]:
+    """routine_log 세션 파티션을 (캐시 우선) 읽고 파티션별 롤업에 반영"""
+    parts = []
+    for p in physical_keys("routine_log"):
+        rollup = get_routine_rollup(p)
+        rollup.update(DataManager.load(p, columns=columns).data,
+                      st.session_state.get("cache_meta", {}).get(p, {}).get("version"))
+        parts.append(rollup)
+    return RoutineRollup.merged(parts), DataManager.load("routine_log", columns=columns).data
+
+def routine_schedule(defs: pd.DataFrame, start, end) -> pd.DataFrame:
+    """[start, end] 기간에 예정된 업무 발생 (done_date, task_id) - get_pending_tasks_list와 같은 주기 규칙"""
+    empty = pd.DataFrame(columns=["done_date", "task_id"])
+    if defs.empty or any(c not in defs.columns for c in ["id", "start_date", "cycle_type"]) or start > end:
+        return empty
+    d = pd.DataFrame({
+        "task_id": defs["id"].astype(str),
+        "start": pd.to_datetime(defs["start_date"], errors="coerce"),
+        "cycle": defs["cycle_type"].astype(str),
+        "iv": pd.to_numeric(defs["interval_val"], errors="coerce").fillna(1).clip(lower=1).astype(int)
+        if "interval_val" in defs.columns else 1,
+    }).dropna(subset=["start"])
+    x = d.merge(pd.DataFrame({"day": pd.date_range(start, end, freq="D")}), how="cross")
+    x = x[x["day"] >= x["start"]]
+    delta = (x["day"] - x["start"]).dt.days
+    due = (x["cycle"] == "매일") \
+        | ((x["cycle"] == "매주") & (delta % 7 == 0)) \
+        | ((x["cycle"] == "매월") & (x["day"].dt.day == x["start"].dt.day)) \
+        | ((x["cycle"] == "N일 간격") & (delta % x["iv"] == 0))
+    x = x[due]
+    return pd.DataFrame({"done_date": x["day"].dt.strftime("%Y-%m-%d"), "task_id": x["task_id"]}).reset_index(drop=True)
+
+def get_routine_stats(weeks: int = 12) -> Dict[str, pd.DataFrame]:
+    """
+    최근 weeks주(어제까지) 완료율 - 업무별/주별/직원별 + 놓친 업무.
+    예정일 당일 완료만 완료로 집계, 직원별은 완료 건수와 비중
+    """
+    defs = DataManager.load("routine_def").data
+    rollup, _ = load_routine_rollup()
+    end = get_now().date() - timedelta(days=1)
+    start = end - timedelta(days=weeks * 7 - 1)
+    lo, hi = start.strftime("%Y-%m-%d"), end.strftime("%Y-%m-%d")
+
+    sched = routine_schedule(defs, start, end)
+    bt = rollup.by_task
+    bt = bt[(bt["done_date"] >= lo) & (bt["done_date"] <= hi)]
+    done = pd.MultiIndex.from_frame(bt[["done_date", "task_id"]])
+    sched["done"] = pd.MultiIndex.from_frame(sched[["done_date", "task_id"]]).isin(done) if not sched.empty else []
+
+    names = dict(zip(defs["id"].astype(str), defs["task_name"])) if {"id", "task_name"} <= set(defs.columns) else {}
+
+    def rate(g: pd.DataFrame) -> pd.DataFrame:
+        g = g.rename(columns={"size": "예정", "sum": "완료"})
+        g["완료율"] = (g["완료"] / g["예정"]).round(3)
+        return g
+
+    by_task = rate(sched.groupby("task_id")["done"].agg(["size", "sum"]).reset_index())
+    by_task.insert(1, "업무", by_task["task_id"].map(names).fillna("(삭제된 업무)"))
+    by_task = by_task.sort_values("완료율")
+
+    weeks_col = (pd.to_datetime(sched["done_date"]) - pd.to_timedelta(pd.to_datetime(sched["done_date"]).dt.weekday, unit="D"))
+    by_week = rate(sched.assign(week=weeks_col.dt.strftime("%Y-%m-%d")).groupby("week")["done"].agg(["size", "sum"]).reset_index())
+
+    bw = rollup.by_worker
+    bw = bw[(bw["done_date"] >= lo) & (bw["done_date"] <= hi)]
+    by_worker = bw.groupby("worker").agg(완료=("n", "sum"), 근무일=("done_date", "nunique")).reset_index()
+    total = by_worker["완료"].sum()
+    by_worker["비중"] = (by_worker["완료"] / total).round(3) if total else 0.0
+    by_worker = by_worker.sort_values("완료", ascending=False)
+
+    missed = sched[~sched["done"].astype(bool)][["done_date", "task_id"]].copy()
+    missed.insert(1, "업무", missed["task_id"].map(names).fillna("(삭제된 업무)"))
+    missed = missed.sort_values("done_date", ascending=False)
+
+    return {"task": by_task, "week": by_week, "worker": by_worker, "missed": missed}
+
+def recent_routine_logs(logs: pd.DataFrame, defs: pd.DataFrame, limit: int = 50) -> pd.DataFrame:
+    """최근 완료 기록 limit건 (ts 인덱스 끝에서 바로 자르고 그 행만 업무명 조인)"""
+    if logs.empty or "done_date" not in logs.columns:
+        return pd.DataFrame()
+    sub = get_time_index("routine_log", logs).last(limit).copy()
+    if "id" in defs.columns and "task_name" in defs.columns and "task_id" in sub.columns:
+        sub["task_name"] = sub["task_id"].astype(str).map(dict(zip(defs["id"].astype(str), defs["task_name"])))
+    show_cols = [c for c in ["done_date", "task_name", "worker", "memo"] if c in sub.columns]
+    return sub[show_cols]
+
+# ============================================================
+# [7-2. 인폼 날짜 인덱스 - target_date 정렬 + 이진 탐색]
+# ============================================================
+class InformIndex:
+    """inform_notes를 target_date로 정렬한 위치 인덱스. 하루/기간 조회는 searchsorted 범위 슬라이스"""
+
+    def __init__(self, notes: pd.DataFrame):
+        self.notes = notes
+        dates = notes["target_date"].astype(str).str[:10].to_numpy() if "target_date" in notes.columns \
+            else np.array([], dtype=object)
+        self.order = np.argsort(dates, kind="stable")
+        self.dates = dates[self.order]
+        self._days: Dict[str, List[dict]] = {}
+
+    def _span(self, start: str, end: str) -> Tuple[int, int]:
+        return int(np.searchsorted(self.dates, start, "left")), int(np.searchsorted(self.dates, end, "right"))
+
+    def day(self, date_str: str) -> pd.DataFrame:
+        lo, hi = self._span(date_str, date_str)
+        return self.notes.iloc[self.order[lo:hi]]
+
+    def day_records(self, date_str: str) -> List[dict]:
+        """그날 인폼 (긴급 먼저). 날짜별로 한 번만 만들어 둠 -> 이웃 날짜를 미리 계산해 두면 이동이 즉시"""
+        if date_str not in self._days:
+            recs = self.day(date_str).to_dict("records")
+            self._days[date_str] = sorted(recs, key=lambda x: 0 if x.get("priority") == "긴급" else 1)
+        return self._days[date_str]
+
+    def range(self, start: str, end: str) -> pd.DataFrame:
+        lo, hi = self._span(start, end)
+        return self.notes.iloc[self.order[lo:hi]].assign(_date=self.dates[lo:hi])
+
+def get_inform_index(notes: Optional[pd.DataFrame] = None) -> InformIndex:
+    """inform_notes 캐시 프레임이 바뀔 때만 다시 정렬 (세션별)"""
+    if notes is None:
+        notes = DataManager.load("inform_notes").data
+    idx = st.session_state.get("_inform_index")
+    if idx is None or idx.notes is not notes:
+        idx = InformIndex(notes)
+        st.session_state["_inform_index"] = idx
+    return idx
+
+def get_inform_confirmations(logs: Optional[pd.DataFrame] = None) -> Dict[str, List[str]]:
+    """
+    note_id -> 확인자 목록. inform_logs 캐시 프레임이 바뀔 때만 갱신:
+    뒤에 행만 붙은 경우(증분 로드/확인 등록)는 새 행만 덧붙이고, 그 외엔 다시 groupby
+    """
+    if logs is None:
+        logs = DataManager.load("inform_logs", columns=INFORM_LOG_CHECK_COLUMNS).data
+    memo = st.session_state.get("_inform_conf")
+    if memo is not None and memo["frame"] is logs:
+        return memo["map"]
+    if logs.empty or "note_id" not in logs.columns or "username" not in logs.columns:
+        return {}
+
+    old = memo["frame"] if memo is not None else None
+    appended = (
+        old is not None and 0 < len(old) <= len(logs) and "row_uuid" in logs.columns and "row_uuid" in old.columns
+        and str(logs["row_uuid"].iat[len(old) - 1]) == str(old["row_uuid"].iat[-1])
+    )
+    rows = logs.iloc[len(old):] if appended else logs
+    grouped = rows["username"].astype(str).groupby(rows["note_id"].astype(str), sort=False).agg(list)
+    conf = dict(memo["map"]) if appended else {}
+    for nid, users in grouped.items():
+        conf[nid] = conf[nid] + users if nid in conf else users
+    st.session_state["_inform_conf"] = {"frame": logs, "map": conf}
+    return conf
+
+def inform_month_summary(idx: InformIndex, conf: Dict[str, List[str]], day, username: str) -> pd.DataFrame:
+    """day가 속한 달의 날짜별 인폼 수 / 긴급 / 내 미확인"""
+    first = day.replace(day=1)
+    last = (first + timedelta(days=32)).replace(day=1) - timedelta(days=1)
+    notes = idx.range(first.strftime("%Y-%m-%d"), last.strftime("%Y-%m-%d"))
+    if notes.empty:
+        return pd.DataFrame(columns=["날짜", "인폼", "긴급", "미확인"])
+    ids = notes["id"].astype(str) if "id" in notes.columns else pd.Series("", index=notes.index)
+    return pd.DataFrame({
+        "날짜": notes["_date"],
+        "인폼": 1,
+        "긴급": (notes["priority"] == "긴급").astype(int) if "priority" in notes.columns else 0,
+        "미확인": [int(username not in conf.get(nid, ())) for nid in ids],
+    }).groupby("날짜", as_index=False).sum()
+
+# ============================================================
+# [7-3. 시간 인덱스 - ts 정렬 위치 + 이진 탐색]
+# ============================================================
+# 캐시 프레임 자체는 시트 행 순서를 유지 (범위 쓰기/증분 로드가 행 위치를 씀) -> ts 순서는 위치 배열로 보관
+class TimeIndex:
+    def __init__(self, key: str, df: pd.DataFrame, prev: Optional["TimeIndex"] = None):
+        self.frame = df
+        appended = (
+            prev is not None and 0 < len(prev.frame) <= len(df) and "row_uuid" in df.columns
+            and "row_uuid" in prev.frame.columns
+            and str(df["row_uuid"].iat[len(prev.frame) - 1]) == str(prev.frame["row_uuid"].iat[-1])
+        )
+        if appended:
+            n = len(prev.frame)
+            new_ts = canonical_ts(key, df.iloc[n:]).to_numpy(dtype=object)
+            ts = np.concatenate([prev.ts, new_ts])
+            order = np.concatenate([prev.order, np.arange(n, len(df))])
+            # 새 행이 모두 기존 마지막 ts 이후면 정렬 유지, 아니면 합쳐서 다시 정렬
+            if len(new_ts) and not pd.Index(ts[len(prev.ts) - 1:] if len(prev.ts) else ts).is_monotonic_increasing:
+                o = np.argsort(ts, kind="stable")
+                ts, order = ts[o], order[o]
+        else:
+            ts = canonical_ts(key, df).to_numpy(dtype=object) if len(df) else np.array([], dtype=object)
+            order = np.arange(len(df))
+            if not pd.Index(ts).is_monotonic_increasing:
+                order = np.argsort(ts, kind="stable")
+                ts = ts[order]
+        self.ts, self.order = ts, order
+
+    def since(self, start: str) -> pd.DataFrame:
+        """start 이후 (시간순)"""
+        return self.frame.iloc[self.order[np.searchsorted(self.ts, start, "left"):]]
+
+    def between(self, start: str, end: str) -> pd.DataFrame:
+        lo, hi = np.searchsorted(self.ts, start, "left"), np.searchsorted(self.ts, end, "right")
+        return self.frame.iloc[self.order[lo:hi]]
+
+    def last(self, n: int) -> pd.DataFrame:
+        """최근 n건 (최신순)"""
+        return self.frame.iloc[self.order[len(self.order) - n:][::-1]] if n > 0 else self.frame.iloc[:0]
+
+def get_time_index(key: str, df: Optional[pd.DataFrame] = None) -> TimeIndex:
+    """시트 캐시 프레임이 바뀔 때만 갱신 (뒤에 붙은 행은 이어 붙임, 세션별)"""
+    if df is None:
+        df = DataManager.load(key).data
+    memo = st.session_state.setdefault("_time_index", {})
+    idx = memo.get(key)
+    if idx is None or idx.frame is not df:
+        idx = TimeIndex(key, df, prev=idx)
+        memo[key] = idx
+    return idx
+
+# ============================================================
+# [7-4. 자정 워밍업 - 오늘 완료 업무 / 오늘 인폼 확인자 미리 계산]
+# ============================================================
+WARMUP_KEYS = ["inform_notes", "inform_logs", "routine_def", "routine_log"]
+WARMUP_DELAY_SECONDS = 300  # KST 자정 몇 분 뒤 (자정 직후 기록이 끝난 다음)
+WARMUP_QUOTA_WAIT = 600
+WARMUP_RETRY_SECONDS = 600  # 쿼터로 일부 못 읽었으면 이만큼 뒤 다시
+
+@dataclass
+class LogBaseline:
+    """로그 파티션(최신 상태 뷰)의 앞 rows행에서 계산한 값. 세션 프레임이 이 행들로 시작하면 뒤 행만 보태면 됨"""
+    rows: int
+    tail_uuid: Optional[str]
+    value: Any
+
+    def tail_of(self, view: pd.DataFrame) -> Optional[pd.DataFrame]:
+        """기준 이후 행 (앞부분이 달라졌으면 None)"""
+        if len(view) < self.rows:
+            return None
+        if self.rows and ("row_uuid" not in view.columns or str(view["row_uuid"].iat[self.rows - 1]) != self.tail_uuid):
+            return None
+        return view.iloc[self.rows:]
+
+    @staticmethod
+    def of(view: pd.DataFrame, value: Any) -> "LogBaseline":
+        tail = str(view["row_uuid"].iat[-1]) if len(view) and "row_uuid" in view.columns else None
+        return LogBaseline(len(view), tail, value)
+
+@dataclass
+class DayState:
+    date: str
+    note_ids: set                       # 오늘 인폼 id (전체 파티션)
+    done: Dict[str, LogBaseline]        # routine_log 파티션 -> 오늘 완료 task_id 집합
+    conf: Dict[str, LogBaseline]        # inform_logs 파티션 -> 오늘 인폼 note_id -> 확인자 집합
+
+def _done_ids(view: pd.DataFrame, date_str: str) -> set:
+    if view.empty or "task_id" not in view.columns or "done_date" not in view.columns:
+        return set()
+    return set(view.loc[view["done_date"].astype(str) == date_str, "task_id"].astype(str))
+
+def _confirmers(view: pd.DataFrame, note_ids: set) -> Dict[str, set]:
+    if view.empty or "note_id" not in view.columns or "username" not in view.columns:
+        return {}
+    nid = view["note_id"].astype(str)
+    hit = nid.isin(note_ids)
+    out: Dict[str, set] = {}
+    for n, u in zip(nid[hit], view.loc[hit, "username"].astype(str)):
+        out.setdefault(n, set()).add(u)
+    return out
+
+class DailyWarmup:
+    """
+    홈/팝업의 "오늘" 상태를 KST 자정 직후(와 재시작 직후) 미리 계산 (프로세스 공용, 매장별 작업 스레드 1개)
+    - 홈/팝업 시트의 모든 부서 파티션을 낮은 우선순위로 읽어 스냅샷 저장소에 넣음
+    - 오늘 완료 task_id(routine_log) / 오늘 인폼 확인자(inform_logs)를 파티션별 기준 행과 함께 보관
+      -> 세션은 1년치 로그를 다시 훑지 않고 기준 이후에 붙은 행만 보탬 (앞부분이 달라졌으면 기존 계산)
+    """
+
+    def __init__(self, tenant: str = DEFAULT_TENANT):
+        self.tenant = tenant
+        self.state: Optional[DayState] = None
+        self.ready = threading.Event()
+        threading.Thread(target=self._loop, name=f"daily-warmup-{tenant}", daemon=True).start()
+
+    @staticmethod
+    def seconds_until_next(now: datetime) -> float:
+        """다음 워밍업(KST 자정 + WARMUP_DELAY_SECONDS)까지 초"""
+        at = now.replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(seconds=WARMUP_DELAY_SECONDS)
+        if at <= now:
+            at += timedelta(days=1)
+        return (at - now).total_seconds()
+
+    def _loop(self):
+        with use_tenant(self.tenant):
+            # 재시작 직후: 스냅샷 원격 대조가 이미 전체를 읽으므로 끝나길 기다려 그 프레임을 씀 (읽기 2배 방지)
+            get_snapshots().reconciled.wait(WARMUP_QUOTA_WAIT)
+            max_age = None
+            while True:
+                complete = False
+                try:
+                    complete = self.run(max_age)
+                except Exception:
+                    get_metrics().incr("warmup", "daily", "errors")
+                self.ready.set()
+                # 자정 워밍업은 최근(CACHE_TTL 이내) 대조된 프레임만 재사용
+                max_age = DataManager.CACHE_TTL
+                wait = self.seconds_until_next(get_now())
+                time.sleep(wait if complete else min(wait, WARMUP_RETRY_SECONDS))
+
+    def _read(self, key: str, max_age: Optional[float] = None) -> Optional[pd.DataFrame]:
+        """
+        스냅샷 대조와 같은 방식: 잠금 안에서 읽어 그 버전으로 스냅샷 갱신.
+        스냅샷에 원격과 대조된 프레임이 있으면(max_age: SheetSnapshots.confirmed) 읽지 않고 그것을 씀.
+        아직 없는 부서 워크시트는 빈 프레임, 읽기 실패는 None (QuotaDeferred는 그대로)
+        """
+        df = get_snapshots().confirmed(key, max_age)
+        if df is not None:
+            get_metrics().incr("warmup", key, "reused")
+            return DataManager._last_write_wins(df) if key in DataManager.APPEND_LIKE_KEYS else df
+        try:
+            with get_quota().prepaid("read"), get_sheet_locks().hold(key):
+                df = DataManager._normalize_df(key, DataManager._read_sheet(key))
+                get_snapshots().put(key, df, get_sheet_versions().get(key))
+        except QuotaDeferred:
+            raise
+        except Exception:
+            if key_dept(key) not in (None, SHARED_DEPT) and not DataManager._sheet_exists(key):
+                get_sheet_catalog().mark_missing(key)
+                return pd.DataFrame()
+            get_metrics().incr("warmup", key, "errors")
+            return None
+        get_metrics().incr("warmup", key, "rows", len(df))
+        return DataManager._last_write_wins(df) if key in DataManager.APPEND_LIKE_KEYS else df
+
+    def run(self, max_age: Optional[float] = 0) -> bool:
+        """
+        오늘 상태 다시 계산. False = 쿼터로 일부 시트를 못 읽음 (그 파티션은 세션이 기존 방식으로 계산)
+        max_age: 스냅샷의 대조된 프레임 재사용 허용 경과 초 (_read, 0 = 항상 원격 읽기)
+        """
+        t0 = time.perf_counter()
+        today = get_today_str()
+        views: Dict[str, pd.DataFrame] = {}
+        complete = True
+        with io_priority(IOPriority.BACKGROUND, max_wait=WARMUP_QUOTA_WAIT):
+            for key in WARMUP_KEYS:
+                for p in physical_keys(key, DEPARTMENTS):
+                    try:
+                        view = self._read(p, max_age)
+                    except QuotaDeferred:
+                        complete = False
+                        continue
+                    if view is not None:
+                        views[p] = view
+
+        note_ids = set()
+        for p in physical_keys("inform_notes", DEPARTMENTS):
+            notes = views.get(p)
+            if notes is not None and {"id", "target_date"} <= set(notes.columns):
+                note_ids |= set(notes.loc[notes["target_date"].astype(str).str[:10] == today, "id"].astype(str))
+        state = DayState(date=today, note_ids=note_ids, done={}, conf={})
+        for p in physical_keys("routine_log", DEPARTMENTS):
+            if p in views:
+                state.done[p] = LogBaseline.of(views[p], _done_ids(views[p], today))
+        for p in physical_keys("inform_logs", DEPARTMENTS):
+            if p in views:
+                state.conf[p] = LogBaseline.of(views[p], _confirmers(views[p], note_ids))
+        self.state = state
+        get_metrics().observe("warmup", "daily", (time.perf_counter() - t0) * 1000)
+        return complete
+
+    def _today(self) -> Optional[DayState]:
+        state = self.state
+        return state if state is not None and state.date == get_today_str() else None
+
+    def done_today(self, key: str, view: pd.DataFrame) -> Optional[set]:
+        """routine_log 파티션 뷰의 오늘 완료 task_id (워밍업 기준 + 이후 행). 쓸 수 없으면 None"""
+        state = self._today()
+        base = state.done.get(key) if state else None
+        tail = base.tail_of(view) if base else None
+        if tail is None:
+            return None
+        return base.value | _done_ids(tail, state.date)
+
+    def confirmers_today(self, key: str, view: pd.DataFrame, note_ids: set) -> Optional[Dict[str, set]]:
+        """inform_logs 파티션 뷰의 오늘 인폼 확인자. 워밍업 뒤에 생긴 오늘 인폼이 있거나 기준과 어긋나면 None"""
+        state = self._today()
+        base = state.conf.get(key) if state and note_ids <= state.note_ids else None
+        tail = base.tail_of(view) if base else None
+        if tail is None:
+            return None
+        out = {n: set(u) for n, u in base.value.items()}
+        for n, users in _confirmers(tail, state.note_ids).items():
+            out.setdefault(n, set()).update(users)
+        return out
+
+@per_tenant
+@st.cache_resource
+def get_daily_warmup(tenant: str) -> DailyWarmup:
+    return DailyWarmup(tenant)
+
+def today_done_task_ids() -> Optional[set]:
+    """세션 파티션의 오늘 완료 task_id - 워밍업 기준이 있으면 뒤에 붙은 행만 훑음 (없으면 None)"""
+    done = set()
+    for p in physical_keys("routine_log"):
+        ids = get_daily_warmup().done_today(p, DataManager.load(p, columns=ROUTINE_LOG_HOME_COLUMNS).data)
+        get_metrics().incr("warmup", "done_today", "hit" if ids is not None else "miss")
+        if ids is None:
+            return None
+        done |= ids
+    return done
+
+def today_confirmers(note_ids: set) -> Optional[Dict[str, set]]:
+    """오늘 인폼 note_id -> 확인자 (세션 파티션 합침). 워밍업 기준으로 못 구하면 None"""
+    conf: Dict[str, set] = {}
+    for p in physical_keys("inform_logs"):
+        part = get_daily_warmup().confirmers_today(
+            p, DataManager.load(p, columns=INFORM_LOG_CHECK_COLUMNS).data, note_ids)
+        get_metrics().incr("warmup", "confirmers_today", "hit" if part is not None else "miss")
+        if part is None:
+            return None
+        for n, users in part.items():
+            conf.setdefault(n, set()).update(users)
+    return conf
+
 # ============================================================
 # [8. UI 컴포넌트]
 # ============================================================
@@ -698,11 +3588,12 @@ def show_notification_popup(tasks: List[dict], inform_notes: List[dict]):
     if st.button("확인", use_container_width=True):
         st.rerun()
 
+@timed_page("show_dashboard")
 def show_dashboard():
     username = st.session_state["name"]
 
     pending_tasks = get_pending_tasks_list()
-    unconfirmed_informs = get_unconfirmed_inform_list(username)
+    unconfirmed_informs = get_unconfirmed_inform_list(username, note_columns=INFORM_NOTE_SUMMARY_COLUMNS)
     new_comments = get_new_comments_count(username)
     mentions = get_mentions_for_user(username)
 
@@ -764,6 +3655,18 @@ def show_dashboard():
             else:
                 st.write("새로운 알림이 없습니다.")
 
+@st.fragment(run_every=VERSION_POLL_SECONDS or None)
+def watch_sheet_versions():
+    """다른 세션의 쓰기를 주기적으로 확인해 이 세션이 보고 있는 시트가 바뀌었으면 앱 rerun"""
+    changed = DataManager.sync_versions()
+    if not changed:
+        return
+    if any(base_key(k) == "inform_notes" for k in changed):
+        st.toast("📢 새 인폼/변경 사항이 있습니다")
+    else:
+        st.toast("🔄 다른 사용자의 변경 사항을 반영했습니다")
+    st.rerun()
+
 def show_search():
     st.subheader("🔍 검색")
     query = st.text_input("검색어 입력")
@@ -783,6 +3686,88 @@ def show_search():
 # ============================================================
 # [9. 세션(토큰 자동로그인) 로직]
 # ============================================================
+def get_user_index() -> Dict[str, dict]:
+    """username -> 사용자 행. users 캐시 프레임이 바뀔 때만 다시 만듦 (세션별)"""
+    df = DataManager.load("users").data
+    memo = st.session_state.get("_user_index")
+    if memo is not None and memo[0] is df:
+        return memo[1]
+    index = {}
+    if not df.empty and "username" in df.columns:
+        index = {str(u.get("username", "")).strip(): u for u in df.to_dict("records")}
+    st.session_state["_user_index"] = (df, index)
+    return index
+
+def start_user_session(uid: str, u: dict, **extra):
+    st.session_state.update(
+        {
+            "logged_in": True,
+            "username": uid,
+            "name": u["name"],
+            "role": u["role"],
+            "department": u.get("department", "전체"),
+            "opened_depts": [],
+            **extra,
+        }
+    )
+
+def save_auto_login(uid: str, hpw: str):
+    """자동 로그인 쿠키 (토큰 우선, sessions 시트가 없으면 비밀번호 해시) - 이전 방식 쿠키 정리와 함께 저장 1회"""
+    token = create_session_token(uid)
+    payload = {"u": uid, "s": current_tenant(), **({"t": token} if token else {"h": hpw})}
+    values = {AUTH_COOKIE: sign_cookie(payload)}
+    values.update({k: "" for k in LEGACY_AUTH_COOKIES if safe_get_cookie(k)})
+    safe_set_cookies(values)
+
+def auto_login_payload() -> Optional[dict]:
+    payload = verify_cookie(safe_get_cookie(AUTH_COOKIE))
+    if payload is None and safe_get_cookie("auto_login") == "true":
+        # 이전 방식 쿠키 (로그인되면 새 쿠키로 옮김)
+        payload = {"u": safe_get_cookie("uid"), "t": safe_get_cookie("session_token"), "h": safe_get_cookie("upw"),
+                   "s": current_tenant(), "legacy": True}
+    if not payload or payload.get("s") != current_tenant():
+        return None
+    return payload
+
+def try_auto_login() -> bool:
+    """
+    쿠키 하나 읽기 -> 토큰 검증(sessions 범위 읽기) -> 캐시된 사용자 인덱스에서 사용자.
+    같은 실행 안에서 로그인까지 끝나므로 돌아온 사용자는 추가 rerun 없이 홈으로
+    """
+    payload = auto_login_payload()
+    if payload is None:
+        return False
+    uid = validate_session_token(payload.get("t")) if payload.get("t") else None
+    users = get_user_index()
+    if uid is None:
+        # 토큰이 없거나 만료/폐기: 비밀번호 해시가 저장된 경우만
+        uid = str(payload.get("u") or "").strip()
+        u = users.get(uid)
+        if not payload.get("h") or u is None or str(u.get("password", "")) != str(payload["h"]):
+            return False
+    u = users.get(uid)
+    if u is None or not check_approved(u.get("approved", "False")):
+        return False
+    start_user_session(uid, u)
+    if payload.get("legacy"):
+        payload = {k: v for k, v in payload.items() if v and k != "legacy"}
+        values = {AUTH_COOKIE: sign_cookie(payload)}
+        values.update({k: "" for k in LEGACY_AUTH_COOKIES if safe_get_cookie(k)})
+        safe_set_cookies(values)
+    return True
+
+def clear_auto_login():
+    """로그아웃: 토큰 폐기 + 쿠키 비우기 (저장 1회)"""
+    payload = auto_login_payload() or {}
+    try:
+        if payload.get("t"):
+            revoke_session_token(payload["t"])
+    except:
+        pass
+    values = {AUTH_COOKIE: ""}
+    values.update({k: "" for k in LEGACY_AUTH_COOKIES if safe_get_cookie(k)})
+    safe_set_cookies(values)
+
 def sessions_available() -> bool:
     return DataManager._sheet_exists("sessions")
 
@@ -811,7 +3796,7 @@ def revoke_session_token(token: str):
 def validate_session_token(token: str) -> Optional[str]:
     if not token or not sessions_available():
         return None
-    df = DataManager.load("sessions", force_refresh=True).data
+    df = DataManager.load("sessions", force_refresh=True, columns=SESSION_AUTH_COLUMNS).data
     if df.empty or "token" not in df.columns:
         return None
     row = df[df["token"].astype(str) == str(token)]
@@ -849,6 +3834,9 @@ def login_page():
         )
     else:
         st.title("업무수첩")
+    store_name = TENANTS[current_tenant()].get("name")
+    if store_name:
+        st.caption(f"🏬 {store_name}")
 
     tab1, tab2 = st.tabs(["로그인", "회원가입"])
 
@@ -868,29 +3856,11 @@ def login_page():
 
                     if not u.empty:
                         if check_approved(u.iloc[0].get("approved", "False")):
-                            st.session_state.update(
-                                {
-                                    "logged_in": True,
-                                    "username": uid,
-                                    "name": u.iloc[0]["name"],
-                                    "role": u.iloc[0]["role"],
-                                    "department": u.iloc[0].get("department", "전체"),
-                                    "show_popup_on_login": True,
-                                    "boot_home_loaded": False,  # 로그인 시 첫 홈 최적화를 위해 초기화
-                                }
-                            )
-
-                            if auto and cookies:
-                                token = create_session_token(uid)
-                                if token:
-                                    safe_set_cookie("auto_login", "true")
-                                    safe_set_cookie("session_token", token)
-                                    safe_set_cookie("uid", uid)  # 보조
-                                else:
-                                    # fallback(기존 방식 유지)
-                                    safe_set_cookie("auto_login", "true")
-                                    safe_set_cookie("uid", uid)
-                                    safe_set_cookie("upw", hpw)
+                            # 로그인 시 첫 홈 최적화를 위해 boot_home_loaded 초기화
+                            start_user_session(uid, u.iloc[0].to_dict(), show_popup_on_login=True,
+                                               boot_home_loaded=False)
+                            if auto and cookies is not None and cookies.ready():
+                                save_auto_login(uid, hpw)
 
                             st.rerun()
                         else:
@@ -931,26 +3901,12 @@ def login_page():
                 else:
                     st.warning("모두 입력해주세요")
 
+@timed_page("page_inform")
 def page_inform():
     st.subheader("📢 인폼노트")
     if "inform_date" not in st.session_state:
         st.session_state["inform_date"] = get_now().date()
 
-    c1, c2, c3 = st.columns([1, 2, 1])
-    with c1:
-        if st.button("◀", use_container_width=True):
-            st.session_state["inform_date"] -= timedelta(days=1)
-            st.rerun()
-    with c2:
-        st.session_state["inform_date"] = st.date_input(
-            "날짜", value=st.session_state["inform_date"], label_visibility="collapsed"
-        )
-    with c3:
-        if st.button("▶", use_container_width=True):
-            st.session_state["inform_date"] += timedelta(days=1)
-            st.rerun()
-
-    sel_date = st.session_state["inform_date"].strftime("%Y-%m-%d")
     name = st.session_state["name"]
 
     if st.session_state["role"] in ["Master", "Manager"]:
@@ -958,6 +3914,7 @@ def page_inform():
             with st.form("new_inf"):
                 td = st.date_input("날짜", value=st.session_state["inform_date"])
                 pr = st.radio("중요도", ["일반", "긴급"], horizontal=True)
+                dp = st.selectbox("부서", dept_choices())
                 ct = st.text_area("내용")
                 if st.form_submit_button("등록", use_container_width=True):
                     DataManager.append_row(
@@ -967,6 +3924,7 @@ def page_inform():
                             "content": ct,
                             "author": name,
                             "priority": pr,
+                            "department": dp,
                             "created_at": get_now().strftime("%Y-%m-%d %H:%M"),
                         },
                         "id",
@@ -974,40 +3932,52 @@ def page_inform():
                     )
                     st.rerun()
 
+    inform_day_view(name)
+
+@st.fragment
+@timed_fragment("inform_day_view")
+def inform_day_view(name: str):
+    """날짜 이동 + 그날 인폼 목록/확인 - 이 안의 조작은 fragment만 rerun"""
+    c1, c2, c3 = st.columns([1, 2, 1])
+    with c1:
+        if st.button("◀", use_container_width=True):
+            st.session_state["inform_date"] -= timedelta(days=1)
+            rerun_fragment()
+    with c2:
+        st.session_state["inform_date"] = st.date_input(
+            "날짜", value=st.session_state["inform_date"], label_visibility="collapsed"
+        )
+    with c3:
+        if st.button("▶", use_container_width=True):
+            st.session_state["inform_date"] += timedelta(days=1)
+            rerun_fragment()
+
+    sel = st.session_state["inform_date"]
+    sel_date = sel.strftime("%Y-%m-%d")
+
     res_n = DataManager.load("inform_notes")
-    res_l = DataManager.load("inform_logs")
+    res_l = DataManager.load("inform_logs", columns=INFORM_LOG_CHECK_COLUMNS)
     if res_n.success and not res_n.data.empty:
         notes = res_n.data
         if "target_date" not in notes.columns:
             st.info("인폼 컬럼(target_date) 없음")
             return
 
-        daily = notes[notes["target_date"].astype(str) == sel_date]
-        if daily.empty:
+        idx = get_inform_index(notes)
+        conf_map = get_inform_confirmations(res_l.data if res_l.success else pd.DataFrame())
+        daily = idx.day_records(sel_date)
+        if not daily:
             st.info("인폼 없음")
         else:
-            daily = sorted(daily.to_dict("records"), key=lambda x: 0 if x.get("priority") == "긴급" else 1)
-            logs = res_l.data if res_l.success else pd.DataFrame()
+            mine = sum(name in conf_map.get(str(n.get("id", "")), ()) for n in daily)
+            urgent_n = sum(n.get("priority") == "긴급" for n in daily)
+            st.caption(f"{len(daily)}건 · 긴급 {urgent_n} · 내 확인 {mine}/{len(daily)}")
 
             for n in daily:
                 nid = str(n.get("id", ""))
-                urgent = n.get("priority") == "긴급"
-                cls = "inform-item inform-urgent" if urgent else "inform-item"
-                badge = "🚨 긴급" if urgent else ""
-
-                st.markdown(
-                    f"""
-                    <div class="{cls}">
-                        <div style="font-weight:bold; margin-bottom:5px;">{n.get("author","")} <span style="color:red">{badge}</span></div>
-                        <div style="white-space:pre-wrap;">{highlight_mentions(n.get("content",""))}</div>
-                    </div>
-                    """,
-                    unsafe_allow_html=True,
-                )
+                st.markdown(render_inform_card(n), unsafe_allow_html=True)
 
-                conf = []
-                if not logs.empty and "note_id" in logs.columns and "username" in logs.columns:
-                    conf = logs[logs["note_id"].astype(str) == nid]["username"].tolist()
+                conf = conf_map.get(nid, [])
 
                 c_btn, c_st = st.columns([1, 2])
                 with c_btn:
@@ -1023,42 +3993,29 @@ def page_inform():
                                 None,
                                 "확인",
                             )
-                            st.rerun()
+                            rerun_fragment()
                     else:
                         st.success("확인됨")
                 with c_st:
                     with st.expander(f"확인자 ({len(conf)})"):
                         st.write(", ".join(conf) if conf else "-")
 
+        with st.expander(f"🗓️ {sel.year}년 {sel.month}월"):
+            st.dataframe(inform_month_summary(idx, conf_map, sel, name), hide_index=True, use_container_width=True)
+
+        # ◀/▶ 이동 대비 이웃 날짜 목록을 미리 계산
+        for d in (sel - timedelta(days=1), sel + timedelta(days=1)):
+            idx.day_records(d.strftime("%Y-%m-%d"))
+
+@timed_page("page_routine")
 def page_routine():
     st.subheader("🔄 업무 체크")
     name = st.session_state["name"]
-    t1, t2 = st.tabs(["📋 오늘 업무", "📊 기록/관리"])
+    is_manager = st.session_state["role"] in ["Master", "Manager"]
+    t1, t2, *t3 = st.tabs(["📋 오늘 업무", "📊 기록/관리"] + (["📈 통계"] if is_manager else []))
 
     with t1:
-        tasks = get_pending_tasks_list()
-        if not tasks:
-            st.success("🎉 오늘의 업무를 모두 완료했습니다!")
-        else:
-            for t in tasks:
-                st.markdown(f"**{t.get('task_name','')}** <small>({t.get('cycle_type','')})</small>", unsafe_allow_html=True)
-                with st.form(f"do_{t.get('id','')}"):
-                    mm = st.text_input("메모", placeholder="특이사항")
-                    if st.form_submit_button("완료 ✅", use_container_width=True):
-                        DataManager.append_row(
-                            "routine_log",
-                            {
-                                "task_id": t.get("id", ""),
-                                "done_date": get_today_str(),
-                                "worker": name,
-                                "memo": mm,
-                                "created_at": get_now().strftime("%H:%M"),
-                            },
-                            None,
-                            "완료",
-                        )
-                        st.rerun()
-                st.divider()
+        routine_today_list(name)
 
     with t2:
         if st.session_state["role"] in ["Master", "Manager"]:
@@ -1067,16 +4024,16 @@ def page_routine():
                     tn = st.text_input("업무명")
                     sd = st.date_input("시작일", value=get_now().date())
                     cy = st.selectbox("주기", ["매일", "매주", "매월"])
+                    dp = st.selectbox("부서", dept_choices())
                     if st.form_submit_button("추가"):
-                        new_id = int(time.time())
                         DataManager.append_row(
                             "routine_def",
                             {
-                                "id": new_id,
                                 "task_name": tn,
                                 "start_date": sd.strftime("%Y-%m-%d"),
                                 "cycle_type": cy,
                                 "interval_val": 1,
+                                "department": dp,
                             },
                             "id",
                             "추가",
@@ -1107,20 +4064,120 @@ def page_routine():
         logs = DataManager.load("routine_log").data
         defs = DataManager.load("routine_def").data
         if not logs.empty and not defs.empty and "task_id" in logs.columns and "id" in defs.columns:
-            logs["task_id"] = logs["task_id"].astype(str)
-            defs["id"] = defs["id"].astype(str)
-            m = pd.merge(logs, defs, left_on="task_id", right_on="id", how="left")
-            show_cols = [c for c in ["done_date", "task_name", "worker", "memo"] if c in m.columns]
-            if show_cols:
-                st.dataframe(
-                    m[show_cols].sort_values("done_date", ascending=False).head(50),
-                    hide_index=True,
-                    use_container_width=True,
+            recent = recent_routine_logs(logs, defs)
+            if not recent.empty:
+                st.dataframe(recent, hide_index=True, use_container_width=True)
+
+    if t3:
+        with t3[0]:
+            routine_stats_view()
+
+def routine_stats_view():
+    weeks = st.radio("기간", [4, 12, 26, 52], index=1, horizontal=True, format_func=lambda w: f"최근 {w}주")
+    stats = get_routine_stats(weeks)
+    if stats["task"].empty:
+        st.info("집계할 업무가 없습니다.")
+        return
+
+    total_due, total_done = stats["task"]["예정"].sum(), stats["task"]["완료"].sum()
+    c1, c2, c3 = st.columns(3)
+    c1.metric("완료율", f"{total_done / total_due:.1%}" if total_due else "-")
+    c2.metric("예정", f"{int(total_due):,}")
+    c3.metric("놓친 업무", f"{len(stats['missed']):,}")
+
+    st.caption("주별 완료율 (어제까지)")
+    st.bar_chart(stats["week"].set_index("week")["완료율"])
+    st.caption("업무별")
+    st.dataframe(stats["task"].drop(columns=["task_id"]), hide_index=True, use_container_width=True)
+    st.caption("직원별 완료")
+    st.dataframe(stats["worker"], hide_index=True, use_container_width=True)
+    with st.expander(f"❗ 놓친 업무 ({len(stats['missed']):,})"):
+        st.dataframe(stats["missed"].drop(columns=["task_id"]).head(500), hide_index=True, use_container_width=True)
+
+@st.fragment
+@timed_fragment("routine_today_list")
+def routine_today_list(name: str):
+    """오늘 업무 목록 - 완료 처리는 이 목록만 rerun"""
+    tasks = get_pending_tasks_list()
+    if not tasks:
+        st.success("🎉 오늘의 업무를 모두 완료했습니다!")
+        return
+    for t in tasks:
+        st.markdown(f"**{t.get('task_name','')}** <small>({t.get('cycle_type','')})</small>", unsafe_allow_html=True)
+        with st.form(f"do_{t.get('id','')}"):
+            mm = st.text_input("메모", placeholder="특이사항")
+            if st.form_submit_button("완료 ✅", use_container_width=True):
+                DataManager.append_row(
+                    "routine_log",
+                    {
+                        "task_id": t.get("id", ""),
+                        "done_date": get_today_str(),
+                        "worker": name,
+                        "memo": mm,
+                        "created_at": get_now().strftime("%H:%M"),
+                    },
+                    None,
+                    "완료",
                 )
+                rerun_fragment()
+        st.divider()
 
 # ---------------------------
 # 게시판: 댓글 로딩 최적화 + 상태/담당자/마감
 # ---------------------------
+def get_comments_map() -> Dict[str, pd.DataFrame]:
+    """
+    post_id -> 댓글 프레임. comments 캐시 프레임이 바뀔 때만 갱신:
+    뒤에 행만 붙은 경우(증분 로드/댓글 등록)는 새 행만 해당 글 그룹에 덧붙이고, 그 외엔 다시 groupby
+    """
+    df = DataManager.load("comments").data
+    memo = st.session_state.get("_comments_map")
+    if memo is not None and memo["frame"] is df:
+        return memo["map"]
+    if df.empty or "post_id" not in df.columns:
+        return {}
+
+    old = memo["frame"] if memo is not None else None
+    appended = (
+        old is not None and 0 < len(old) <= len(df) and "row_uuid" in df.columns and "row_uuid" in old.columns
+        and str(df["row_uuid"].iat[len(old) - 1]) == str(old["row_uuid"].iat[-1])
+    )
+    if appended:
+        cmap = dict(memo["map"])
+        tail = df.iloc[len(old):]
+        for pid, grp in tail.groupby(tail["post_id"].astype(str), dropna=False):
+            cmap[pid] = pd.concat([cmap[pid], grp]) if pid in cmap else grp
+    else:
+        cmap = {str(pid): grp for pid, grp in df.groupby(df["post_id"].astype(str), dropna=False)}
+    st.session_state["_comments_map"] = {"frame": df, "map": cmap}
+    return cmap
+
+@st.fragment
+@timed_fragment("post_comments")
+def post_comments(pid: str, post_id: Any, name: str):
+    """글 하나의 댓글 목록 + 작성 - 등록은 이 글의 댓글 영역만 rerun"""
+    grp = get_comments_map().get(pid)
+    if grp is not None and not grp.empty:
+        st.caption("댓글")
+        st.caption(render_comments(pid, grp))
+
+    with st.form(f"c_{pid}"):
+        ctxt = st.text_input("댓글", label_visibility="collapsed")
+        if st.form_submit_button("등록"):
+            DataManager.append_row(
+                "comments",
+                {
+                    "post_id": post_id,
+                    "author": name,
+                    "content": ctxt,
+                    "date": get_now().strftime("%m-%d %H:%M"),
+                },
+                None,
+                "댓글",
+            )
+            rerun_fragment()
+
+@timed_page("page_board")
 def page_board(bn, icon):
     st.subheader(f"{icon} {bn}")
     name = st.session_state["name"]
@@ -1164,7 +4221,6 @@ def page_board(bn, icon):
                     st.rerun()
 
     posts_df = DataManager.load("posts").data
-    comments_df = DataManager.load("comments").data
 
     if posts_df.empty or "board_type" not in posts_df.columns:
         st.info("게시글이 없습니다.")
@@ -1174,18 +4230,6 @@ def page_board(bn, icon):
         if col not in posts_df.columns:
             posts_df[col] = default
 
-    if not comments_df.empty:
-        for col, default in [("post_id", ""), ("author", ""), ("content", ""), ("date", "")]:
-            if col not in comments_df.columns:
-                comments_df[col] = default
-
-    # 댓글 groupby로 미리 맵 구성 (속도 핵심)
-    comments_map: Dict[str, pd.DataFrame] = {}
-    if not comments_df.empty:
-        comments_df["post_id"] = comments_df["post_id"].astype(str)
-        for pid, grp in comments_df.groupby("post_id", dropna=False):
-            comments_map[str(pid)] = grp
-
     mp = posts_df[posts_df["board_type"].astype(str).str.strip() == bn].copy()
     if "id" in mp.columns:
         mp = mp.sort_values("id", ascending=False)
@@ -1204,24 +4248,14 @@ def page_board(bn, icon):
 
     for _, r in mp.iterrows():
         pid = str(r.get("id", ""))
-        st_badge = badge_for_status(str(r.get("status", "접수")))
-        ass = str(r.get("assignee", "")).strip()
-        due = str(r.get("due_date", "")).strip()
-        meta = []
-        if ass:
-            meta.append(f"담당: {ass}")
-        if due:
-            meta.append(f"마감: {due}")
-        meta_txt = (" | " + " / ".join(meta)) if meta else ""
-
-        exp_title = f"{r.get('title','')} ({r.get('author','')})"
+        exp_title, header = render_post_header(r)
         with st.expander(exp_title):
-            st.markdown(f"{st_badge} <b>{r.get('title','')}</b>{meta_txt}", unsafe_allow_html=True)
+            st.markdown(header, unsafe_allow_html=True)
             st.write(r.get("content", ""))
 
             # 관리자/매니저: 상태/담당자/마감 수정
             if st.session_state["role"] in ["Master", "Manager"]:
-                with st.expander("상태/담당자/마감 수정", expanded=False):
+                with st.popover("상태/담당자/마감 수정", use_container_width=True):
                     with st.form(f"edit_post_{pid}"):
                         cA, cB, cC = st.columns([1, 1, 1])
                         with cA:
@@ -1260,29 +4294,8 @@ def page_board(bn, icon):
                     DataManager.delete_row("posts", "id", r.get("id", ""), "삭제")
                     st.rerun()
 
-            # 댓글 표시 (map에서 즉시)
-            grp = comments_map.get(pid)
-            if grp is not None and not grp.empty:
-                st.caption("댓글")
-                for _, c in grp.iterrows():
-                    st.caption(f"{c.get('author','')}: {c.get('content','')}")
-
-            # 댓글 작성 (기존 유지)
-            with st.form(f"c_{pid}"):
-                ctxt = st.text_input("댓글", label_visibility="collapsed")
-                if st.form_submit_button("등록"):
-                    DataManager.append_row(
-                        "comments",
-                        {
-                            "post_id": r.get("id", ""),
-                            "author": name,
-                            "content": ctxt,
-                            "date": get_now().strftime("%m-%d %H:%M"),
-                        },
-                        None,
-                        "댓글",
-                    )
-                    st.rerun()
+            # 댓글 표시/작성 (post_id -> 댓글 맵에서 즉시, 등록은 fragment rerun)
+            post_comments(pid, r.get("id", ""), name)
 
 def page_staff_mgmt():
     st.subheader("👥 직원 관리")
@@ -1293,6 +4306,26 @@ def page_staff_mgmt():
     pending = users[users["approved"].apply(lambda x: not check_approved(x))] if "approved" in users.columns else pd.DataFrame()
     if not pending.empty:
         st.info(f"승인 대기: {len(pending)}명")
+        if len(pending) > 1:
+            with st.form("bulk_approve"):
+                labels = {f"{u.get('name','')} ({u.get('username','')})": u.get("username", "")
+                          for _, u in pending.iterrows()}
+                picked = st.multiselect("일괄 처리 대상", list(labels), default=list(labels))
+                b1, b2 = st.columns(2)
+                do_approve = b1.form_submit_button("선택 승인", use_container_width=True)
+                do_reject = b2.form_submit_button("선택 거절", use_container_width=True)
+                if (do_approve or do_reject) and picked:
+                    targets = [labels[p] for p in picked]
+                    if do_approve:
+                        m = Mutation("users", "update", match_column="username", match_value=targets,
+                                     updates={"approved": "True"})
+                    else:
+                        m = Mutation("users", "delete", match_column="username", match_value=targets)
+                    res = DataManager.apply_batch([m], "일괄 승인" if do_approve else "일괄 거절")
+                    if not res.success:
+                        st.error(res.error_msg)
+                    else:
+                        st.rerun()
         for _, u in pending.iterrows():
             c1, c2, c3 = st.columns([2, 1, 1])
             c1.write(f"{u.get('name','')} ({u.get('username','')})")
@@ -1305,6 +4338,25 @@ def page_staff_mgmt():
     st.divider()
 
     active = users[users["approved"].apply(check_approved)] if "approved" in users.columns else users
+    others = active[active["username"].astype(str) != str(st.session_state.get("username", ""))]
+    if len(others) > 1:
+        with st.expander("직급 일괄 변경"):
+            with st.form("bulk_role"):
+                labels = {f"{u.get('name','')} ({u.get('username','')}, {u.get('role','')})": u.get("username", "")
+                          for _, u in others.iterrows()}
+                picked = st.multiselect("대상", list(labels))
+                nr = st.selectbox("변경할 직급", ["Master", "Manager", "Staff"], index=2)
+                if st.form_submit_button("일괄 변경") and picked:
+                    res = DataManager.apply_batch(
+                        [Mutation("users", "update", match_column="username",
+                                  match_value=[labels[p] for p in picked], updates={"role": nr})],
+                        "일괄 직급 변경",
+                    )
+                    if not res.success:
+                        st.error(res.error_msg)
+                    else:
+                        st.rerun()
+
     for _, u in active.iterrows():
         # (버그 수정) username vs name 비교 오류 수정: 자기 자신 숨기기
         if str(u.get("username", "")) == str(st.session_state.get("username", "")):
@@ -1319,60 +4371,146 @@ def page_staff_mgmt():
                     DataManager.update_row("users", "username", u.get("username", ""), {"role": nr}, "수정")
                     st.rerun()
 
+def page_metrics():
+    st.subheader("📈 성능 지표")
+    reg = get_metrics()
+    st.caption(f"최근 {reg.WINDOW}건 기준 rolling 백분위 · 파일: {reg.path}")
+
+    cache = reg.table("cache")
+    if not cache.empty:
+        total_hit, total_miss = cache["hit"].sum(), cache["miss"].sum()
+        ratio = total_hit / (total_hit + total_miss) if (total_hit + total_miss) else 0
+        st.metric("캐시 적중률", f"{ratio:.1%}", help=f"hit {int(total_hit)} / miss {int(total_miss)}")
+
+    quota = get_quota().status()
+    if not quota.empty:
+        st.caption("🎫 시트 API 남은 쿼터 (프로세스 공용, 분당 충전)")
+        st.dataframe(quota, hide_index=True, use_container_width=True)
+
+    titles = {"read": "📥 시트 읽기 (conn.read)", "update": "📤 시트 쓰기 (conn.update)",
+              "page": "🖥️ 페이지 렌더", "cache": "🗂️ 캐시", "quota": "🎫 쿼터 (종류/우선순위별 허용·대기·미룸)",
+              "warmup": "🌙 자정 워밍업 (오늘 완료/확인자 기준 적중)"}
+    for g in reg.groups():
+        df = reg.table(g)
+        if df.empty:
+            continue
+        st.caption(titles.get(g, g))
+        st.dataframe(df, hide_index=True, use_container_width=True)
+
+    c1, c2 = st.columns(2)
+    with c1:
+        if st.button("📝 지표 파일 지금 기록", key="metrics_flush"):
+            reg.maybe_flush(force=True)
+            st.success("기록 완료")
+    with c2:
+        st.download_button("⬇️ 지표 다운로드", reg.to_prometheus(), file_name="jogakdal.prom",
+                           mime="text/plain", use_container_width=True)
+
+def page_compaction():
+    st.subheader("🧹 시트 정리")
+    st.caption("row_uuid 버전·삭제 표시(tombstone) 접기 / 만료·폐기 세션 제거, 보관 기간이 지난 행은 보관소로 이동")
+    c1, c2 = st.columns(2)
+    keep_log = c1.number_input("routine_log 보관(일)", min_value=30, value=Compaction.RETENTION_DAYS["routine_log"])
+    keep_inf = c2.number_input("inform_logs 보관(일)", min_value=30, value=Compaction.RETENTION_DAYS["inform_logs"])
+    sheets = st.multiselect("대상 시트", Compaction.KEYS, default=Compaction.KEYS)
+    retention = {"routine_log": int(keep_log), "inform_logs": int(keep_inf)}
+
+    b1, b2 = st.columns(2)
+    if b1.button("미리보기", use_container_width=True):
+        with st.spinner("분석 중..."):
+            st.session_state["compaction_report"] = Compaction.run(sheets, dry_run=True, retention_days=retention)
+    if b2.button("정리 실행", type="primary", use_container_width=True):
+        with st.spinner("정리 중..."):
+            st.session_state["compaction_report"] = Compaction.run(sheets, retention_days=retention)
+
+    reports = st.session_state.get("compaction_report")
+    if reports:
+        st.dataframe(Compaction.report_df(reports), hide_index=True, use_container_width=True)
+
+    st.divider()
+    st.caption(f"표준 타임스탬프({TS_COLUMN}) 채우기 - 비어 있는 행만, 기존 날짜 컬럼에서 유도 (1회)")
+    if st.button("ts 마이그레이션", use_container_width=True):
+        with st.spinner("마이그레이션 중..."):
+            st.dataframe(pd.DataFrame(migrate_timestamps()), hide_index=True, use_container_width=True)
+
+    st.divider()
+    st.caption("부서 파티션 이전 - 공용 시트에 있는 부서 행(게시판/부서 지정/부모 글 기준)을 부서 워크시트로 (1회)")
+    b1, b2 = st.columns(2)
+    if b1.button("이전 미리보기", use_container_width=True):
+        with st.spinner("분석 중..."):
+            st.dataframe(pd.DataFrame(partition_all(dry_run=True)), hide_index=True, use_container_width=True)
+    if b2.button("부서 파티션 이전", use_container_width=True):
+        with st.spinner("이전 중..."):
+            st.dataframe(pd.DataFrame(partition_all()), hide_index=True, use_container_width=True)
+            DataManager.clear_cache()
+
+def page_profiler():
+    st.subheader("🔬 프로파일")
+    st.caption("다음 rerun들을 cProfile로 측정 (이 세션만). URL에 ?profile=N 을 붙여도 됨")
+    c1, c2 = st.columns([1, 1])
+    n = c1.number_input("rerun 횟수", min_value=1, max_value=PROFILE_MAX_RUNS, value=3)
+    if c2.button("측정 시작", use_container_width=True):
+        st.session_state["profile_runs"] = int(n)
+        st.rerun()
+    if st.session_state.get("profile_runs"):
+        st.info(f"남은 측정: {st.session_state['profile_runs']}회")
+
+    profiles = list(get_profiles())[::-1]
+    if not profiles:
+        st.caption("저장된 프로파일 없음")
+        return
+    st.dataframe(pd.DataFrame([{"시각": p.ts, "사용자": p.user, "전체(ms)": p.total_ms, **p.breakdown}
+                               for p in profiles]), hide_index=True, use_container_width=True)
+    for i, p in enumerate(profiles):
+        with st.expander(f"{p.ts} · {p.user} · {p.total_ms:.0f}ms"):
+            st.code(p.top)
+            d1, d2 = st.columns(2)
+            d1.download_button("⬇️ .prof (snakeviz 등)", p.stats, file_name=f"rerun-{i}.prof", key=f"prof_bin_{i}",
+                               use_container_width=True)
+            d2.download_button("⬇️ 텍스트", p.top, file_name=f"rerun-{i}.txt", key=f"prof_txt_{i}",
+                               use_container_width=True)
+
+def page_admin():
+    t1, t2, t3, t4 = st.tabs(["👥 직원 관리", "📈 성능", "🧹 정리", "🔬 프로파일"])
+    with t1:
+        page_staff_mgmt()
+    with t2:
+        page_metrics()
+    with t3:
+        page_compaction()
+    with t4:
+        page_profiler()
+
 # ============================================================
 # [11. 메인 앱]
 # ============================================================
+def select_tenant():
+    """
+    URL ?store=<매장 id>로 매장 선택 (없으면 세션의 매장 유지, 처음이면 기본 매장).
+    세션 중 매장이 바뀌면 다른 매장 데이터가 섞이지 않도록 캐시를 비우고 다시 로그인
+    """
+    want = st.query_params.get("store") or st.session_state.get("tenant") or DEFAULT_TENANT
+    if want not in TENANTS:
+        want = DEFAULT_TENANT
+    prev = st.session_state.get("tenant")
+    if prev is not None and prev != want:
+        DataManager.clear_cache()
+        st.session_state.update({"logged_in": False, "boot_home_loaded": False, "pending_saves": []})
+    st.session_state["tenant"] = want
+
+@profiled
+@timed_page("app")
 def main():
     AppState.init()
+    select_tenant()
+    # 매장별 첫 실행 때 디스크 스냅샷 로드 + 원격 대조 시작, 자정 워밍업 작업 시작 (시작 직후 1회 + 매일 자정)
+    get_snapshots()
+    get_daily_warmup()
 
     # ---------- 자동 로그인 ----------
     if not st.session_state.get("logged_in"):
         try:
-            if safe_get_cookie("auto_login") == "true":
-                # 1순위: 세션 토큰 자동로그인
-                token = safe_get_cookie("session_token")
-                if token:
-                    uid = validate_session_token(token)
-                    if uid:
-                        res = DataManager.load("users", force_refresh=True)
-                        if res.success and not res.data.empty:
-                            users = res.data
-                            users["username"] = users["username"].astype(str)
-                            u = users[users["username"] == uid]
-                            if not u.empty and check_approved(u.iloc[0].get("approved", "False")):
-                                st.session_state.update(
-                                    {
-                                        "logged_in": True,
-                                        "username": uid,
-                                        "name": u.iloc[0]["name"],
-                                        "role": u.iloc[0]["role"],
-                                        "department": u.iloc[0].get("department", "전체"),
-                                    }
-                                )
-
-                # 2순위: 기존 해시 쿠키 fallback
-                if not st.session_state.get("logged_in"):
-                    uid = safe_get_cookie("uid")
-                    upw = safe_get_cookie("upw")
-                    if uid:
-                        res = DataManager.load("users", force_refresh=True)
-                        if res.success and not res.data.empty:
-                            users = res.data
-                            users["username"] = users["username"].astype(str)
-                            u = users[users["username"] == uid]
-                            if not u.empty and check_approved(u.iloc[0].get("approved", "False")):
-                                if upw:
-                                    if str(u.iloc[0].get("password", "")) != str(upw):
-                                        raise Exception("saved hash mismatch")
-                                st.session_state.update(
-                                    {
-                                        "logged_in": True,
-                                        "username": uid,
-                                        "name": u.iloc[0]["name"],
-                                        "role": u.iloc[0]["role"],
-                                        "department": u.iloc[0].get("department", "전체"),
-                                    }
-                                )
+            try_auto_login()
         except:
             pass
 
@@ -1380,6 +4518,9 @@ def main():
         login_page()
         return
 
+    # 다른 세션이 쓴 시트만 무효화 (전체 캐시를 버리지 않음)
+    DataManager.sync_versions()
+
     # ✅ [속도 개선 핵심] 로그인 직후에는 홈/팝업 최소 데이터만 먼저 로드
     if not st.session_state.get("boot_home_loaded"):
         with st.spinner("동기화 중..."):
@@ -1406,7 +4547,8 @@ def main():
         st.markdown(f"**{st.session_state['name']}** ({st.session_state.get('department','전체')})")
     with c3:
         if st.button("🔄", key="refresh"):
-            DataManager.clear_cache()
+            # 프레임은 남기고 만료만 -> 다음 로드가 증분/범위 읽기로 원격 확인 (실패 시 기존 프레임 사용)
+            DataManager.mark_stale()
             # 리프레시하면 다음 렌더에 최소 프리패치 다시
             st.session_state["boot_home_loaded"] = False
             st.rerun()
@@ -1418,7 +4560,6 @@ def main():
     if st.session_state["role"] == "Master":
         menu.insert(-1, "관리")
         icons.insert(-1, "people-fill")
-
     m = option_menu(
         None,
         menu,
@@ -1434,30 +4575,22 @@ def main():
     # - 홈은 이미 최소 프리패치 완료
     # - 게시판/알림 체감 올리고 싶으면 아래처럼 켜세요.
     if m in ["본점", "작업", "건의"]:
+        # 다른 부서 게시판은 메뉴를 연 이 시점부터 그 부서 파티션도 로드
+        open_board_dept({"본점": "본점", "작업": "작업장"}.get(m, ""))
         DataManager.prefetch(["posts", "comments"])
     elif m == "관리":
         DataManager.prefetch(["users"])
     elif m == "체크":
         DataManager.prefetch(["routine_def", "routine_log"])
     elif m == "인폼":
-        DataManager.prefetch(["inform_notes", "inform_logs"])
+        DataManager.prefetch(["inform_notes", "inform_logs"], columns={"inform_logs": INFORM_LOG_CHECK_COLUMNS})
 
     if m == "로그아웃":
         st.session_state["logged_in"] = False
 
-        # 토큰 세션 revoke
-        try:
-            token = safe_get_cookie("session_token")
-            if token:
-                revoke_session_token(token)
-        except:
-            pass
-
-        # 쿠키 정리
+        # 토큰 세션 revoke + 쿠키 정리
         try:
-            if cookies:
-                safe_set_cookie("auto_login", "false")
-                safe_set_cookie("session_token", "")
+            clear_auto_login()
         except:
             pass
 
@@ -1478,7 +4611,17 @@ def main():
     elif m == "건의":
         page_board("건의사항", "💡")
     elif m == "관리":
-        page_staff_mgmt()
+        page_admin()
+
+    watch_sheet_versions()
+    get_metrics().maybe_flush()
 
 if __name__ == "__main__":
+    # CLI: python app.py compact|migrate-ts|partition ... (streamlit run 이 아닐 때만)
+    if not st.runtime.exists() and sys.argv[1:2] == ["compact"]:
+        sys.exit(compact_cli(sys.argv[2:]))
+    if not st.runtime.exists() and sys.argv[1:2] == ["migrate-ts"]:
+        sys.exit(migrate_ts_cli(sys.argv[2:]))
+    if not st.runtime.exists() and sys.argv[1:2] == ["partition"]:
+        sys.exit(partition_cli(sys.argv[2:]))
     main()
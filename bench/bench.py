@@ -0,0 +1,282 @@
+"""
+오프라인 벤치마크 (로컬 fake GSheets 연결 + 합성 데이터, 실제 시트 불필요)
+
+    python bench/bench.py --scale small
+    python bench/bench.py --scale large --latency-ms 150 --ms-per-1k-rows 20 --repeat 5
+
+- DataManager(load/append_row/update_row)와 비즈니스 함수, 게시판 렌더 시간을 측정
+- 결과는 bench/results/history.jsonl 에 누적, 같은 조건의 직전 실행 대비
+  중앙값이 --threshold 배 이상 느려진 항목은 회귀(REGRESSION)로 표시
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault("JOGAKDAL_FAKE_SHEETS", ":memory:")
+os.environ.setdefault("JOGAKDAL_METRICS_FILE", "")
+os.environ.setdefault("JOGAKDAL_SNAPSHOT_DIR", "")  # 원격 경로 측정 (웜 스타트는 별도 항목)
+
+import datagen  # noqa: E402
+import fake_gsheets  # noqa: E402
+
+HISTORY_FILE = os.path.join(ROOT, "bench", "results", "history.jsonl")
+BENCH_USER = {"logged_in": True, "name": "직원0000", "username": "user0000", "role": "Master", "department": "전체"}
+
+
+def _git_rev() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, text=True,
+                                       stderr=subprocess.DEVNULL).strip()
+    except Exception:
+        return ""
+
+
+class Bench:
+    def __init__(self, store: fake_gsheets.FakeSheetStore, repeat: int):
+        self.store = store
+        self.repeat = repeat
+        self.results: Dict[str, dict] = {}
+
+    def run(self, name: str, fn: Callable, setup: Optional[Callable] = None, repeat: int = None):
+        times: List[float] = []
+        calls: List[int] = []
+        for _ in range(repeat or self.repeat):
+            if setup:
+                setup()
+            c0 = self.store.total_calls()
+            t0 = time.perf_counter()
+            fn()
+            times.append((time.perf_counter() - t0) * 1000)
+            calls.append(self.store.total_calls() - c0)
+        s = sorted(times)
+        self.results[name] = {
+            "median_ms": round(statistics.median(s), 2),
+            "p95_ms": round(s[min(len(s) - 1, int(round(0.95 * (len(s) - 1))))], 2),
+            "api_calls": round(statistics.mean(calls), 2),
+        }
+        r = self.results[name]
+        print(f"  {name:40s} {r['median_ms']:>10.2f} ms  p95 {r['p95_ms']:>10.2f} ms  calls {r['api_calls']:>5}")
+
+
+def _board_script():
+    import streamlit as st
+    import app
+
+    app.AppState.init()
+    st.session_state.update(st.session_state.get("_bench_user", {}))
+    app.page_board("본점", "🏠")
+
+
+def _fragment_script():
+    """전체 페이지 vs fragment 단독 rerun 비교용 (_bench_target 에 따라 하나만 렌더)"""
+    import streamlit as st
+    import app
+
+    app.AppState.init()
+    st.session_state.update(st.session_state.get("_bench_user", {}))
+    name = st.session_state["name"]
+    target = st.session_state.get("_bench_target")
+    if target == "page_inform":
+        app.page_inform()
+    elif target == "inform_day_view":
+        app.inform_day_view(name)
+    elif target == "page_routine":
+        app.page_routine()
+    elif target == "routine_today_list":
+        app.routine_today_list(name)
+    elif target == "post_comments":
+        app.post_comments("1", 1, name)
+
+
+def _apptest_runner(script, **state):
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_function(script, default_timeout=600)
+    at.session_state["_bench_user"] = BENCH_USER
+    for k, v in state.items():
+        at.session_state[k] = v
+
+    def render():
+        at.run()
+        if at.exception:
+            raise RuntimeError(at.exception[0].message)
+    return render
+
+
+def bench_board_render(bench: Bench):
+    render = _apptest_runner(_board_script)
+    bench.run("render page_board (cold session)", render, repeat=1)
+    bench.run("render page_board (warm)", render)
+
+
+def bench_fragments(bench: Bench):
+    """fragment rerun이 다시 그리는 범위 vs 같은 조작이 전체 rerun일 때 다시 그리던 페이지"""
+    for target in ["page_inform", "inform_day_view", "page_routine", "routine_today_list", "post_comments"]:
+        render = _apptest_runner(_fragment_script, _bench_target=target)
+        render()
+        bench.run(f"rerun {target} (warm)", render)
+
+
+def bench_warm_start(bench: Bench):
+    """재시작 직후 첫 세션의 홈/팝업 프리패치: 원격 읽기 vs 디스크 스냅샷 (원격 대조는 백그라운드)"""
+    import app
+
+    snap_dir = os.path.join(ROOT, "bench", "data", "snapshots")
+    DM = app.DataManager
+    keys = ["routine_def", "routine_log", "inform_notes", "inform_logs"]
+
+    def restart(directory: str):
+        app.SNAPSHOT_DIR = directory
+        app.get_snapshots.clear()
+        for k in keys:
+            DM.clear_cache(k)
+
+    restart(snap_dir)
+    for k in keys:
+        DM.load(k, force_refresh=True, full=True)
+    app.get_snapshots().flush()
+
+    bench.run("prefetch_home_popup (재시작, 원격)", DM.prefetch_home_popup, setup=lambda: restart(""))
+    bench.run("prefetch_home_popup (재시작, 스냅샷)", DM.prefetch_home_popup, setup=lambda: restart(snap_dir))
+    app.get_snapshots().reconciled.wait(600)
+    restart("")
+
+
+def run_suite(args) -> Dict[str, dict]:
+    t0 = time.perf_counter()
+    frames = datagen.generate(args.scale, args.seed)
+    print(f"데이터 생성 {args.scale}: {time.perf_counter() - t0:.1f}s "
+          + ", ".join(f"{k}={len(v):,}" for k, v in frames.items()))
+
+    store = fake_gsheets.get_store(os.environ["JOGAKDAL_FAKE_SHEETS"])
+    store.load_frames(frames)
+
+    import streamlit as st
+    import app
+
+    app.AppState.init()
+    st.session_state.update(BENCH_USER)
+
+    store.configure(latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+                    ms_per_1k_rows=args.ms_per_1k_rows, failure_rate=0.0, quota_per_minute=0)
+    store.reset_stats()
+    bench = Bench(store, args.repeat)
+    DM = app.DataManager
+
+    print("\n[DataManager.load]")
+    for key in ["users", "posts", "comments", "routine_log", "inform_notes", "inform_logs"]:
+        bench.run(f"load {key} (cold)", lambda k=key: DM.load(k), setup=lambda k=key: DM.clear_cache(k))
+        bench.run(f"load {key} (cached)", lambda k=key: DM.load(k))
+        bench.run(f"load {key} (refresh)", lambda k=key: DM.load(k, force_refresh=True))
+
+    print("\n[컬럼 프로젝션]")
+    projections = {"routine_log": app.ROUTINE_LOG_HOME_COLUMNS, "inform_logs": app.INFORM_LOG_CHECK_COLUMNS,
+                   "inform_notes": app.INFORM_NOTE_SUMMARY_COLUMNS, "sessions": app.SESSION_AUTH_COLUMNS}
+    for key, cols in projections.items():
+        bench.run(f"load {key} cols={len(cols)} (cold)", lambda k=key, c=cols: DM.load(k, columns=c),
+                  setup=lambda k=key: DM.clear_cache(k))
+        bench.run(f"load {key} cols={len(cols)} (refresh)",
+                  lambda k=key, c=cols: DM.load(k, force_refresh=True, full=False, columns=c))
+        DM.clear_cache(key)
+
+    print("\n[웜 스타트]")
+    bench_warm_start(bench)
+
+    print("\n[DataManager 쓰기]")
+    bench.run("append_row comments", lambda: DM.append_row(
+        "comments", {"post_id": 1, "author": BENCH_USER["name"], "content": "bench", "date": "01-01 00:00"}, None, "bench"))
+    bench.run("append_row posts (id 자동)", lambda: DM.append_row(
+        "posts", {"board_type": "본점", "title": "bench", "content": "bench", "author": BENCH_USER["name"]}, "id", "bench"))
+    bench.run("update_row posts", lambda: DM.update_row("posts", "id", 1, {"status": "진행중"}, "bench"))
+
+    print("\n[비즈니스 함수]")
+    home_keys = ["routine_def", "routine_log", "inform_notes", "inform_logs"]
+
+    def clear(keys):
+        for k in keys:
+            DM.clear_cache(k)
+
+    bench.run("get_pending_tasks_list (cold)", app.get_pending_tasks_list, setup=lambda: clear(home_keys[:2]))
+    bench.run("get_pending_tasks_list (cached)", app.get_pending_tasks_list)
+    bench.run("get_unconfirmed_inform_list (cold)", lambda: app.get_unconfirmed_inform_list(BENCH_USER["name"]),
+              setup=lambda: clear(home_keys[2:]))
+    bench.run("get_unconfirmed_inform_list (cached)", lambda: app.get_unconfirmed_inform_list(BENCH_USER["name"]))
+    bench.run("search_content (cached)", lambda: app.search_content("재고"))
+    bench.run("get_routine_stats 12주 (cached)", lambda: app.get_routine_stats(12))
+
+    print("\n[렌더]")
+    bench_fragments(bench)
+    bench_board_render(bench)
+    return bench.results
+
+
+def _same_conditions(a: dict, b: dict) -> bool:
+    keys = ["scale", "seed", "latency_ms", "jitter_ms", "ms_per_1k_rows", "repeat"]
+    return all(a.get("params", {}).get(k) == b.get("params", {}).get(k) for k in keys)
+
+
+def compare(prev: Optional[dict], results: Dict[str, dict], threshold: float) -> List[str]:
+    if not prev:
+        print("\n(비교 대상 직전 실행 없음)")
+        return []
+    print(f"\n직전 실행 대비 ({prev.get('git_rev') or '?'} @ {prev.get('ts')})")
+    regressions = []
+    for name, r in results.items():
+        old = prev["results"].get(name)
+        if not old or not old.get("median_ms"):
+            continue
+        ratio = r["median_ms"] / old["median_ms"]
+        flag = ""
+        # 1ms 미만 항목은 측정 잡음이 커서 회귀 판정에서 제외
+        if ratio >= threshold and r["median_ms"] - old["median_ms"] > 1.0:
+            flag = "  <-- REGRESSION"
+            regressions.append(name)
+        print(f"  {name:40s} {old['median_ms']:>10.2f} -> {r['median_ms']:>10.2f} ms  x{ratio:.2f}{flag}")
+    return regressions
+
+
+def main():
+    ap = argparse.ArgumentParser(description="오프라인 벤치마크")
+    ap.add_argument("--scale", choices=list(datagen.SCALES), default="small")
+    ap.add_argument("--seed", type=int, default=42)
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--latency-ms", type=float, default=0)
+    ap.add_argument("--jitter-ms", type=float, default=0)
+    ap.add_argument("--ms-per-1k-rows", type=float, default=0)
+    ap.add_argument("--threshold", type=float, default=1.25, help="회귀 판정 배수")
+    ap.add_argument("--history", default=HISTORY_FILE)
+    ap.add_argument("--no-save", action="store_true", help="history에 기록하지 않음")
+    ap.add_argument("--fail-on-regression", action="store_true")
+    args = ap.parse_args()
+
+    results = run_suite(args)
+    params = {k: getattr(args, k) for k in ["scale", "seed", "repeat", "latency_ms", "jitter_ms", "ms_per_1k_rows"]}
+    record = {"ts": datetime.now().isoformat(timespec="seconds"), "git_rev": _git_rev(), "params": params,
+              "results": results}
+
+    prev = None
+    if os.path.exists(args.history):
+        with open(args.history, encoding="utf-8") as f:
+            runs = [json.loads(line) for line in f if line.strip()]
+        prev = next((r for r in reversed(runs) if _same_conditions(r, record)), None)
+    regressions = compare(prev, results, args.threshold)
+
+    if not args.no_save:
+        os.makedirs(os.path.dirname(args.history), exist_ok=True)
+        with open(args.history, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+    if regressions and args.fail_on_regression:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
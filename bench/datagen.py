@@ -0,0 +1,211 @@
+"""
+합성 데이터 생성기 (실제 시트와 같은 컬럼 구성)
+
+    python bench/datagen.py --scale large --out bench/data/large
+
+규모(SCALES)는 시트별 행 수. large = 게시글 1만 / 댓글 20만 / routine_log 100만 / 사용자 500
+"""
+import argparse
+import hashlib
+import os
+import uuid
+from datetime import datetime, timedelta
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+import pytz
+
+SCALES = {
+    "tiny": dict(users=20, posts=100, comments=1_000, routine_def=10, routine_log=2_000,
+                 inform_notes=100, inform_logs=1_000, sessions=100),
+    "small": dict(users=50, posts=1_000, comments=20_000, routine_def=30, routine_log=50_000,
+                  inform_notes=1_000, inform_logs=20_000, sessions=1_000),
+    "medium": dict(users=200, posts=5_000, comments=100_000, routine_def=60, routine_log=300_000,
+                   inform_notes=5_000, inform_logs=100_000, sessions=5_000),
+    "large": dict(users=500, posts=10_000, comments=200_000, routine_def=100, routine_log=1_000_000,
+                  inform_notes=10_000, inform_logs=300_000, sessions=20_000),
+}
+
+DEPARTMENTS = ["전체", "본점", "작업장"]
+BOARDS = ["본점", "작업장", "건의사항"]
+POST_STATUS = ["접수", "진행중", "완료", "보류"]
+CYCLES = ["매일", "매주", "매월"]
+WORDS = ["재고", "발주", "청소", "마감", "오픈", "택배", "포장", "냉장고", "점검", "교육",
+         "고객", "주문", "배송", "정산", "확인", "공지", "변경", "요청", "특이사항", "완료"]
+
+DEFAULT_PASSWORD = "pw1234"
+TS_FORMAT = "%Y-%m-%d %H:%M:%S"  # app.TS_FORMAT (append-like 시트 표준 타임스탬프)
+
+
+def _hash(pw: str) -> str:
+    return hashlib.sha256(pw.encode()).hexdigest()
+
+
+def _uuids(n: int, rng: np.random.Generator):
+    return [str(uuid.UUID(bytes=rng.bytes(16), version=4)) for _ in range(n)]
+
+
+def _sentences(n: int, rng: np.random.Generator, lo: int, hi: int, mention_pool=None):
+    words = np.array(WORDS)
+    lengths = rng.integers(lo, hi, size=n)
+    out = [" ".join(words[rng.integers(0, len(words), size=k)]) for k in lengths]
+    if mention_pool is not None and len(mention_pool):
+        for i in np.flatnonzero(rng.random(n) < 0.05):
+            out[i] += f" @{mention_pool[rng.integers(0, len(mention_pool))]}"
+    return out
+
+
+def _dates(n: int, rng: np.random.Generator, days_back: int, end: datetime) -> pd.Series:
+    """과거 days_back일에 걸친 시간순(append 순서) 시각"""
+    offsets = np.sort(rng.integers(0, days_back * 86400, size=n))[::-1]
+    return pd.Series(pd.to_datetime(end) - pd.to_timedelta(offsets, unit="s"))
+
+
+def generate(scale: str = "small", seed: int = 42, today: datetime = None) -> Dict[str, pd.DataFrame]:
+    n = SCALES[scale]
+    rng = np.random.default_rng(seed)
+    # 앱과 같은 KST 기준 "오늘" (오늘 인폼/업무가 실제로 오늘로 잡히도록)
+    today = today or datetime.now(pytz.timezone("Asia/Seoul")).replace(tzinfo=None)
+    days_back = 730
+
+    # users
+    nu = n["users"]
+    usernames = [f"user{i:04d}" for i in range(nu)]
+    names = [f"직원{i:04d}" for i in range(nu)]
+    roles = np.where(np.arange(nu) == 0, "Master", np.where(np.arange(nu) % 10 == 1, "Manager", "Staff"))
+    users = pd.DataFrame({
+        "username": usernames,
+        "password": _hash(DEFAULT_PASSWORD),
+        "name": names,
+        "role": roles,
+        "approved": np.where(rng.random(nu) < 0.95, "True", "False"),
+        "department": rng.choice(DEPARTMENTS, size=nu),
+    })
+    users.loc[0, "approved"] = "True"
+
+    # posts
+    npst = n["posts"]
+    pdates = _dates(npst, rng, days_back, today)
+    posts = pd.DataFrame({
+        "id": np.arange(1, npst + 1),
+        "board_type": rng.choice(BOARDS, size=npst),
+        "title": _sentences(npst, rng, 2, 5),
+        "content": _sentences(npst, rng, 10, 40),
+        "author": rng.choice(names, size=npst),
+        "date": pdates.dt.strftime("%Y-%m-%d"),
+        "status": rng.choice(POST_STATUS, size=npst),
+        "assignee": "",
+        "due_date": "",
+        "updated_at": pdates.dt.strftime("%Y-%m-%d %H:%M"),
+        "row_uuid": _uuids(npst, rng),
+        "ts": pdates.dt.strftime(TS_FORMAT),
+    })
+
+    # comments
+    nc = n["comments"]
+    cdates = _dates(nc, rng, days_back, today)
+    comments = pd.DataFrame({
+        "post_id": rng.integers(1, npst + 1, size=nc),
+        "author": rng.choice(names, size=nc),
+        "content": _sentences(nc, rng, 3, 12, mention_pool=names),
+        "date": cdates.dt.strftime("%m-%d %H:%M"),
+        "row_uuid": _uuids(nc, rng),
+        "ts": cdates.dt.strftime(TS_FORMAT),
+    })
+
+    # routine_def
+    nd = n["routine_def"]
+    routine_def = pd.DataFrame({
+        "id": np.arange(1, nd + 1),
+        "task_name": [f"{w} 업무 {i}" for i, w in enumerate(rng.choice(WORDS, size=nd))],
+        "start_date": (pd.to_datetime(today) - pd.to_timedelta(rng.integers(0, days_back, size=nd), unit="D")).strftime("%Y-%m-%d"),
+        "cycle_type": rng.choice(CYCLES, size=nd, p=[0.6, 0.3, 0.1]),
+        "interval_val": 1,
+    })
+
+    # routine_log
+    nl = n["routine_log"]
+    ldates = _dates(nl, rng, days_back, today)
+    routine_log = pd.DataFrame({
+        "task_id": rng.integers(1, nd + 1, size=nl),
+        "done_date": ldates.dt.strftime("%Y-%m-%d"),
+        "worker": rng.choice(names, size=nl),
+        "memo": np.where(rng.random(nl) < 0.2, "특이사항 없음", ""),
+        "created_at": ldates.dt.strftime("%H:%M"),
+        "row_uuid": _uuids(nl, rng),
+        "ts": ldates.dt.strftime(TS_FORMAT),
+    })
+
+    # inform_notes
+    ni = n["inform_notes"]
+    idates = _dates(ni, rng, days_back, today)
+    inform_notes = pd.DataFrame({
+        "id": np.arange(1, ni + 1),
+        "target_date": idates.dt.strftime("%Y-%m-%d"),
+        "content": _sentences(ni, rng, 10, 60, mention_pool=names),
+        "author": rng.choice(names, size=ni),
+        "priority": np.where(rng.random(ni) < 0.15, "긴급", "일반"),
+        "created_at": idates.dt.strftime("%Y-%m-%d %H:%M"),
+        "row_uuid": _uuids(ni, rng),
+        "ts": idates.dt.strftime(TS_FORMAT),
+    })
+    # 오늘 인폼 몇 건 보장 (팝업/미확인 경로가 비지 않도록)
+    today_rows = min(5, ni)
+    inform_notes.loc[inform_notes.index[-today_rows:], "target_date"] = today.strftime("%Y-%m-%d")
+
+    # inform_logs (확인자 = 표시 이름, app.page_inform 과 동일)
+    nil = n["inform_logs"]
+    ildates = _dates(nil, rng, days_back, today)
+    inform_logs = pd.DataFrame({
+        "note_id": rng.integers(1, ni + 1, size=nil),
+        "username": rng.choice(names, size=nil),
+        "confirmed_at": ildates.dt.strftime("%m-%d %H:%M"),
+        "row_uuid": _uuids(nil, rng),
+        "ts": ildates.dt.strftime(TS_FORMAT),
+    })
+
+    # sessions
+    ns = n["sessions"]
+    sdates = _dates(ns, rng, 60, today)
+    sessions = pd.DataFrame({
+        "token": _uuids(ns, rng),
+        "username": rng.choice(usernames, size=ns),
+        "created_at": sdates.dt.strftime("%Y-%m-%d %H:%M:%S"),
+        "expires_at": (sdates + timedelta(days=30)).dt.strftime("%Y-%m-%d %H:%M:%S"),
+        "revoked": np.where(rng.random(ns) < 0.1, "True", "False"),
+        "row_uuid": _uuids(ns, rng),
+    })
+
+    return {
+        "users": users,
+        "posts": posts,
+        "comments": comments,
+        "routine_def": routine_def,
+        "routine_log": routine_log,
+        "inform_notes": inform_notes,
+        "inform_logs": inform_logs,
+        "sessions": sessions,
+    }
+
+
+def write(frames: Dict[str, pd.DataFrame], out_dir: str):
+    os.makedirs(out_dir, exist_ok=True)
+    for name, df in frames.items():
+        df.to_csv(os.path.join(out_dir, f"{name}.csv"), index=False)
+
+
+def main():
+    ap = argparse.ArgumentParser(description="합성 시트 데이터 생성")
+    ap.add_argument("--scale", choices=list(SCALES), default="small")
+    ap.add_argument("--seed", type=int, default=42)
+    ap.add_argument("--out", required=True, help="CSV 출력 디렉터리 (JOGAKDAL_FAKE_SHEETS로 지정)")
+    args = ap.parse_args()
+    frames = generate(args.scale, args.seed)
+    write(frames, args.out)
+    for name, df in frames.items():
+        print(f"{name:14s} {len(df):>9,d} rows")
+
+
+if __name__ == "__main__":
+    main()
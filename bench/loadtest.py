@@ -0,0 +1,337 @@
+"""
+동시 세션 부하 테스트 (09:00 출근 시간대 재현)
+
+    python bench/loadtest.py --levels 1,5,10,20 --latency-ms 80
+
+streamlit.testing(AppTest)으로 app.py를 세션마다 독립 실행하고, 로컬 fake 백엔드를
+공유시켜 다음 시나리오를 동시에 돌린다.
+  1) 로그인 (짝수 세션: 자동로그인 쿠키 / 홀수 세션: 로그인 폼 -> 홈 팝업)
+  2) 홈 팝업 닫기
+  3) 인폼 확인(확인함 ✅)
+  4) 반복 업무 완료(완료 ✅)
+  5) 게시판 댓글 등록
+동시성 단계별로 rerun 지연 p50/p95/p99, API 호출 수, 유실된 쓰기 수를 보고한다.
+
+AppTest는 커스텀 컴포넌트(CookieManager, option_menu)를 렌더하지 못하므로
+세션 상태 기반 대역으로 교체해 쿠키와 메뉴 선택을 흉내낸다.
+"""
+import argparse
+import contextlib
+import os
+import statistics
+import sys
+import threading
+import time
+import traceback
+import uuid
+from datetime import datetime, timedelta
+from typing import Dict, List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault("JOGAKDAL_FAKE_SHEETS", ":memory:")
+os.environ.setdefault("JOGAKDAL_METRICS_FILE", "")
+os.environ.setdefault("JOGAKDAL_SNAPSHOT_DIR", "")
+
+import pandas as pd  # noqa: E402
+import streamlit as st  # noqa: E402
+import streamlit_cookies_manager  # noqa: E402
+import streamlit_option_menu  # noqa: E402
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+import datagen  # noqa: E402
+import fake_gsheets  # noqa: E402
+
+APP_PATH = os.path.join(ROOT, "app.py")
+COOKIE_STATE = "_loadtest_cookies"
+MENU_STATE = "_loadtest_menu"
+
+
+# ---------- 컴포넌트 대역 ----------
+class FakeCookieManager:
+    """세션 상태에 쿠키를 보관 (save 호출 수 집계)"""
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def _jar(self) -> dict:
+        if COOKIE_STATE not in st.session_state:
+            st.session_state[COOKIE_STATE] = {}
+        return st.session_state[COOKIE_STATE]
+
+    def ready(self) -> bool:
+        return True
+
+    def get(self, key, default=None):
+        return self._jar().get(key, default)
+
+    def __getitem__(self, key):
+        return self._jar()[key]
+
+    def __setitem__(self, key, value):
+        self._jar()[key] = value
+
+    def __contains__(self, key):
+        return key in self._jar()
+
+    def save(self):
+        st.session_state["_loadtest_cookie_saves"] = st.session_state.get("_loadtest_cookie_saves", 0) + 1
+
+
+def fake_option_menu(menu_title, options, default_index=0, **kwargs):
+    return st.session_state.get(MENU_STATE, options[default_index])
+
+
+def install_component_fakes():
+    streamlit_cookies_manager.CookieManager = FakeCookieManager
+    streamlit_option_menu.option_menu = fake_option_menu
+
+
+def install_shared_runtime():
+    """
+    AppTest는 run()마다 전역 Runtime 대역을 만들었다가 None으로 지우므로
+    여러 스레드에서 동시에 돌리면 서로의 Runtime을 지워버린다. 하나를 고정해 공유.
+    """
+    from unittest.mock import MagicMock
+
+    from streamlit import config
+    from streamlit.runtime import Runtime
+    from streamlit.runtime.caching.storage.dummy_cache_storage import MemoryCacheStorageManager
+    from streamlit.runtime.media_file_manager import MediaFileManager
+    from streamlit.runtime.memory_media_file_storage import MemoryMediaFileStorage
+    from streamlit.testing.v1 import app_test
+
+    shared = MagicMock(spec=Runtime)
+    shared.media_file_mgr = MediaFileManager(MemoryMediaFileStorage("/mock/media"))
+    shared.cache_storage_manager = MemoryCacheStorageManager()
+    Runtime.instance = classmethod(lambda cls: shared)
+    Runtime.exists = classmethod(lambda cls: True)
+    config.set_option("global.appTest", True)
+    app_test.patch_config_options = lambda options: contextlib.nullcontext()
+
+    # 스크립트 컴파일(ast.parse)을 여러 스레드가 동시에 하면 CPython 3.11에서 깨지므로 직렬화 + 공유
+    from streamlit.runtime.scriptrunner.script_cache import ScriptCache
+
+    original = ScriptCache.get_bytecode
+    compiled: Dict[str, object] = {}
+    lock = threading.Lock()
+
+    def get_bytecode(self, script_path: str):
+        with lock:
+            if script_path not in compiled:
+                compiled[script_path] = original(self, script_path)
+            return compiled[script_path]
+
+    ScriptCache.get_bytecode = get_bytecode
+
+
+# ---------- 시나리오 ----------
+class SessionResult:
+    def __init__(self, idx: int):
+        self.idx = idx
+        self.rerun_ms: List[float] = []
+        self.steps: Dict[str, float] = {}
+        self.expected_writes: List[tuple] = []
+        self.error = ""
+
+
+def _run(at: AppTest, res: SessionResult, step: str, timeout: float):
+    t0 = time.perf_counter()
+    at.run(timeout=timeout)
+    ms = (time.perf_counter() - t0) * 1000
+    res.rerun_ms.append(ms)
+    res.steps[step] = res.steps.get(step, 0) + ms
+    if at.exception:
+        raise RuntimeError(f"{step}: {at.exception[0].message}")
+
+
+def _find_button(at: AppTest, label: str = None, key_prefix: str = None, form_prefix: str = None):
+    for b in at.button:
+        if label is not None and b.label != label:
+            continue
+        if key_prefix is not None and not str(b.key or "").startswith(key_prefix):
+            continue
+        if form_prefix is not None and not str(b.form_id or "").startswith(form_prefix):
+            continue
+        return b
+    return None
+
+
+def session_flow(idx: int, user: dict, token: str, barrier: threading.Barrier, timeout: float) -> SessionResult:
+    res = SessionResult(idx)
+    try:
+        at = AppTest.from_file(APP_PATH, default_timeout=timeout)
+        use_cookie = idx % 2 == 0
+        if use_cookie:
+            at.session_state[COOKIE_STATE] = {"auto_login": "true", "session_token": token, "uid": user["username"]}
+        barrier.wait()
+
+        # 1) 로그인
+        _run(at, res, "login", timeout)
+        if not use_cookie:
+            form_inputs = [t for t in at.text_input if t.form_id == "login"]
+            form_inputs[0].input(user["username"])
+            form_inputs[1].input(datagen.DEFAULT_PASSWORD)
+            _find_button(at, label="입장").click()
+            _run(at, res, "login", timeout)
+        if not at.session_state["logged_in"]:
+            raise RuntimeError("login failed")
+
+        # 2) 홈 팝업 (로그인 폼 경로에서만 표시)
+        popup_ok = _find_button(at, label="확인")
+        if popup_ok is not None:
+            popup_ok.click()
+            _run(at, res, "popup", timeout)
+
+        # 3) 인폼 확인
+        _find_button(at, label="📢 인폼 확인").click()
+        _run(at, res, "inform_view", timeout)
+        ok = _find_button(at, key_prefix="ok_")
+        if ok is not None:
+            res.expected_writes.append(("inform_logs", "note_id", ok.key[3:], "username", user["name"]))
+            ok.click()
+            _run(at, res, "inform_confirm", timeout)
+
+        # 4) 반복 업무 완료
+        _find_button(at, label="🔄 업무 처리").click()
+        _run(at, res, "task_view", timeout)
+        done = _find_button(at, label="완료 ✅", form_prefix="do_")
+        if done is not None:
+            res.expected_writes.append(("routine_log", "task_id", done.form_id[3:], "worker", user["name"]))
+            done.click()
+            _run(at, res, "task_done", timeout)
+
+        # 5) 게시판 댓글
+        at.session_state[MENU_STATE] = "본점"
+        _run(at, res, "board_view", timeout)
+        box = next((t for t in at.text_input if str(t.form_id).startswith("c_")), None)
+        if box is not None:
+            marker = f"loadtest-{idx}-{uuid.uuid4().hex[:8]}"
+            res.expected_writes.append(("comments", "content", marker, "author", user["name"]))
+            box.input(marker)
+            _find_button(at, label="등록", form_prefix=box.form_id).click()
+            _run(at, res, "comment", timeout)
+    except Exception as e:
+        res.error = f"{type(e).__name__}: {e}"
+        if os.environ.get("LOADTEST_TRACE"):
+            traceback.print_exc()
+    return res
+
+
+def count_lost_writes(store: fake_gsheets.FakeSheetStore, results: List[SessionResult]) -> int:
+    lost = 0
+    frames = {}
+    for r in results:
+        for sheet, col, val, who_col, who in r.expected_writes:
+            if sheet not in frames:
+                frames[sheet] = store.frame(sheet)
+            df = frames[sheet]
+            if df.empty or col not in df.columns:
+                lost += 1
+                continue
+            hit = (df[col].astype(str).str.replace(r"\.0$", "", regex=True) == str(val)) & (df[who_col].astype(str) == who)
+            if not hit.any():
+                lost += 1
+    return lost
+
+
+def _pct(values: List[float], q: float) -> float:
+    if not values:
+        return 0.0
+    s = sorted(values)
+    return s[min(len(s) - 1, int(round(q / 100 * (len(s) - 1))))]
+
+
+def seed_store(store: fake_gsheets.FakeSheetStore, frames: Dict[str, pd.DataFrame], users: pd.DataFrame) -> Dict[str, str]:
+    """세션별 자동로그인 토큰을 sessions 시트에 심고 반환"""
+    now = datetime.now()
+    tokens = {u: str(uuid.uuid4()) for u in users["username"]}
+    extra = pd.DataFrame({
+        "token": list(tokens.values()),
+        "username": list(tokens.keys()),
+        "created_at": now.strftime("%Y-%m-%d %H:%M:%S"),
+        "expires_at": (now + timedelta(days=30)).strftime("%Y-%m-%d %H:%M:%S"),
+        "revoked": "False",
+        "row_uuid": [str(uuid.uuid4()) for _ in tokens],
+    })
+    seeded = dict(frames)
+    seeded["sessions"] = pd.concat([frames["sessions"], extra], ignore_index=True)
+    store.load_frames(seeded)
+    return tokens
+
+
+def run_level(n: int, frames, store, args) -> dict:
+    approved = frames["users"][frames["users"]["approved"] == "True"]
+    users = approved.iloc[:n]
+    if len(users) < n:
+        raise SystemExit(f"승인된 사용자 부족: {len(users)} < {n} (--scale 을 키우세요)")
+    tokens = seed_store(store, frames, users)
+    st.cache_resource.clear()
+    store.reset_stats()
+
+    barrier = threading.Barrier(n)
+    results: List[SessionResult] = [None] * n
+
+    def worker(i, u):
+        results[i] = session_flow(i, u, tokens[u["username"]], barrier, args.timeout)
+
+    threads = [threading.Thread(target=worker, args=(i, u)) for i, (_, u) in enumerate(users.iterrows())]
+    t0 = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    wall = time.perf_counter() - t0
+
+    reruns = [ms for r in results for ms in r.rerun_ms]
+    stats = store.stats()
+    return {
+        "sessions": n,
+        "wall_s": round(wall, 2),
+        "reruns": len(reruns),
+        "p50_ms": round(_pct(reruns, 50), 1),
+        "p95_ms": round(_pct(reruns, 95), 1),
+        "p99_ms": round(_pct(reruns, 99), 1),
+        "api_reads": sum(v.get("read", 0) for v in stats.values()),
+        "api_updates": sum(v.get("update", 0) for v in stats.values()),
+        "api_calls": store.total_calls(),
+        "quota_rejected": sum(v.get("quota_rejected", 0) for v in stats.values()),
+        "writes": sum(len(r.expected_writes) for r in results),
+        "lost_writes": count_lost_writes(store, results),
+        "errors": [f"#{r.idx} {r.error}" for r in results if r.error],
+    }
+
+
+def main():
+    ap = argparse.ArgumentParser(description="동시 세션 부하 테스트")
+    ap.add_argument("--levels", default="1,5,10", help="동시 세션 수 목록 (쉼표 구분)")
+    ap.add_argument("--scale", choices=list(datagen.SCALES), default="tiny")
+    ap.add_argument("--latency-ms", type=float, default=50)
+    ap.add_argument("--jitter-ms", type=float, default=20)
+    ap.add_argument("--ms-per-1k-rows", type=float, default=5)
+    ap.add_argument("--failure-rate", type=float, default=0.0)
+    ap.add_argument("--quota-per-min", type=int, default=0)
+    ap.add_argument("--timeout", type=float, default=120, help="rerun 1회 제한시간(초)")
+    args = ap.parse_args()
+
+    install_component_fakes()
+    install_shared_runtime()
+    frames = datagen.generate(args.scale)
+    store = fake_gsheets.get_store(os.environ["JOGAKDAL_FAKE_SHEETS"])
+    store.configure(latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, ms_per_1k_rows=args.ms_per_1k_rows,
+                    failure_rate=args.failure_rate, quota_per_minute=args.quota_per_min)
+
+    header = f"{'N':>4} {'wall_s':>7} {'reruns':>6} {'p50':>8} {'p95':>8} {'p99':>8} {'reads':>6} {'upd':>5} {'calls':>6} {'429':>4} {'writes':>6} {'lost':>5}"
+    print(header)
+    for n in [int(x) for x in args.levels.split(",") if x.strip()]:
+        r = run_level(n, frames, store, args)
+        print(f"{r['sessions']:>4} {r['wall_s']:>7} {r['reruns']:>6} {r['p50_ms']:>8} {r['p95_ms']:>8} {r['p99_ms']:>8} "
+              f"{r['api_reads']:>6} {r['api_updates']:>5} {r['api_calls']:>6} {r['quota_rejected']:>4} "
+              f"{r['writes']:>6} {r['lost_writes']:>5}")
+        for e in r["errors"][:5]:
+            print(f"     ! {e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,408 @@
+"""
+로컬 GSheetsConnection 대역 (오프라인 벤치마크 / 부하 테스트용)
+
+- 실제 스프레드시트 대신 프로세스 메모리의 DataFrame을 워크시트로 사용
+- 지연시간(latency/jitter/행당 전송비용), 실패율, 분당 쿼터(429)를 설정으로 흉내
+- 호출 수/행 수는 stats()로 조회 (부하 테스트에서 API 호출 수 집계)
+
+사용:
+    JOGAKDAL_FAKE_SHEETS=<csv 디렉터리 또는 :memory:> streamlit run app.py
+
+spreadsheet를 지정한 호출(멀티 매장)은 별도 저장소 (<디렉터리>/<spreadsheet> 또는 :memory:/<spreadsheet>)
+"""
+import os
+import random
+import re
+import threading
+import time
+from collections import defaultdict, deque
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+from pandas.io.parsers import TextParser
+from streamlit.connections import BaseConnection
+
+
+class FakeAPIError(Exception):
+    """gspread APIError 대역 (일시 장애)"""
+
+
+class QuotaExceededError(FakeAPIError):
+    """429 RESOURCE_EXHAUSTED 대역"""
+
+
+class WorksheetNotFound(FakeAPIError):
+    pass
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+
+class FakeSheetStore:
+    """워크시트 이름 -> DataFrame. 모든 세션/스레드가 공유 (lock 보호)"""
+
+    def __init__(self, data_dir: Optional[str] = None):
+        self.key = data_dir or ":memory:"
+        self.data_dir = data_dir if data_dir and not data_dir.startswith(":memory:") else None
+        self._lock = threading.Lock()
+        self._sheets: Dict[str, pd.DataFrame] = {}
+        self._calls: deque = deque()
+        self._rng = random.Random(0)
+        self.latency_ms = _env_float("JOGAKDAL_FAKE_LATENCY_MS", 0)
+        self.jitter_ms = _env_float("JOGAKDAL_FAKE_JITTER_MS", 0)
+        self.ms_per_1k_rows = _env_float("JOGAKDAL_FAKE_MS_PER_1K_ROWS", 0)
+        self.failure_rate = _env_float("JOGAKDAL_FAKE_FAILURE_RATE", 0)
+        self.quota_per_minute = int(_env_float("JOGAKDAL_FAKE_QUOTA_PER_MIN", 0))
+        self.reset_stats()
+        if self.data_dir and os.path.isdir(self.data_dir):
+            for fn in sorted(os.listdir(self.data_dir)):
+                if fn.endswith(".csv"):
+                    self._sheets[fn[:-4]] = pd.read_csv(os.path.join(self.data_dir, fn))
+
+    # ---------- 설정 / 데이터 ----------
+    def configure(self, **params):
+        for k, v in params.items():
+            if not hasattr(self, k):
+                raise AttributeError(k)
+            setattr(self, k, v)
+
+    def load_frames(self, frames: Dict[str, pd.DataFrame]):
+        with self._lock:
+            for name, df in frames.items():
+                self._sheets[name] = df.reset_index(drop=True).copy()
+
+    def frame(self, worksheet: str) -> pd.DataFrame:
+        """하네스 검증용 (지연/쿼터/통계 미적용)"""
+        with self._lock:
+            return self._sheets.get(worksheet, pd.DataFrame()).copy()
+
+    def worksheets(self):
+        with self._lock:
+            return list(self._sheets)
+
+    def dump(self, data_dir: str):
+        os.makedirs(data_dir, exist_ok=True)
+        with self._lock:
+            for name, df in self._sheets.items():
+                df.to_csv(os.path.join(data_dir, f"{name}.csv"), index=False)
+
+    # ---------- 통계 ----------
+    def reset_stats(self):
+        self._stats = defaultdict(lambda: defaultdict(int))
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        with self._lock:
+            return {k: dict(v) for k, v in self._stats.items()}
+
+    def total_calls(self) -> int:
+        with self._lock:
+            return sum(v.get("calls", 0) for v in self._stats.values())
+
+    # ---------- 장애 흉내 ----------
+    def _admit(self, op: str, worksheet: str):
+        with self._lock:
+            self._stats[worksheet]["calls"] += 1
+            self._stats[worksheet][op] += 1
+            if self.quota_per_minute:
+                now = time.monotonic()
+                while self._calls and now - self._calls[0] > 60:
+                    self._calls.popleft()
+                if len(self._calls) >= self.quota_per_minute:
+                    self._stats[worksheet]["quota_rejected"] += 1
+                    raise QuotaExceededError("429 RESOURCE_EXHAUSTED: Quota exceeded (fake)")
+                self._calls.append(now)
+            fail = self.failure_rate and self._rng.random() < self.failure_rate
+            if fail:
+                self._stats[worksheet]["failed"] += 1
+
+        if fail:
+            self._sleep(0)
+            raise FakeAPIError(f"503 backend error (fake) on {op} {worksheet}")
+
+    def _sleep(self, rows: float):
+        """rows: 전송량 (전체 폭 행 기준 환산 - 일부 컬럼만 읽으면 그 비율만큼)"""
+        ms = self.latency_ms + self.ms_per_1k_rows * rows / 1000
+        if self.jitter_ms:
+            ms += self._rng.uniform(0, self.jitter_ms)
+        if ms > 0:
+            time.sleep(ms / 1000)
+
+    # ---------- GSheetsConnection 호환 ----------
+    def read(self, worksheet: str) -> pd.DataFrame:
+        """실제 연결처럼 문자열 격자를 받아 클라이언트에서 파싱 (파싱 비용까지 재현)"""
+        self._admit("read", worksheet)
+        with self._lock:
+            if worksheet not in self._sheets:
+                raise WorksheetNotFound(worksheet)
+            df = self._sheets[worksheet]
+            values = _grid_slice(df, 1, None, 1, None)
+            self._stats[worksheet]["rows_read"] += len(df)
+        self._sleep(len(df))
+        return _parse_grid(values)
+
+    def update(self, worksheet: str, data: pd.DataFrame) -> pd.DataFrame:
+        self._admit("update", worksheet)
+        self._sleep(len(data))
+        with self._lock:
+            self._sheets[worksheet] = data.reset_index(drop=True).copy()
+            self._stats[worksheet]["rows_written"] += len(data)
+        return data
+
+    def create(self, worksheet: str, data: pd.DataFrame) -> pd.DataFrame:
+        self._admit("create", worksheet)
+        with self._lock:
+            if worksheet in self._sheets:
+                raise FakeAPIError(f"이미 존재하는 워크시트: {worksheet}")
+        return self.update(worksheet, data)
+
+    # ---------- gspread Spreadsheet 호환 (범위 읽기/쓰기) ----------
+    def _open_spreadsheet(self, spreadsheet: Optional[str] = None, **kwargs) -> "FakeSpreadsheet":
+        if spreadsheet:
+            return get_store(spreadsheet_key(self.key, spreadsheet))._open_spreadsheet()
+        return FakeSpreadsheet(self)
+
+    def values_get(self, a1: str) -> List[List[str]]:
+        worksheet, (r0, r1, c0, c1) = parse_a1(a1)
+        self._admit("read", worksheet)
+        with self._lock:
+            if worksheet not in self._sheets:
+                raise WorksheetNotFound(worksheet)
+            df = self._sheets[worksheet]
+            values = _grid_slice(df, r0, r1, c0, c1)
+            self._stats[worksheet]["rows_read"] += len(values)
+            cost = len(values) * _width_share(df, c0, c1)
+        self._sleep(cost)
+        return values
+
+    def values_batch_get(self, ranges: List[str]) -> List[List[List[str]]]:
+        """여러 범위를 API 호출 1회로 (쿼터/지연도 1회, 전송비용은 전체 행 수 기준)"""
+        parsed = [parse_a1(a1) for a1 in ranges]
+        sheets = list(dict.fromkeys(ws for ws, _ in parsed))
+        self._admit("read", sheets[0] if len(sheets) == 1 else "(batch)")
+        out = []
+        cost = 0.0
+        with self._lock:
+            for worksheet, (r0, r1, c0, c1) in parsed:
+                if worksheet not in self._sheets:
+                    raise WorksheetNotFound(worksheet)
+                df = self._sheets[worksheet]
+                values = _grid_slice(df, r0, r1, c0, c1)
+                self._stats[worksheet]["rows_read"] += len(values)
+                cost += len(values) * _width_share(df, c0, c1)
+                out.append(values)
+        self._sleep(cost)
+        return out
+
+    def values_batch_update(self, data: List[dict]) -> int:
+        """여러 범위 쓰기를 API 호출 1회로. 헤더(1행) 범위는 무시, 데이터 끝을 넘으면 행 추가"""
+        parsed = [(parse_a1(item["range"]), item.get("values", [])) for item in data]
+        sheets = list(dict.fromkeys(ws for (ws, _), _ in parsed))
+        self._admit("update", sheets[0] if len(sheets) == 1 else "(batch)")
+        cells = 0
+        with self._lock:
+            # 실제 API처럼 원자적으로: 범위를 모두 확인한 뒤에 반영 (하나라도 없으면 아무것도 안 씀)
+            for worksheet in sheets:
+                if worksheet not in self._sheets:
+                    raise WorksheetNotFound(worksheet)
+            for (worksheet, (r0, _r1, c0, _c1)), values in parsed:
+                df = self._sheets[worksheet]
+                ncols = len(df.columns)
+                last_pos = r0 - 2 + len(values) - 1
+                if last_pos >= len(df):
+                    # 행 추가 시 정수 컬럼이 float로 바뀌지 않도록 object로 바꾼 뒤 확장
+                    df = df.astype(object).reindex(range(last_pos + 1))
+                for j in range(c0 - 1, min(ncols, c0 - 1 + max((len(r) for r in values), default=0))):
+                    if df.dtypes.iloc[j] != object:
+                        df[df.columns[j]] = df.iloc[:, j].astype(object)
+                for i, row in enumerate(values):
+                    pos = r0 - 2 + i
+                    if pos < 0:
+                        continue
+                    for j, v in enumerate(row[: max(0, ncols - (c0 - 1))]):
+                        df.iat[pos, c0 - 1 + j] = v
+                    cells += len(row)
+                self._sheets[worksheet] = df
+                self._stats[worksheet]["rows_written"] += len(values)
+        ncols = max((len(self._sheets[ws].columns) for ws in sheets), default=1) or 1
+        self._sleep(cells / ncols)
+        return cells
+
+
+class FakeSpreadsheet:
+    """gspread.Spreadsheet 중 앱이 쓰는 부분만 흉내 (값은 문자열 격자, 1행 = 헤더)"""
+
+    def __init__(self, store: FakeSheetStore):
+        self._store = store
+
+    def values_get(self, range, params=None) -> dict:  # noqa: A002 (gspread 시그니처)
+        values = self._store.values_get(range)
+        out = {"range": range, "majorDimension": "ROWS"}
+        if values:
+            out["values"] = values
+        return out
+
+    def values_batch_update(self, body=None) -> dict:
+        cells = self._store.values_batch_update(list((body or {}).get("data", [])))
+        return {"totalUpdatedCells": cells}
+
+    def values_batch_get(self, ranges, params=None) -> dict:
+        value_ranges = []
+        for rng, values in zip(ranges, self._store.values_batch_get(list(ranges))):
+            vr = {"range": rng, "majorDimension": "ROWS"}
+            if values:
+                vr["values"] = values
+            value_ranges.append(vr)
+        return {"valueRanges": value_ranges}
+
+
+_A1_RE = re.compile(r"^([A-Za-z]*)(\d*)(?::([A-Za-z]*)(\d*))?$")
+
+
+def _col_index(letters: str) -> int:
+    n = 0
+    for ch in letters.upper():
+        n = n * 26 + (ord(ch) - 64)
+    return n
+
+
+def parse_a1(a1: str) -> Tuple[str, Tuple[int, Optional[int], int, Optional[int]]]:
+    """
+    "'sheet'!A5:F" -> (sheet, (row0, row1, col0, col1))  1-based, 끝은 포함, None = 끝까지
+    """
+    if "!" in a1:
+        sheet, rng = a1.rsplit("!", 1)
+    else:
+        sheet, rng = a1, ""
+    sheet = sheet.strip()
+    if sheet.startswith("'") and sheet.endswith("'"):
+        sheet = sheet[1:-1].replace("''", "'")
+    m = _A1_RE.match(rng.strip())
+    if not rng or not m:
+        return sheet, (1, None, 1, None)
+    c0, r0, c1, r1 = m.groups()
+    has_end = ":" in rng
+    col0 = _col_index(c0) if c0 else 1
+    row0 = int(r0) if r0 else 1
+    if has_end:
+        col1 = _col_index(c1) if c1 else None
+        row1 = int(r1) if r1 else None
+    else:
+        col1 = col0 if c0 else None
+        row1 = row0 if r0 else None
+    return sheet, (row0, row1, col0, col1)
+
+
+def _width_share(df: pd.DataFrame, c0: int, c1: Optional[int]) -> float:
+    """범위가 차지하는 컬럼 비율 (전송비용 환산용)"""
+    ncols = len(df.columns) or 1
+    c1 = ncols if c1 is None else min(c1, ncols)
+    return max(0, c1 - c0 + 1) / ncols
+
+
+def _cell(v) -> str:
+    if v is None or (isinstance(v, float) and v != v):
+        return ""
+    if isinstance(v, float) and v.is_integer():
+        return str(int(v))
+    return str(v)
+
+
+def _str_column(s: pd.Series) -> List[str]:
+    if pd.api.types.is_integer_dtype(s) or pd.api.types.is_bool_dtype(s):
+        return s.astype(str).tolist()
+    if pd.api.types.is_float_dtype(s):
+        return [_cell(v) for v in s.tolist()]
+    return [_cell(v) for v in s.tolist()] if s.isna().any() else s.astype(str).tolist()
+
+
+def _grid_slice(df: pd.DataFrame, r0: int, r1: Optional[int], c0: int, c1: Optional[int]) -> List[List[str]]:
+    """헤더(1행) + 데이터 격자에서 범위를 잘라 문자열 값으로 (API처럼 끝쪽 빈 셀/행은 생략)"""
+    ncols = len(df.columns)
+    c1 = ncols if c1 is None else min(c1, ncols)
+    cols = list(range(c0 - 1, c1))
+    out: List[List[str]] = []
+    if r0 <= 1 and (r1 is None or r1 >= 1):
+        out.append([str(df.columns[c]) for c in cols])
+    d0 = max(r0, 2) - 2
+    d1 = len(df) if r1 is None else min(r1 - 1, len(df))
+    if d1 > d0 and cols:
+        block = df.iloc[d0:d1, cols]
+        # 컬럼 단위로 문자열 변환 (셀 단위 루프는 대형 시트에서 대역 자체가 병목)
+        str_cols = [_str_column(block.iloc[:, j]) for j in range(len(cols))]
+        for cells in map(list, zip(*str_cols)):
+            while cells and cells[-1] == "":
+                cells.pop()
+            out.append(cells)
+    while out and not out[-1]:
+        out.pop()
+    return out
+
+
+def _parse_grid(values: List[List[str]]) -> pd.DataFrame:
+    """gspread_dataframe.get_as_dataframe 과 같은 TextParser 타입 추론"""
+    if not values:
+        return pd.DataFrame()
+    names = values[0]
+    if len(values) == 1:
+        return pd.DataFrame(columns=names)
+    width = len(names)
+    # 완전히 빈 행은 [] 로 두어 TextParser 가 건너뛰게 함 (실제 연결처럼 빈 행 뒤 데이터가 당겨짐)
+    rows = [r if len(r) == width or not r else list(r[:width]) + [""] * (width - len(r)) for r in values[1:]]
+    return TextParser(rows, names=names, header=None).read()
+
+
+_STORES: Dict[str, FakeSheetStore] = {}
+_STORES_LOCK = threading.Lock()
+
+
+def spreadsheet_key(base: str, spreadsheet: str) -> str:
+    """기본 저장소 기준 스프레드시트별 저장소 키"""
+    if base.startswith(":memory:"):
+        return f"{base}/{spreadsheet}"
+    return os.path.join(base, re.sub(r"[^\w.-]", "_", spreadsheet))
+
+
+def get_store(data_dir: Optional[str] = None) -> FakeSheetStore:
+    """data_dir 별 단일 저장소 (같은 프로세스의 연결/하네스가 공유)"""
+    key = data_dir or ":memory:"
+    with _STORES_LOCK:
+        if key not in _STORES:
+            _STORES[key] = FakeSheetStore(key)
+        return _STORES[key]
+
+
+class FakeGSheetsConnection(BaseConnection[FakeSheetStore]):
+    """st.connection(..., type=FakeGSheetsConnection, data_dir=...) 로 사용"""
+
+    def _connect(self, data_dir: Optional[str] = None, **kwargs) -> FakeSheetStore:
+        store = get_store(data_dir or self._secrets.get("data_dir") or os.environ.get("JOGAKDAL_FAKE_SHEETS"))
+        if kwargs:
+            store.configure(**kwargs)
+        return store
+
+    @property
+    def store(self) -> FakeSheetStore:
+        return self._instance
+
+    @property
+    def client(self) -> FakeSheetStore:
+        """GSheetsConnection.client 처럼 _open_spreadsheet() 제공"""
+        return self._instance
+
+    def _store_for(self, spreadsheet: Optional[str]) -> FakeSheetStore:
+        return get_store(spreadsheet_key(self._instance.key, spreadsheet)) if spreadsheet else self._instance
+
+    def read(self, worksheet: str = None, ttl=None, spreadsheet: str = None, **options) -> pd.DataFrame:
+        return self._store_for(spreadsheet).read(worksheet)
+
+    def update(self, worksheet: str = None, data: pd.DataFrame = None, spreadsheet: str = None,
+               **options) -> pd.DataFrame:
+        return self._store_for(spreadsheet).update(worksheet, data)
+
+    def create(self, worksheet: str = None, data: pd.DataFrame = None, spreadsheet: str = None,
+               **options) -> pd.DataFrame:
+        return self._store_for(spreadsheet).create(worksheet, data)
@@ -0,0 +1,64 @@
+"""
+테스트 공용 설정: 로컬 fake GSheets 연결(:memory:) + 합성 데이터(bench/datagen.py)
+
+    python -m pytest -q
+
+app 모듈은 한 번만 임포트하고, 테스트마다 대역 저장소/프로세스 캐시/세션 상태를 비움
+"""
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "bench"))
+os.environ["JOGAKDAL_FAKE_SHEETS"] = ":memory:"
+os.environ["JOGAKDAL_METRICS_FILE"] = ""
+os.environ["JOGAKDAL_SNAPSHOT_DIR"] = ""
+
+import pytest  # noqa: E402
+import streamlit as st  # noqa: E402
+
+import datagen  # noqa: E402
+import fake_gsheets  # noqa: E402
+import app  # noqa: E402
+
+
+@pytest.fixture
+def store():
+    """빈 대역 저장소 + 새 프로세스 상태 (ID 고수위/시트 버전/카탈로그/지표는 st.cache_resource)"""
+    s = fake_gsheets.get_store(":memory:")
+    with s._lock:
+        s._sheets.clear()
+    s.reset_stats()
+    st.cache_resource.clear()
+    for k in list(st.session_state):
+        del st.session_state[k]
+    app.AppState.init()
+    yield s
+
+
+@pytest.fixture
+def frames(store):
+    """tiny 합성 데이터를 올린 저장소의 원본 프레임"""
+    data = datagen.generate("tiny", 42)
+    store.load_frames(data)
+    return data
+
+
+def login(department: str = "전체", role: str = "Master"):
+    """세션을 로그인 상태로 (UI 없이)"""
+    app.start_user_session("user0000", {"name": "직원0000", "role": role, "department": department})
+
+
+def counter(group: str, name: str, field: str) -> float:
+    return app.get_metrics()._counters.get((group, name), {}).get(field, 0)
+
+
+def swap_session(state: dict) -> dict:
+    """세션 상태를 state로 바꾸고 이전 상태를 돌려줌 (한 프로세스 안의 두 세션 흉내, {} = 새 세션)"""
+    prev = dict(st.session_state)
+    for k in list(st.session_state):
+        del st.session_state[k]
+    st.session_state.update(state)
+    app.AppState.init()
+    return prev
@@ -0,0 +1,60 @@
+"""서명된 자동 로그인 쿠키 (sign_cookie / verify_cookie / try_auto_login)"""
+import base64
+import hashlib
+import hmac
+import json
+
+import pytest
+
+import app
+
+
+def _tamper(value: str) -> str:
+    body, _, sig = value.rpartition(".")
+    payload = json.loads(base64.urlsafe_b64decode(body.encode()))
+    payload["u"] = "user0001"
+    forged = base64.urlsafe_b64encode(json.dumps(payload, separators=(",", ":")).encode()).decode()
+    return f"{forged}.{sig}"
+
+
+def test_round_trip():
+    payload = {"u": "user0000", "s": app.DEFAULT_TENANT, "t": "tok"}
+    assert app.verify_cookie(app.sign_cookie(payload)) == payload
+
+
+@pytest.mark.parametrize("value", [None, "", "garbage", "a.b.c", "e30.0000"])
+def test_rejects_malformed(value):
+    assert app.verify_cookie(value) is None
+
+
+def test_rejects_modified_payload_or_signature():
+    signed = app.sign_cookie({"u": "user0000", "s": app.DEFAULT_TENANT})
+    assert app.verify_cookie(_tamper(signed)) is None
+    assert app.verify_cookie(signed[:-1] + ("0" if signed[-1] != "0" else "1")) is None
+
+
+def test_rejects_signed_non_dict():
+    body = base64.urlsafe_b64encode(b"[1,2]").decode()
+    sig = hmac.new(app.COOKIE_SECRET, body.encode(), hashlib.sha256).hexdigest()
+    assert app.verify_cookie(f"{body}.{sig}") is None
+
+
+def _cookies(monkeypatch, value):
+    monkeypatch.setattr(app, "safe_get_cookie", lambda key: value if key == app.AUTH_COOKIE else None)
+    monkeypatch.setattr(app, "safe_set_cookies", lambda values: None)
+
+
+def test_auto_login_with_signed_cookie(store, frames, monkeypatch):
+    users = frames["users"].set_index("username")
+    uid = next(u for u in users.index if app.check_approved(users.loc[u, "approved"]))
+    _cookies(monkeypatch, app.sign_cookie({"u": uid, "s": app.current_tenant(), "h": users.loc[uid, "password"]}))
+    assert app.try_auto_login()
+    assert app.st.session_state["username"] == uid
+
+
+def test_auto_login_rejects_forged_cookie(store, frames, monkeypatch):
+    users = frames["users"].set_index("username")
+    signed = app.sign_cookie({"u": "user0000", "s": app.current_tenant(), "h": users.loc["user0001", "password"]})
+    _cookies(monkeypatch, _tamper(signed))
+    assert not app.try_auto_login()
+    assert not app.st.session_state["logged_in"]
@@ -0,0 +1,53 @@
+"""append-like 시트 증분 로드 (DataManager._load_delta)"""
+import pandas as pd
+
+import app
+from conftest import counter, login
+
+KEY = "inform_logs@전체"
+SHEET = app.SHEET_NAMES[KEY]
+
+
+def _append(store, rows: pd.DataFrame):
+    store.load_frames({SHEET: pd.concat([store.frame(SHEET), rows], ignore_index=True)})
+
+
+def test_delta_reads_only_new_rows(store, frames):
+    login()
+    base = app.DataManager.load(KEY, full=True).data
+    extra = frames["inform_logs"].tail(3).assign(row_uuid=["n1", "n2", "n3"])
+    _append(store, extra)
+
+    df = app.DataManager.load(KEY, force_refresh=True, full=False).data
+    assert counter("read", KEY, "delta") == 1
+    assert counter("read", KEY, "delta_rows") == 3
+    assert len(app.DataManager.load(KEY, full=True).data) == len(base) + 3
+    assert list(df["row_uuid"].tail(3)) == ["n1", "n2", "n3"]
+
+
+def test_delta_mismatch_falls_back_to_full_read(store, frames):
+    login()
+    app.DataManager.load(KEY, full=True)
+    # 마지막으로 본 행이 지워지고 다른 행이 붙음 -> 고수위(row_uuid) 불일치
+    rewritten = pd.concat([store.frame(SHEET).iloc[:-1], frames["inform_logs"].tail(1).assign(row_uuid="x1")],
+                          ignore_index=True)
+    store.load_frames({SHEET: rewritten})
+
+    df = app.DataManager.load(KEY, force_refresh=True).data
+    assert counter("read", KEY, "delta_mismatch") == 1
+    assert counter("read", KEY, "delta") == 0
+    assert list(df["row_uuid"].astype(str)) == list(rewritten["row_uuid"].astype(str))
+
+
+def test_widened_sheet_falls_back_to_full_read(store, frames):
+    login()
+    app.DataManager.load(KEY, full=True)
+    # 다른 프로세스가 컬럼을 늘리고 행을 붙임 (이 프로세스의 카탈로그는 모름)
+    widened = pd.concat([store.frame(SHEET), frames["inform_logs"].tail(1).assign(row_uuid="w1")],
+                        ignore_index=True).assign(extra="x")
+    store.load_frames({SHEET: widened})
+
+    df = app.DataManager.load(KEY, force_refresh=True).data
+    assert counter("read", KEY, "delta_mismatch") == 1
+    assert counter("read", KEY, "delta") == 0
+    assert "extra" in df.columns and df["row_uuid"].iloc[-1] == "w1"
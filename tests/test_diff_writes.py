@@ -0,0 +1,51 @@
+"""셀 범위 쓰기 (DataManager._diff_ranges / _write_diff_or_full)"""
+import pandas as pd
+
+import app
+from conftest import counter, login
+
+
+def _changed(base: pd.DataFrame) -> pd.DataFrame:
+    new = base.copy()
+    new.loc[1:2, "role"] = "Auditor"                       # 같은 컬럼 연속 행 -> 한 범위
+    new.loc[5, ["name", "department"]] = ["새이름", "본점"]  # 한 행의 여러 컬럼 -> 양끝 사이 한 범위
+    extra = base.tail(1).assign(username="new_user")
+    return pd.concat([new, extra], ignore_index=True)
+
+
+def test_ranges_merge_rows_and_columns(store, frames):
+    login()
+    base = app.DataManager.load("users", force_refresh=True).data
+    ranges = app.DataManager._diff_ranges("users", _changed(base))
+    assert [r for r, _ in ranges] == ["D3:D4", "C7:F7", f"A{len(base) + 2}:F{len(base) + 2}"]
+    assert ranges[0][1] == [["Auditor"], ["Auditor"]]
+    assert ranges[1][1][0][0] == "새이름" and ranges[1][1][0][-1] == "본점"
+
+
+def test_save_writes_only_changed_cells(store, frames):
+    login()
+    base = app.DataManager.load("users", force_refresh=True).data
+    new = _changed(base)
+    assert app.DataManager.save("users", new, "저장").success
+    assert counter("update", "users", "diff_writes") == 1
+    got = store.frame(app.SHEET_NAMES["users"])
+    assert list(got["username"].astype(str)) == list(new["username"].astype(str))
+    assert list(got["role"].astype(str)) == list(new["role"].astype(str))
+
+
+def test_rows_added_remotely_force_full_write(store, frames):
+    login()
+    base = app.DataManager.load("users", force_refresh=True).data
+    sheet = app.SHEET_NAMES["users"]
+    store.load_frames({sheet: pd.concat([store.frame(sheet), frames["users"].tail(1).assign(username="other")],
+                                        ignore_index=True)})
+    assert app.DataManager._diff_ranges("users", _changed(base)) is None
+    assert counter("update", "users", "diff_mismatch") == 1
+
+
+def test_large_or_shape_changes_need_full_write(store, frames):
+    login()
+    base = app.DataManager.load("users", force_refresh=True).data
+    assert app.DataManager._diff_ranges("users", base.iloc[:-1]) is None
+    assert app.DataManager._diff_ranges("users", base.assign(extra="x")) is None
+    assert app.DataManager._diff_ranges("users", base.assign(role="Auditor")) is None
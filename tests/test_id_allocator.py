@@ -0,0 +1,50 @@
+"""id 발급 (IdAllocator, 부서 파티션 간 유일성)"""
+import threading
+
+import pandas as pd
+
+import app
+from conftest import login
+
+
+def _ids(store, key: str) -> list:
+    return list(pd.to_numeric(store.frame(app.SHEET_NAMES[key])["id"], errors="coerce").dropna().astype(int))
+
+
+def test_concurrent_allocations_are_unique():
+    alloc = app.IdAllocator()
+    df = pd.DataFrame({"id": [1, 2, 7]})
+    out = []
+    threads = [threading.Thread(target=lambda: out.append(alloc.allocate("posts", df, "id"))) for _ in range(20)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert sorted(out) == list(range(8, 28))
+
+
+def test_ids_unique_across_partitions(store, frames):
+    app.partition_all()
+    login()
+    top = max(max(_ids(store, k), default=0) for k in app.physical_keys("posts", app.DEPARTMENTS))
+    for board in ["작업장", "본점", "건의사항", "작업장"]:
+        res = app.DataManager.append_row("posts", {"board_type": board, "title": "t", "content": "c", "author": "x"},
+                                         "id", "글쓰기")
+        assert res.success
+    ids = [i for k in app.physical_keys("posts", app.DEPARTMENTS) for i in _ids(store, k)]
+    assert len(ids) == len(set(ids))
+    assert sorted(i for i in ids if i > top) == [top + 1, top + 2, top + 3, top + 4]
+
+
+def test_picks_up_ids_written_elsewhere(store, frames):
+    login()
+    key = "routine_def@전체"
+    first = app.DataManager.append_row(key, {"task_name": "a", "cycle": "매일"}, "id", "추가")
+    assert first.success
+    # 다른 프로세스가 더 큰 id로 추가
+    sheet = app.SHEET_NAMES[key]
+    df = store.frame(sheet)
+    store.load_frames({sheet: pd.concat([df, df.tail(1).assign(id=500)], ignore_index=True)})
+    app.DataManager.load(key, force_refresh=True)
+    assert app.DataManager.append_row(key, {"task_name": "b", "cycle": "매일"}, "id", "추가").success
+    assert max(_ids(store, key)) == 501
@@ -0,0 +1,62 @@
+"""부서 파티션 (session_depts / partition_routed 쓰기 라우팅)"""
+import app
+from conftest import login
+
+
+def _sheet(store, key: str):
+    return store.frame(app.SHEET_NAMES[key])
+
+
+def _post(board: str) -> dict:
+    return {"board_type": board, "title": board, "content": "c", "author": "x"}
+
+
+def test_session_reads_shared_and_own_department(store, frames):
+    app.partition_all()
+    login("본점", "Manager")
+    assert app.physical_keys("posts") == ["posts@전체", "posts@본점"]
+    boards = set(app.DataManager.load("posts").data["board_type"])
+    assert "작업장" not in boards and "본점" in boards
+
+
+def test_opening_other_board_loads_its_partition(store, frames):
+    app.partition_all()
+    login("본점", "Manager")
+    app.open_board_dept("작업장")
+    assert app.physical_keys("posts") == ["posts@전체", "posts@본점", "posts@작업장"]
+    assert app.physical_keys("inform_notes") == ["inform_notes@전체", "inform_notes@본점"]
+    assert "작업장" in set(app.DataManager.load("posts").data["board_type"])
+    # 다시 로그인하면 초기화
+    login("본점", "Manager")
+    assert app.physical_keys("posts") == ["posts@전체", "posts@본점"]
+
+
+def test_append_routes_by_board_and_parent(store, frames):
+    app.partition_all()
+    login()
+    for board in ["작업장", "건의사항"]:
+        assert app.DataManager.append_row("posts", _post(board), "id", "글쓰기").success
+    work = _sheet(store, "posts@작업장")
+    pid = int(work["id"].astype(int).max())
+    assert work.iloc[-1]["title"] == "작업장"
+    assert _sheet(store, "posts@전체").iloc[-1]["title"] == "건의사항"
+
+    assert app.DataManager.append_row("comments", {"post_id": pid, "author": "x", "content": "hi"}, None, "댓글").success
+    assert str(_sheet(store, "comments@작업장").iloc[-1]["post_id"]) == str(pid)
+
+
+def test_update_and_delete_go_to_partition_holding_row(store, frames):
+    app.partition_all()
+    login()
+    shop = _sheet(store, "posts@본점")
+    pid = shop["id"].iloc[0]
+    before = {k: len(_sheet(store, k)) for k in app.physical_keys("posts", app.DEPARTMENTS)}
+
+    assert app.DataManager.update_row("posts", "id", pid, {"status": "완료"}, "수정").success
+    after = {k: len(_sheet(store, k)) for k in before}
+    assert after == {**before, "posts@본점": before["posts@본점"] + 1}
+    view = app.DataManager.load("posts@본점").data
+    assert view.loc[view["id"].astype(str) == str(pid), "status"].tolist() == ["완료"]
+
+    assert app.DataManager.delete_row("posts", "id", pid, "삭제").success
+    assert str(pid) not in set(app.DataManager.load("posts").data["id"].astype(str))
@@ -0,0 +1,39 @@
+"""표준 ts 유도 (infer_year_ts / canonical_ts)"""
+from datetime import datetime
+
+import pandas as pd
+
+import app
+
+NOW = app.KST.localize(datetime(2026, 1, 5, 12, 0))
+
+
+def test_year_rolls_back_across_new_year():
+    s = pd.Series(["11-30 10:00", "12-31 23:59", "01-02 08:00"])
+    assert list(app.infer_year_ts(s, NOW)) == ["2025-11-30 10:00:00", "2025-12-31 23:59:00", "2026-01-02 08:00:00"]
+
+
+def test_last_row_after_today_is_last_year():
+    s = pd.Series(["12-20 09:00", "12-21 10:00"])
+    assert list(app.infer_year_ts(s, NOW)) == ["2025-12-20 09:00:00", "2025-12-21 10:00:00"]
+
+
+def test_multi_year_wraps_and_bad_values():
+    s = pd.Series(["12-01 00:00", "잘못된 값", "01-10 00:00", "12-24 00:00", "01-03 00:00"])
+    assert list(app.infer_year_ts(s, NOW)) == [
+        "2024-12-01 00:00:00", "", "2025-01-10 00:00:00", "2025-12-24 00:00:00", "2026-01-03 00:00:00"]
+
+
+def test_canonical_ts_keeps_existing_and_derives_blanks():
+    df = pd.DataFrame({
+        "ts": ["2026-01-01 00:00:01", "", ""],
+        "done_date": ["2026-01-01", "2026-01-02", "날짜 아님"],
+        "created_at": ["09:00", "10:30", "11:00"],
+    })
+    assert list(app.canonical_ts("routine_log@본점", df)) == ["2026-01-01 00:00:01", "2026-01-02 10:30:00", ""]
+
+
+def test_canonical_ts_posts_uses_updated_at_only_on_creation_day():
+    df = pd.DataFrame({"date": ["2026-01-02", "2026-01-02"],
+                       "updated_at": ["2026-01-02 14:05", "2026-01-04 09:00"]})
+    assert list(app.canonical_ts("posts", df)) == ["2026-01-02 14:05:00", "2026-01-02 00:00:00"]
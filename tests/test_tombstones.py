@@ -0,0 +1,72 @@
+"""append-like 시트의 버전/tombstone 행 (DataManager._last_write_wins)"""
+import pandas as pd
+
+import app
+from conftest import login, swap_session
+
+
+def test_last_version_wins_in_first_position():
+    df = pd.DataFrame({
+        "row_uuid": ["a", "b", "", "a", "c", "b"],
+        "v": [1, 2, 3, 4, 5, 6],
+        app.TOMBSTONE_COLUMN: ["", "", "", "", "", "True"],
+    })
+    out = app.DataManager._last_write_wins(df)
+    # a: 자리는 처음(0), 값은 마지막 버전(4) / b: 마지막 버전이 tombstone -> 제외 / row_uuid 없는 행은 각자
+    assert list(out["row_uuid"]) == ["a", "", "c"]
+    assert list(out["v"]) == [4, 3, 5]
+
+
+def test_plain_frame_is_returned_as_is():
+    df = pd.DataFrame({"row_uuid": ["a", "b"], "v": [1, 2]})
+    assert app.DataManager._last_write_wins(df) is df
+
+
+def test_update_and_delete_append_rows(store, frames):
+    login()
+    key = "comments@전체"
+    sheet = app.SHEET_NAMES[key]
+    n = len(store.frame(sheet))
+    target = str(store.frame(sheet)["row_uuid"].iloc[0])
+
+    assert app.DataManager.update_row(key, "row_uuid", target, {"content": "수정됨"}, "수정").success
+    assert app.DataManager.delete_row(key, "row_uuid", target, "삭제").success
+    raw = store.frame(sheet)
+    assert len(raw) == n + 2
+    assert list(raw["row_uuid"].astype(str).tail(2)) == [target, target]
+    assert str(raw[app.TOMBSTONE_COLUMN].iloc[-1]) == "True"
+
+    view = app.DataManager.load(key, force_refresh=True).data
+    assert target not in set(view["row_uuid"].astype(str))
+    assert len(view) == n - 1
+
+
+def test_delete_is_seen_by_other_session(store, frames):
+    key = "comments@전체"
+    assert app.TOMBSTONE_COLUMN not in store.frame(app.SHEET_NAMES[key]).columns
+    login()
+    target = str(app.DataManager.load(key).data["row_uuid"].iloc[0])
+
+    other = swap_session({})
+    login()
+    assert app.DataManager.delete_row(key, "row_uuid", target, "삭제").success
+    swap_session(other)
+
+    assert key in app.DataManager.sync_versions()
+    assert target not in set(app.DataManager.load(key).data["row_uuid"].astype(str))
+
+
+def test_delta_load_keeps_tombstone_column(store, frames):
+    key = "comments@전체"
+    login()
+    target = str(app.DataManager.load(key).data["row_uuid"].iloc[0])
+
+    other = swap_session({})
+    login()
+    assert app.DataManager.delete_row(key, "row_uuid", target, "삭제").success
+    swap_session(other)
+
+    # 증분 로드 경로로 (재작성 버전이 안 올라간 경우와 같음): 넓어진 헤더를 보고 전체 로드해야 함
+    app.get_sheet_versions().bump(key, rewrite=False)
+    app.DataManager.mark_stale([key])
+    assert target not in set(app.DataManager.load(key).data["row_uuid"].astype(str))